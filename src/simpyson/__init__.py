@@ -4,15 +4,31 @@ from __future__ import annotations
 
 from importlib.metadata import version
 
-from simpyson.calculator import SimpCalc, simulate_spectrum
-from simpyson.io import read_simp
+from simpyson.calculator import (
+    SimpCalc,
+    simulate_clusters,
+    simulate_spectrum,
+    simulate_spectrum_async,
+)
+from simpyson.fft import set_fft_backend
+from simpyson.io import read_simp, read_simp_many
+from simpyson.runner import SimpsonPool, arun_many, run_many
 from simpyson.simpy import Simpy
+from simpyson.stack import SpectrumStack
 
 __version__ = version("simpyson")
 
 __all__ = [
     "SimpCalc",
+    "SimpsonPool",
     "Simpy",
+    "SpectrumStack",
+    "arun_many",
     "read_simp",
+    "read_simp_many",
+    "run_many",
+    "set_fft_backend",
+    "simulate_clusters",
     "simulate_spectrum",
+    "simulate_spectrum_async",
 ]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("simpyson")
+
+DEFAULT_CACHE_MAX_BYTES = 1 << 30  # 1 GiB per namespace
+EVICT_SCAN_EVERY = 256  # writes between directory scans, to catch other processes
+
+# Estimated size of each cache directory and writes since it was last scanned.
+# Kept per directory rather than per DiskCache, since callers build a new
+# DiskCache for every read or run
+_usage: dict[Path, list[int]] = {}
+_usage_lock = threading.Lock()
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the root directory used for simpyson's on-disk caches.
+
+    Uses ``$SIMPYSON_CACHE_DIR`` if set, otherwise
+    ``$XDG_CACHE_HOME/simpyson`` (``~/.cache/simpyson`` by default).
+
+    Returns
+    -------
+    pathlib.Path
+        Cache root directory (not created by this function).
+    """
+    env_dir = os.environ.get("SIMPYSON_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "simpyson"
+
+
+def hash_key(*parts: object) -> str:
+    """
+    Build a cache key from the string form of ``parts``.
+
+    Parameters
+    ----------
+    *parts : object
+        Values identifying the cached item. They are joined with ``'|'``.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest.
+    """
+    text = "|".join(str(part) for part in parts)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class DiskCache:
+    """
+    Size-bounded directory of cache entries.
+
+    Each entry is a group of files whose names start with its key (e.g.
+    ``<key>.npy`` and ``<key>.json``). Files are written atomically, hits
+    refresh the entry's modification time, and the least recently used
+    entries are evicted once the directory grows past ``max_bytes``.
+    ``maybe_evict`` keeps a running total of the bytes written, so it only
+    scans the directory when that total passes the limit or every
+    ``EVICT_SCAN_EVERY`` writes.
+
+    Parameters
+    ----------
+    namespace : str
+        Subdirectory of the cache root (e.g. ``'parse'``).
+    directory : str or None
+        Cache root. If None, ``default_cache_dir()`` is used.
+    max_bytes : int
+        Upper bound on the total size of the namespace directory.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        directory: str | None = None,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        root = Path(directory) if directory is not None else default_cache_dir()
+        self.directory = root / namespace
+        self.max_bytes = max_bytes
+
+    def path(self, key: str, suffix: str) -> Path:
+        """Return the path of the ``suffix`` file of entry ``key``."""
+        return self.directory / f"{key}{suffix}"
+
+    def lookup(self, key: str, suffixes: tuple[str, ...]) -> list[Path] | None:
+        """
+        Return the files of entry ``key`` if all of them exist.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+        suffixes : tuple of str
+            File suffixes making up the entry.
+
+        Returns
+        -------
+        list of pathlib.Path or None
+            Entry files in ``suffixes`` order, or None on a miss.
+        """
+        paths = [self.path(key, suffix) for suffix in suffixes]
+        if not all(p.exists() for p in paths):
+            return None
+        for p in paths:
+            with contextlib.suppress(OSError):
+                os.utime(p)
+        return paths
+
+    def write(self, key: str, suffix: str, writer) -> Path:
+        """
+        Atomically write one file of entry ``key``.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+        suffix : str
+            File suffix (e.g. ``'.npy'``).
+        writer : callable
+            Called with a binary file handle to write the content.
+
+        Returns
+        -------
+        pathlib.Path
+            Final path of the written file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.path(key, suffix)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+                size = f.tell()
+            Path(tmp_name).replace(target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        with _usage_lock:
+            usage = _usage.get(self.directory)
+            if usage is not None:
+                # Overwriting an entry counts it twice; that only brings the next scan forward
+                usage[0] += size
+                usage[1] += 1
+        return target
+
+    def maybe_evict(self) -> None:
+        """
+        Call ``evict`` if this directory may have grown past ``max_bytes``.
+
+        The directory is scanned on the first call, then again only once the
+        bytes written since push the estimated size past ``max_bytes`` or
+        after ``EVICT_SCAN_EVERY`` writes.
+        """
+        with _usage_lock:
+            usage = _usage.get(self.directory)
+            if (
+                usage is not None
+                and usage[0] <= self.max_bytes
+                and usage[1] < EVICT_SCAN_EVERY
+            ):
+                return
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until under ``max_bytes``."""
+        if not self.directory.exists():
+            return
+
+        entries: dict[str, list] = {}
+        total = 0
+        for p in self.directory.iterdir():
+            if p.suffix == ".tmp":
+                continue
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            # Group '<key>.axis.npy' with '<key>.npy', not by stem
+            entry = entries.setdefault(p.name.partition('.')[0], [0.0, 0, []])
+            entry[0] = max(entry[0], stat.st_mtime)
+            entry[1] += stat.st_size
+            entry[2].append(p)
+            total += stat.st_size
+
+        if total > self.max_bytes:
+            for _, size, files in sorted(entries.values(), key=lambda e: e[0]):
+                for p in files:
+                    with contextlib.suppress(OSError):
+                        p.unlink()
+                total -= size
+                logger.debug("Evicted cache entry %s", files[0].stem)
+                if total <= self.max_bytes:
+                    break
+
+        with _usage_lock:
+            _usage[self.directory] = [total, 0]
+
+    def clear(self) -> None:
+        """Delete every entry in this namespace."""
+        if not self.directory.exists():
+            return
+        for p in self.directory.iterdir():
+            with contextlib.suppress(OSError):
+                p.unlink()
+        with _usage_lock:
+            _usage[self.directory] = [0, 0]
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import copy
+import functools
+import hashlib
+import itertools
 import logging
 import math
 import os
@@ -8,48 +13,46 @@ import re
 import shutil
 import subprocess
 import tempfile
+from collections.abc import Iterable
 from pathlib import Path
 
-from simpyson.converter import ppm2hz
+import numpy as np
+
+from simpyson.cache import DiskCache, hash_key
+from simpyson.converter import _proton_freq_to_b0, ppm2hz
+from simpyson.engines import select_engine, simulate_analytic
 from simpyson.io import read_simp
+from simpyson.runner import arun_many, run_many
+from simpyson.stack import SpectrumStack
 from simpyson.templates import (
     CPMAS,
     CustomPulseSequence,
+    NoPulse,
+    Pulse90,
     PulseSequenceTemplate,
     get_template,
     pulseq_templates,
 )
-from simpyson.utils import get_larmor_freq, get_spin
+from simpyson.utils import (
+    coupling_components,
+    equivalent_sites,
+    extract_spinsys,
+    get_larmor_freq,
+    get_spin,
+    hilbert_dimension,
+    parse_spinsys,
+    prune_spinsys,
+    site_clusters,
+)
 
 logger = logging.getLogger("simpyson")
 
+_OUTPUT_KEYS = ('out_name', 'out_format', 'out_binary', 'lb', 'zerofill', 'gauss_lb')
 
-def _proton_freq_to_b0(proton_freq):
-    """
-    Convert a proton_frequency value to a b0 string like '800.0MHz'.
-
-    Parameters
-    ----------
-    proton_freq : int, float, or str
-        Proton frequency in Hz (numeric) or as a string with units.
-
-    Returns
-    -------
-    str or None
-        B0 string suitable for ``hz2ppm`` / ``ppm2hz``, or None if conversion
-        is not possible.
-    """
-    if isinstance(proton_freq, (int, float)):
-        if proton_freq > 1e6:
-            return f"{proton_freq / 1e6:.1f}MHz"
-        return f"{proton_freq}MHz"
-    if isinstance(proton_freq, str):
-        match = re.match(r'(\d+(?:\.\d+)?)\s*([kMGT]?[Hh]z)?', proton_freq)
-        if match:
-            value, unit = match.groups()
-            if not unit or unit.lower() in ('hz', 'khz', 'mhz', 'ghz', 'thz'):
-                return proton_freq if unit else f"{float(value)}MHz"
-    return None
+# Spin systems above this Hilbert-space dimension get a warning before running
+_LARGE_DIMENSION = 1 << 10
+# Parameters of the SIMPSON path that the analytic engines do not use
+_ANALYTIC_IGNORED = ('crystal_file', 'gamma_angles')
 
 
 def _extract_nucleus(spinsys_str):
@@ -96,6 +99,259 @@ def _extract_turnoff_interactions(spinsys_str: str) -> list[str]:
     return interactions
 
 
+_NUMBER_RE = re.compile(r'(?<![\w.$])([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(p?)(?![\w.])')
+_PAIR_RE = re.compile(r'^(dipole|jcoupling)\s+(\d+)\s+(\d+)\b(.*)$')
+# File arguments of an input: ``*_file`` par entries and Tcl ``source``/``load_shape``
+_PATH_ARG_RE = re.compile(r'(^\s*\w+_file\s+|\b(?:source|load_shape)\s+)([^\s"{}\[\]$]+)', re.MULTILINE)
+
+
+def _canonical_input(text: str) -> str:
+    """
+    Normalize a SIMPSON input file for use as a cache key.
+
+    Numbers are rewritten as the ``repr`` of their float value, without a
+    trailing ``.0`` (``1e3``, ``1000`` and ``1000.0`` become ``1000``, while
+    values that differ in any bit stay distinct), whitespace and comment
+    lines are dropped, ``dipole``/``jcoupling`` site pairs are put in
+    ascending order, the interaction lines of the spinsys block are sorted,
+    and the ``fsave`` file name (which does not affect the result) is
+    replaced by a placeholder.
+    """
+    def number(match):
+        token = repr(float(match.group(1)))
+        return f"{token.removesuffix('.0')}{match.group(2)}"
+
+    lines = []
+    spinsys_lines = None
+    for raw in text.splitlines():
+        line = " ".join(raw.split())
+        if not line or line.startswith('#'):
+            continue
+        line = _NUMBER_RE.sub(number, line)
+        line = re.sub(r'^fsave \$f \S+?\.(fid|spe|xreim)\b', r'fsave $f OUT.\1', line)
+        pair = _PAIR_RE.match(line)
+        if pair and int(pair.group(2)) > int(pair.group(3)):
+            line = f"{pair.group(1)} {pair.group(3)} {pair.group(2)}{pair.group(4)}"
+
+        if line.startswith('spinsys'):
+            spinsys_lines = []
+            lines.append(line)
+        elif spinsys_lines is not None and line == '}':
+            head = [x for x in spinsys_lines if x.startswith(('channels', 'nuclei'))]
+            body = sorted(x for x in spinsys_lines if not x.startswith(('channels', 'nuclei')))
+            lines.extend([*head, *body, line])
+            spinsys_lines = None
+        elif spinsys_lines is not None:
+            spinsys_lines.append(line)
+        else:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _absolute_paths(text: str, cwd: Path) -> str:
+    """
+    Rewrite relative file arguments of a SIMPSON input as absolute paths.
+
+    SIMPSON runs in a scratch directory, so paths relative to the caller's
+    ``cwd`` would no longer resolve there. Only arguments naming an existing
+    file (or ``.cry`` file) are changed; SIMPSON's built-in crystal sets
+    and Tcl variables are left alone.
+    """
+    def absolute(match):
+        path = match.group(2)
+        if not Path(path).is_absolute() and any((cwd / p).is_file() for p in (path, f"{path}.cry")):
+            path = str(cwd / path)
+        return match.group(1) + path
+
+    return _PATH_ARG_RE.sub(absolute, text)
+
+
+@functools.lru_cache(maxsize=64)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:  # noqa: ARG001
+    """SHA-256 of a file, memoized per path, size and modification time."""
+    digest = hashlib.sha256()
+    with Path(path).open('rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_identity(path: str | Path) -> str:
+    """Return a content hash of the file at ``path`` (symlinks resolved)."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _file_digest(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def _simpson_identity(executable: str) -> str:
+    """Return a content hash identifying the SIMPSON executable."""
+    return _file_identity(executable)
+
+
+def _find_crystal_file(name: str) -> Path:
+    """
+    Locate the ``.cry`` file behind a ``crystal_file`` parameter.
+
+    Looks for ``name`` and ``name.cry`` as given (relative to the current
+    directory), then in ``$SIMPSON_CRYSTAL_DIR``. Sharded runs read the
+    orientations from this file and unsharded runs pass its absolute path
+    to SIMPSON, so both use the same crystal file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no file is found, e.g. for SIMPSON's built-in sets. Sharded runs
+        then fall back to a single run.
+    """
+    candidates = [Path(name), Path(f"{name}.cry")]
+    crystal_dir = os.environ.get("SIMPSON_CRYSTAL_DIR")
+    if crystal_dir:
+        candidates += [Path(crystal_dir) / name, Path(crystal_dir) / f"{name}.cry"]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(
+        f"Crystal file '{name}' not found on disk. Sharding needs the orientation "
+        "list: pass the path of a .cry file as crystal_file, or set "
+        "SIMPSON_CRYSTAL_DIR to a directory holding SIMPSON's crystal files."
+    )
+
+
+def _crystal_file_arg(name: str) -> str:
+    """
+    Return the absolute ``crystal_file`` value for a file found by ``_find_crystal_file``.
+
+    Like ``name``, the result leaves out the ``.cry`` extension if the file
+    was found by appending it.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no file is found (SIMPSON's built-in sets).
+    """
+    path = _find_crystal_file(name).absolute()
+    return str(path) if path.name == Path(name).name else str(path.with_suffix(''))
+
+
+def _read_crystal_file(path: Path) -> np.ndarray:
+    """Read a SIMPSON ``.cry`` file (count line, then one orientation per row)."""
+    orientations = np.loadtxt(path, skiprows=1, ndmin=2)
+    count = int(path.read_text().split(None, 1)[0])
+    if len(orientations) != count:
+        raise ValueError(f"Crystal file {path} declares {count} orientations, found {len(orientations)}")
+    return orientations
+
+
+def _write_crystal_file(path: Path, orientations: np.ndarray) -> None:
+    """Write orientations in SIMPSON's ``.cry`` format."""
+    with path.open('w') as f:
+        f.write(f"{len(orientations)}\n")
+        np.savetxt(f, orientations, fmt='%.12g')
+
+
+def _find_simpson(simpson_path: str | None, required: bool = True) -> str | None:
+    """
+    Locate the SIMPSON executable.
+
+    Parameters
+    ----------
+    simpson_path : str or None
+        Explicit path; if None, ``simpson`` is looked up in PATH.
+    required : bool
+        If False, return None instead of raising when it is not in PATH.
+
+    Returns
+    -------
+    str or None
+        Absolute path of the executable.
+
+    Raises
+    ------
+    FileNotFoundError
+        If ``simpson_path`` does not exist, or SIMPSON is not in PATH and
+        ``required`` is True.
+    """
+    if simpson_path:
+        if not Path(simpson_path).exists():
+            raise FileNotFoundError(f"SIMPSON executable not found at specified path: {simpson_path}")
+        return str(Path(simpson_path).resolve())
+
+    simpson_executable = shutil.which("simpson")
+    if simpson_executable is None and required:
+        raise FileNotFoundError(
+            "SIMPSON executable not found in PATH or at the specified path.\n"
+            "Please ensure SIMPSON is installed and available in your PATH, or provide the correct path."
+        )
+    return simpson_executable
+
+
+def _simpson_failure(returncode: int, stdout: str, stderr: str) -> RuntimeError:
+    """Build the error raised when SIMPSON exits with a non-zero code."""
+    return RuntimeError(
+        f"SIMPSON failed with exit code {returncode}.\n"
+        f"SIMPSON stderr:\n{stderr}\n"
+        f"SIMPSON stdout:\n{stdout}"
+    )
+
+
+async def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill a still running SIMPSON child and reap it."""
+    if process.returncode is None:
+        with contextlib.suppress(ProcessLookupError):
+            process.kill()
+        await process.wait()
+
+
+def _scratch_root() -> str:
+    """
+    Return the parent directory for per-run scratch directories.
+
+    Uses ``$SIMPYSON_SCRATCH_DIR`` if set, otherwise ``/dev/shm`` when it is
+    a writable tmpfs mount, otherwise the system temporary directory.
+    """
+    env_dir = os.environ.get("SIMPYSON_SCRATCH_DIR")
+    if env_dir:
+        return env_dir
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK | os.X_OK):
+        return str(shm)
+    return tempfile.gettempdir()
+
+
+def _decomposition_groups(parsed: dict) -> list[list[int]]:
+    """
+    Uncoupled site groups of a parsed spinsys, each holding every channel.
+
+    Parts missing a channel nucleus are merged together (and, if still
+    incomplete, with the smallest complete part), so every group keeps
+    the original ``channels`` line and pulse sequence.
+    """
+    channels = set(parsed['channels'])
+    nuclei = parsed['nuclei']
+    complete, partial = [], []
+    for group in coupling_components(parsed):
+        (complete if channels <= {nuclei[s - 1] for s in group} else partial).append(group)
+    if partial:
+        merged = list(itertools.chain.from_iterable(partial))
+        if not channels <= {nuclei[s - 1] for s in merged} and complete:
+            smallest = min(complete, key=len)
+            complete.remove(smallest)
+            merged += smallest
+        complete.append(sorted(merged))
+    return sorted(complete)
+
+
+def _weighted_sum(results: list, weights: list, out_format: str) -> object:
+    """Sum ``Simpy`` results that share one axis with the given weights."""
+    if out_format == 'xreim':
+        signal = sum(w * r.xreim.data for w, r in zip(weights, results, strict=True))
+        first = results[0]
+        return type(first)(b0=first.b0, nucleus=first.nucleus, dtype=first.dtype).from_xreim(
+            first.xreim.axis('time'), signal, None, copy=False
+        )
+    return SpectrumStack.from_simpy(results, domain=out_format).sum(weights=weights)
+
+
 def _is_ct_operator(detect_op: str) -> bool:
     """Return True if detect_op selects only the central transition."""
     return bool(re.search(r'I(?:n|\d+)c', detect_op))
@@ -149,8 +405,7 @@ class SimpCalc:
         self.parameters = kwargs
         self.output_config = {}
 
-        output_keys = ['out_name', 'out_format', 'lb', 'zerofill', 'gauss_lb']
-        for key in output_keys:
+        for key in _OUTPUT_KEYS:
             if key in self.parameters:
                 self.output_config[key.replace('out_', '')] = self.parameters.pop(key)
 
@@ -361,7 +616,14 @@ class SimpCalc:
         Raises
         ------
         ValueError
-            If ``out_format`` is not one of ``'fid'``, ``'spe'``, ``'xreim'``.
+            If ``out_format`` is not one of ``'fid'``, ``'spe'``, ``'xreim'``,
+            or ``out_binary`` is combined with ``'xreim'``.
+
+        Notes
+        -----
+        With ``out_binary=True`` the ``fsave`` call gets SIMPSON's
+        ``-binary`` flag. The file keeps its ``.fid``/``.spe`` extension and
+        ``read_simp`` detects the binary encoding from its header.
         """
 
         out_format = self.parameters.get('out_format',
@@ -380,6 +642,12 @@ class SimpCalc:
         zerofill = self.parameters.get('zerofill',
                   self.output_config.get('zerofill', self.parameters.get('np', 0)))
 
+        binary = self.parameters.get('out_binary',
+                 self.output_config.get('binary', False))
+        if binary and out_format == "xreim":
+            raise ValueError("Binary output is only supported for out_format 'fid' and 'spe'")
+        save_flag = " -binary" if binary else ""
+
 
         indent = "    "
 
@@ -392,7 +660,7 @@ proc main {{}} {{
 {indent}set f [fsimpson]
 {indent}faddlb $f {lb} 0
 {gauss_line}{indent}fzerofill $f {zerofill}
-{indent}fsave $f {out_name}.fid
+{indent}fsave $f {out_name}.fid{save_flag}
 }}
 """
         elif out_format == "spe":
@@ -407,7 +675,7 @@ proc main {{}} {{
             if 'variable_ref' in self.parameters or 'ref' in self.parameters:
                 main_block += f"{indent}fset $f -ref $par(ref)\n"
 
-            main_block += f"{indent}fsave $f {out_name}.spe\n}}\n"
+            main_block += f"{indent}fsave $f {out_name}.spe{save_flag}\n}}\n"
             return main_block
         elif out_format == "xreim":
             return f"""
@@ -436,6 +704,330 @@ proc main {{}} {{
         """Print the SIMPSON input file to the console (stdout)."""
         print(str(self))  # noqa: T201
 
+    def with_parameters(self, **updates) -> SimpCalc:
+        """
+        Return a copy of the calculator with some parameters changed.
+
+        Parameters
+        ----------
+        **updates
+            New values, named as in the constructor. Output settings
+            (``out_format``, ``lb``, ...) update the main section, pulse
+            sequence variables (``pcp`` or ``variable_pcp``) update the
+            template, and parameters the calculator already has (or new
+            ``variable_*`` names) update the par section. ``spinsys``
+            replaces the spin system: pass a spinsys string or Soprano
+            SpinSystem, or a callable that takes the current spinsys string
+            and returns the new one. A new ``variable_offset`` (or
+            ``offset``) also updates the template offset and, unless it was
+            set explicitly, ``variable_ref``, as in the constructor.
+
+        Returns
+        -------
+        SimpCalc
+            Independent calculator; ``self`` is not modified.
+
+        Raises
+        ------
+        ValueError
+            If a key is none of the above. Spin-system values such as a
+            quadrupolar coupling are not SIMPSON parameters; change them
+            through ``spinsys``.
+
+        Examples
+        --------
+        >>> calc.with_parameters(spinsys=lambda s: s.replace("4e6", "5e6"))
+        """
+        calc = copy.copy(self)
+        calc.parameters = dict(self.parameters)
+        calc.output_config = dict(self.output_config)
+        calc.pulse_sequence = copy.deepcopy(self.pulse_sequence)
+
+        for key, value in updates.items():
+            if key == 'spinsys':
+                calc.spinsys = value(self.generate_spinsys()) if callable(value) else value
+                continue
+            if key in _OUTPUT_KEYS:
+                calc.output_config[key.replace('out_', '')] = value
+                continue
+            variable = key if key.startswith('variable_') else f"variable_{key}"
+            in_template = calc.pulse_sequence is not None and variable in calc.pulse_sequence.parameters
+            if not (in_template or key in calc.parameters or key.startswith('variable_')):
+                raise ValueError(
+                    f"Unknown parameter '{key}': not a parameter, output setting or pulse "
+                    "sequence variable of this calculator. Pass new SIMPSON parameters to "
+                    "SimpCalc, and change spin-system values through spinsys=."
+                )
+            if in_template:
+                calc.pulse_sequence.parameters[variable] = value
+            if not in_template or key in calc.parameters:
+                calc.parameters[key] = value
+
+        # Redo what __init__ derives from the offset: the template offset and,
+        # unless it was given explicitly, the reference
+        offset_keys = [key for key in ('variable_offset', 'offset') if key in updates]
+        if offset_keys:
+            offset = updates[offset_keys[0]]
+            calc.parameters.pop('offset', None)
+            calc.parameters['variable_offset'] = offset
+            if calc.pulse_sequence is not None and 'variable_offset' in calc.pulse_sequence.parameters:
+                calc.pulse_sequence.parameters['variable_offset'] = offset
+            old_ref = self.parameters.get('variable_ref')
+            derived = old_ref is None or old_ref == -self.parameters.get('variable_offset', 0.0)
+            if derived and not {'variable_ref', 'ref'} & updates.keys():
+                calc.parameters['variable_ref'] = -offset
+        return calc
+
+    def sweep(
+        self,
+        mode: str = 'product',
+        max_workers: int | None = None,
+        use_processes: bool = False,
+        stack: bool = True,
+        run_kwargs: dict | None = None,
+        **values,
+    ) -> SpectrumStack | list:
+        """
+        Run the simulation over a grid of parameter values in parallel.
+
+        Parameters
+        ----------
+        mode : str
+            ``'product'`` (default) runs every combination of the values,
+            with the last parameter varying fastest. ``'zip'`` pairs the
+            i-th values of all parameters; the lists must then have the
+            same length.
+        max_workers : int or None
+            Number of concurrent SIMPSON runs (see ``run_many``).
+        use_processes : bool
+            If True, use a process pool instead of a thread pool.
+        stack : bool
+            If True (default), return one ``SpectrumStack`` with the swept
+            values as per-row ``coords``. All points must then share NP and
+            SW. With ``mode='product'`` the stack also carries the grid:
+            ``dims`` holds the parameter names, ``grid_shape`` the number of
+            values of each, and ``grid`` the data with one axis per
+            parameter. If False, return a list of ``(point, result)`` pairs, where
+            ``point`` is a dict of the swept values.
+        run_kwargs : dict or None
+            Arguments passed to every ``SimpCalc.run`` call (e.g.
+            ``timeout``, ``simpson_path``, ``cache``).
+        **values
+            Parameter name and the sequence of values to sweep, e.g.
+            ``spin_rate=[10e3, 20e3]`` or ``pcp=[100, 500, 1000]``. Any key
+            accepted by ``with_parameters`` works, including ``spinsys``
+            with one spin system (or callable) per point.
+
+        Returns
+        -------
+        SpectrumStack or list
+            Sweep results in point order.
+
+        Raises
+        ------
+        ValueError
+            If no values are given, ``mode`` is unknown, zipped lists
+            differ in length, or ``with_parameters`` rejects a key.
+
+        Examples
+        --------
+        >>> result = calc.sweep(spin_rate=[10e3, 20e3], pcp=[100, 500, 1000])
+        >>> result.sel(spin_rate=20e3, pcp=500)
+        >>> grid = result.grid  # shape (2, 3, np): spin_rate, pcp, points
+        """
+        if not values:
+            raise ValueError("sweep() needs at least one parameter to vary")
+        names = list(values)
+        columns = [list(v) for v in values.values()]
+        if mode == 'product':
+            points = list(itertools.product(*columns))
+        elif mode == 'zip':
+            if len({len(c) for c in columns}) != 1:
+                raise ValueError("All value lists must have the same length for mode='zip'")
+            points = list(zip(*columns, strict=True))
+        else:
+            raise ValueError(f"Unknown sweep mode '{mode}'. Supported modes: 'product', 'zip'")
+
+        calcs = [self.with_parameters(**dict(zip(names, point, strict=True))) for point in points]
+        results = run_many(calcs, max_workers=max_workers, use_processes=use_processes, **(run_kwargs or {}))
+
+        if not stack:
+            return [(dict(zip(names, point, strict=True)), result) for point, result in zip(points, results, strict=True)]
+        coords = {name: [point[i] for point in points] for i, name in enumerate(names)}
+        result = SpectrumStack.from_simpy(results, coords=coords)
+        if mode == 'product':
+            result.dims = tuple(names)
+            result.grid_shape = tuple(len(c) for c in columns)
+        return result
+
+    def _output_metadata(self, b0: str | None, nucleus: str | None) -> tuple[str | None, str | None]:
+        """Fill in ``b0`` and ``nucleus`` for reading the output when not given."""
+        # Auto-extract magnetic field if not provided
+        if b0 is None and 'proton_frequency' in self.parameters:
+            b0 = _proton_freq_to_b0(self.parameters['proton_frequency'])
+
+        # Auto-extract nucleus information if not provided.
+        # Use detect_operator (e.g. 'I2p') to identify, nucleus compare with spinsys nuclei list.
+        # Falls back to the first channel for global operators ('Inp', 'Inc').
+        if nucleus is None:
+            spinsys_str = self.generate_spinsys()
+            detect_op = self.parameters.get('detect_operator', '')
+            indices = re.findall(r'I(\d+)', detect_op)
+            if indices:
+                nuclei_match = re.search(r'nuclei\s+([\w\s]+)', spinsys_str)
+                if nuclei_match:
+                    nuclei_list = nuclei_match.group(1).split()
+                    idx = int(indices[0]) - 1  # SIMPSON is 1-indexed
+                    if 0 <= idx < len(nuclei_list):
+                        nucleus = nuclei_list[idx]
+            if nucleus is None:
+                nucleus = _extract_nucleus(spinsys_str)
+
+        return b0, nucleus
+
+    def decompose(self) -> list[tuple[SimpCalc, float]]:
+        """
+        Split the calculator into the uncoupled parts of its spin system.
+
+        Sites connected by ``dipole``/``jcoupling`` lines stay together (see
+        ``simpyson.utils.coupling_components``); every part keeps the
+        ``channels`` line, parameters and pulse sequence.
+
+        Returns
+        -------
+        list of (SimpCalc, float)
+            One calculator per part and its weight. SIMPSON reports
+            ``Tr(rho(t) D)`` over the whole Hilbert space, so each part is
+            weighted by the dimension of the spins it leaves out; the
+            weighted sum of the part results equals the full simulation.
+            ``[(self, 1.0)]`` if the system does not split, or cannot be
+            split safely (site-indexed operators such as ``I1x``, custom
+            pulse sequences or a hand-written CPMAS ``turnoff`` list).
+        """
+        whole = [(self, 1.0)]
+        spinsys = self.generate_spinsys()
+        operators = f"{self.parameters.get('start_operator', '')} {self.parameters.get('detect_operator', '')}"
+        if re.search(r'I\d', operators):
+            return whole
+        if self.pulse_sequence is not None and type(self.pulse_sequence) not in (NoPulse, Pulse90, CPMAS):
+            return whole
+        if isinstance(self.pulse_sequence, CPMAS) and self.pulse_sequence.turnoff_interactions not in (
+            [], _extract_turnoff_interactions(spinsys)
+        ):
+            return whole
+        try:
+            parsed = parse_spinsys(spinsys)
+            dims = [int(2 * get_spin(nucleus) + 1) for nucleus in parsed['nuclei']]
+        except ValueError:
+            return whole
+
+        groups = _decomposition_groups(parsed)
+        if len(groups) < 2:
+            return whole
+        total = math.prod(dims)
+        parts = []
+        for group in groups:
+            part = self.with_parameters(spinsys=extract_spinsys(parsed, group))
+            if isinstance(part.pulse_sequence, CPMAS):
+                part.pulse_sequence.turnoff_interactions = []
+            parts.append((part, total / math.prod(dims[s - 1] for s in group)))
+        logger.debug("Split spin system into %d parts of %s sites", len(parts), [len(g) for g in groups])
+        return parts
+
+    def prune(
+        self,
+        max_dim: int | None = None,
+        max_spins: int | None = None,
+    ) -> tuple[SimpCalc, list[tuple[str, tuple[int, int], float]]]:
+        """
+        Return a copy with the most weakly coupled spins removed.
+
+        See ``simpyson.utils.prune_spinsys``. The first spin of the observed
+        nucleus and sites named in the operators (``I1x``, ...) are kept;
+        site operators and a CPMAS ``turnoff`` list are renumbered.
+
+        Parameters
+        ----------
+        max_dim : int or None
+            Target Hilbert-space dimension.
+        max_spins : int or None
+            Target number of spins.
+
+        Returns
+        -------
+        tuple of (SimpCalc, list)
+            The pruned calculator and the discarded couplings as
+            ``(kind, (i, j), magnitude_hz)`` with original site indices.
+
+        Raises
+        ------
+        ValueError
+            If neither target is given or the kept spins exceed it.
+        """
+        operators = {key: str(self.parameters.get(key, '')) for key in ('start_operator', 'detect_operator')}
+        named = {int(site) for op in operators.values() for site in re.findall(r'I(\d+)', op)}
+        body, kept, dropped = prune_spinsys(
+            self.generate_spinsys(), max_dim=max_dim, max_spins=max_spins, keep=sorted(named)
+        )
+        index = {site: i for i, site in enumerate(kept, 1)}
+
+        calc = self.with_parameters(spinsys=body, **{
+            key: re.sub(r'I(\d+)', lambda m: f"I{index[int(m.group(1))]}", op)
+            for key, op in operators.items() if key in self.parameters
+        })
+        if isinstance(calc.pulse_sequence, CPMAS):
+            turnoff = []
+            for name in calc.pulse_sequence.turnoff_interactions:
+                kind, *sites = name.split('_')
+                if all(int(site) in index for site in sites):
+                    turnoff.append('_'.join([kind, *(str(index[int(site)]) for site in sites)]))
+            calc.pulse_sequence.turnoff_interactions = turnoff
+        return calc, dropped
+
+    def _run_sharded(
+        self,
+        orientations: np.ndarray,
+        shards: int,
+        out_format: str,
+        simpson_executable: str,
+        timeout: int | None,
+        b0: str | None,
+        nucleus: str | None,
+    ) -> object:
+        """Run ``orientations`` (the crystal file rows) in ``shards`` parts and sum the results."""
+        # .cry rows are "alpha beta [weight]"; without weights all count equally
+        weighted = orientations.shape[1] >= 3
+        weights = orientations[:, -1] if weighted else np.ones(len(orientations))
+        parts = [idx for idx in np.array_split(np.arange(len(orientations)), shards) if len(idx)]
+
+        crystal_dir = Path(tempfile.mkdtemp(prefix="simpyson-crystal-", dir=_scratch_root()))
+        try:
+            calcs = []
+            fractions = []
+            for i, idx in enumerate(parts):
+                part = orientations[idx].copy()
+                part_weight = weights[idx].sum()
+                # Each shard is a normalized powder average; its share of the
+                # full average is the fraction of the total weight it holds.
+                if weighted:
+                    part[:, -1] /= part_weight
+                fractions.append(part_weight / weights.sum())
+                _write_crystal_file(crystal_dir / f"shard{i}.cry", part)
+                calcs.append(self.with_parameters(crystal_file=str(crystal_dir / f"shard{i}")))
+
+            results = run_many(
+                calcs,
+                max_workers=len(calcs),
+                timeout=timeout,
+                b0=b0,
+                nucleus=nucleus,
+                simpson_path=simpson_executable,
+            )
+        finally:
+            shutil.rmtree(crystal_dir, ignore_errors=True)
+
+        return _weighted_sum(results, fractions, out_format)
+
     def run(
         self,
         filepath: str | None = None,
@@ -446,6 +1038,9 @@ proc main {{}} {{
         nucleus: str | None = None,
         simpson_path: str | None = None,
         dry_run: bool = False,
+        cache: bool | str = False,
+        shards: int | None = None,
+        decompose: bool = False,
     ) -> str | object:
         """
         Run the SIMPSON simulation and optionally read the results.
@@ -453,14 +1048,20 @@ proc main {{}} {{
         Parameters
         ----------
         filepath : str or None
-            Path to save the input file. If None, a temporary file is created.
+            Where to keep a copy of the input file (with
+            ``delete_files=False``). Its stem also names the output file.
+            SIMPSON itself always runs in a private scratch directory.
         timeout : int or None
             Timeout in seconds for the SIMPSON process.
         read_output : bool
             If True (default), read the output file and return a Simpy object.
             If False, return SIMPSON's stdout as a string.
         delete_files : bool
-            If True (default), delete input and output files after reading.
+            If True (default), nothing is left on disk. If False, the input
+            file is copied to ``filepath`` and the output file is moved next
+            to it (or into the current directory without ``filepath``),
+            keeping any subdirectories given in ``out_name``. An absolute
+            ``out_name`` is moved to exactly that path.
         b0 : str or None
             Magnetic field strength (e.g., ``'400MHz'``). Auto-derived from
             ``proton_frequency`` if not provided. Only used with
@@ -473,6 +1074,34 @@ proc main {{}} {{
         dry_run : bool
             If True, generate the input file and return the command string
             without running SIMPSON.
+        cache : bool or str
+            If True, look the run up in the result cache (see
+            ``simpyson.cache.default_cache_dir``) and only launch SIMPSON on
+            a miss; a string selects another cache root. Entries are keyed
+            by the normalized input file, the contents of the files it reads
+            (crystal file, ``source``/``load_shape`` and other ``*_file``
+            arguments), a hash of the SIMPSON executable and the output
+            format. Only used with ``read_output=True``; a hit
+            writes no files.
+        shards : int or None
+            If greater than 1, split the orientations of ``crystal_file``
+            into this many sub-crystal files, run them concurrently and sum
+            the partial results with their orientation weights. The result
+            matches the unsharded run. The orientations are read from the
+            ``.cry`` file on disk, found the same way as for unsharded runs
+            (see ``_find_crystal_file``). SIMPSON's built-in sets such as
+            ``rep2000`` only exist inside SIMPSON unless
+            ``$SIMPSON_CRYSTAL_DIR`` holds copies of them; without a file the
+            run logs a warning and is not sharded. Cannot be combined with ``filepath``,
+            ``cache``, ``read_output=False`` or ``delete_files=False``: the
+            shards are separate inputs, so there is no single input file,
+            output file or cache entry for the run.
+        decompose : bool
+            If True, split the spin system into uncoupled parts (see
+            ``decompose``), run them concurrently and sum the weighted
+            results, which equals the full simulation. Cannot be combined
+            with ``filepath`` or ``read_output=False`` when the system
+            splits.
 
         Returns
         -------
@@ -486,160 +1115,342 @@ proc main {{}} {{
             If SIMPSON is not found in PATH or at the specified path.
         subprocess.TimeoutExpired
             If the simulation exceeds the timeout.
-        subprocess.CalledProcessError
+        RuntimeError
             If SIMPSON returns a non-zero exit code.
-        """
-        # Find the SIMPSON executable
-        simpson_executable = None
-
-        if simpson_path:
-            if Path(simpson_path).exists():
-                simpson_executable = simpson_path
-            else:
-                raise FileNotFoundError(f"SIMPSON executable not found at specified path: {simpson_path}")
-
-        if simpson_executable is None:
-            simpson_executable = shutil.which("simpson")
-
-        if simpson_executable is None and not dry_run:
-            raise FileNotFoundError(
-                "SIMPSON executable not found in PATH or at the specified path.\n"
-                "Please ensure SIMPSON is installed and available in your PATH, or provide the correct path."
-            )
-
-        temp_file = None
-        if filepath is None:
-            temp_fd, temp_file = tempfile.mkstemp(suffix='.in')
-            os.close(temp_fd)
-            filepath = temp_file
-
-        base_filepath = str(Path(filepath).with_suffix(''))
-
-        self.save(filepath)
 
+        Notes
+        -----
+        Each run creates its own scratch directory (under ``/dev/shm`` when
+        available, see ``_scratch_root``), writes the input there and starts
+        SIMPSON with that directory as cwd, so concurrent runs from threads
+        or processes cannot read or delete each other's files.
+        ``$par(name)`` in ``out_name`` stands for the input file stem. An
+        absolute ``out_name``, or one containing ``..``, is written under
+        its base name inside the scratch directory and moved to the
+        requested place when files are kept. A ``crystal_file`` found
+        on disk by ``_find_crystal_file`` (relative to the current directory
+        or in ``$SIMPSON_CRYSTAL_DIR``) and other relative file arguments
+        (``*_file`` parameters, Tcl ``source`` and ``load_shape``) that exist
+        in the current directory are passed to SIMPSON as absolute paths.
+        The directory is removed when the run finishes.
+        """
         if dry_run:
+            simpson_executable = _find_simpson(simpson_path, required=False)
+            if filepath is None:
+                temp_fd, filepath = tempfile.mkstemp(suffix='.in')
+                os.close(temp_fd)
+            self.save(filepath)
             cmd = [simpson_executable if simpson_executable else "simpson", filepath]
             logger.info("Dry run: Generated input file at %s", filepath)
             logger.info("Command: %s", ' '.join(cmd))
             return ' '.join(cmd)
 
-        # Determine expected output filename/locations
-        out_format = self.parameters.get('out_format',
-                        self.output_config.get('format', 'spe'))
-
-        out_name = self.parameters.get('out_name',
-                     self.output_config.get('name', base_filepath))
-        if out_name == '$par(name)':
-            out_name = base_filepath
-
-        output_filename = f"{Path(out_name).name}.{out_format}"
-
-        possible_locations = [
-            str(Path(filepath).parent / output_filename),
-            str(Path.cwd() / output_filename),
-            f"{out_name}.{out_format}"
-        ]
-
+        simpson_executable = _find_simpson(simpson_path)
+        out_format = self._out_format()
+        sharded = shards is not None and shards != 1
+        if sharded:
+            if shards < 1:
+                raise ValueError(f"shards must be at least 1, got {shards}")
+            if filepath is not None or cache or not read_output or not delete_files:
+                raise ValueError(
+                    "shards cannot be combined with filepath, cache, read_output=False or delete_files=False"
+                )
+
+        if decompose:
+            parts = self.decompose()
+            if len(parts) > 1:
+                if filepath is not None or not read_output:
+                    raise ValueError("decompose cannot be combined with filepath or read_output=False")
+                b0, nucleus = self._output_metadata(b0, nucleus)
+                results = run_many(
+                    [part for part, _ in parts],
+                    timeout=timeout,
+                    b0=b0,
+                    nucleus=nucleus,
+                    simpson_path=simpson_executable,
+                    cache=cache,
+                    shards=shards,
+                )
+                return _weighted_sum(results, [weight for _, weight in parts], out_format)
+
+        if sharded:
+            try:
+                crystal_file = _find_crystal_file(str(self.parameters['crystal_file']))
+            except FileNotFoundError as e:
+                # SIMPSON's built-in sets (rep2000, zcw4180, ...) have no file to split
+                logger.warning("%s Running without shards.", e)
+            else:
+                return self._run_sharded(
+                    _read_crystal_file(crystal_file), shards, out_format, simpson_executable,
+                    timeout, b0, nucleus,
+                )
+
+        result_cache, key = None, None
+        if cache and read_output:
+            result_cache, key, hit = self._lookup_cache(cache, simpson_executable, out_format, b0, nucleus)
+            if hit is not None:
+                return hit
+
+        # Every run gets a private scratch directory that is also SIMPSON's
+        # cwd, so concurrent runs never see (or delete) each other's files.
+        workdir = Path(tempfile.mkdtemp(prefix="simpyson-", dir=_scratch_root()))
         try:
-            cmd = [simpson_executable, filepath]
-
+            input_file, output_file, target = self._stage_input(
+                workdir, filepath, delete_files, out_format
+            )
+            cmd = [simpson_executable, input_file.name]
             try:
                 result = subprocess.run(cmd,
+                                     cwd=workdir,
                                      check=True,
                                      capture_output=True,
                                      text=True,
                                      timeout=timeout)
             except subprocess.CalledProcessError as e:
-                raise RuntimeError(
-                    f"SIMPSON failed with exit code {e.returncode}.\n"
-                    f"SIMPSON stderr:\n{e.stderr}\n"
-                    f"SIMPSON stdout:\n{e.stdout}"
-                ) from e
-
-            # Read output from run
-            if read_output:
-                output_file = None
-                for location in possible_locations:
-                    if Path(location).exists():
-                        output_file = location
-                        break
-
-                if output_file is None:
-                    raise FileNotFoundError(
-                        f"SIMPSON output file not found. Looked in: {possible_locations}\n"
-                        f"SIMPSON stdout: {result.stdout}\n"
-                        f"SIMPSON stderr: {result.stderr}"
-                    )
-
-                # Auto-extract magnetic field if not provided
-                if b0 is None and 'proton_frequency' in self.parameters:
-                    b0 = _proton_freq_to_b0(self.parameters['proton_frequency'])
-
-                # Auto-extract nucleus information if not provided.
-                # Use detect_operator (e.g. 'I2p') to identify, nucleus compare with spinsys nuclei list.
-                # Falls back to the first channel for global operators ('Inp', 'Inc').
-                if nucleus is None:
-                    spinsys_str = self.generate_spinsys()
-                    detect_op = self.parameters.get('detect_operator', '')
-                    indices = re.findall(r'I(\d+)', detect_op)
-                    if indices:
-                        nuclei_match = re.search(r'nuclei\s+([\w\s]+)', spinsys_str)
-                        if nuclei_match:
-                            nuclei_list = nuclei_match.group(1).split()
-                            idx = int(indices[0]) - 1  # SIMPSON is 1-indexed
-                            if 0 <= idx < len(nuclei_list):
-                                nucleus = nuclei_list[idx]
-                    if nucleus is None:
-                        nucleus = _extract_nucleus(spinsys_str)
-
-                # Read the output file
-                return read_simp(output_file, format=out_format, b0=b0, nucleus=nucleus)
-            else:
-                return result.stdout
+                raise _simpson_failure(e.returncode, e.stdout, e.stderr) from e
+
+            return self._collect_output(
+                result.stdout, result.stderr, output_file, target, out_format, filepath,
+                read_output, delete_files, result_cache, key, b0, nucleus,
+            )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    async def arun(
+        self,
+        filepath: str | None = None,
+        timeout: float | None = None,
+        read_output: bool = True,
+        delete_files: bool = True,
+        b0: str | None = None,
+        nucleus: str | None = None,
+        simpson_path: str | None = None,
+        cache: bool | str = False,
+        decompose: bool = False,
+    ) -> str | object:
+        """
+        Coroutine version of ``run`` built on asyncio subprocesses.
+
+        Takes the same arguments as ``run`` (without ``dry_run`` and
+        ``shards``) and returns the same result. SIMPSON runs in a private
+        scratch directory exactly as in ``run``; parsing the output happens
+        in a worker thread so the event loop is not blocked. With
+        ``decompose``, the parts run through ``arun_many``.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If the simulation exceeds ``timeout``. The SIMPSON process is
+            killed first.
+        asyncio.CancelledError
+            If the task is cancelled. The SIMPSON process is killed first.
+        RuntimeError
+            If SIMPSON returns a non-zero exit code.
 
+        Examples
+        --------
+        >>> spectrum = await calc.arun(timeout=600)
+        """
+        simpson_executable = _find_simpson(simpson_path)
+        out_format = self._out_format()
+
+        if decompose:
+            parts = await asyncio.to_thread(self.decompose)
+            if len(parts) > 1:
+                if filepath is not None or not read_output:
+                    raise ValueError("decompose cannot be combined with filepath or read_output=False")
+                b0, nucleus = self._output_metadata(b0, nucleus)
+                results = await arun_many(
+                    [part for part, _ in parts],
+                    timeout=timeout,
+                    b0=b0,
+                    nucleus=nucleus,
+                    simpson_path=simpson_executable,
+                    cache=cache,
+                )
+                return await asyncio.to_thread(
+                    _weighted_sum, results, [weight for _, weight in parts], out_format
+                )
+
+        result_cache, key = None, None
+        if cache and read_output:
+            result_cache, key, hit = await asyncio.to_thread(
+                self._lookup_cache, cache, simpson_executable, out_format, b0, nucleus
+            )
+            if hit is not None:
+                return hit
+
+        workdir = Path(tempfile.mkdtemp(prefix="simpyson-", dir=_scratch_root()))
+        try:
+            input_file, output_file, target = self._stage_input(
+                workdir, filepath, delete_files, out_format
+            )
+            cmd = [simpson_executable, input_file.name]
+            process = await asyncio.create_subprocess_exec(
+                *cmd, cwd=workdir, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await _kill(process)
+                raise subprocess.TimeoutExpired(cmd, timeout) from None
+            except BaseException:
+                await _kill(process)
+                raise
+
+            stdout, stderr = stdout.decode(errors='replace'), stderr.decode(errors='replace')
+            if process.returncode != 0:
+                raise _simpson_failure(process.returncode, stdout, stderr)
+
+            return await asyncio.to_thread(
+                self._collect_output,
+                stdout, stderr, output_file, target, out_format, filepath,
+                read_output, delete_files, result_cache, key, b0, nucleus,
+            )
         finally:
-            if delete_files:
-                if temp_file and Path(temp_file).exists():
-                    Path(temp_file).unlink()
-                elif filepath and Path(filepath).exists():
-                    Path(filepath).unlink()
+            shutil.rmtree(workdir, ignore_errors=True)
 
-                for location in possible_locations:
-                    with contextlib.suppress(OSError):
-                        Path(location).unlink(missing_ok=True)
+    def _out_format(self) -> str:
+        return self.parameters.get('out_format', self.output_config.get('format', 'spe'))
 
-def simulate_spectrum(
-    spinsys: str | object,
-    delete_files: bool = True,
-    filepath: str | None = None,
-    **kwargs,
-) -> object:
-    """
-    Simulate a spectrum from a spin system with smart defaults.
+    def _referenced_files(self, text: str) -> list[Path]:
+        """
+        Files on disk that the input ``text`` reads, found as in ``_stage_input``.
 
-    Automatically calculates the spectral width and center frequency from the
-    chemical shifts in the spin system, then runs a ``no_pulse`` simulation
-    via SIMPSON.
+        Covers the ``crystal_file`` (also in ``$SIMPSON_CRYSTAL_DIR``) and the
+        other file arguments rewritten by ``_absolute_paths``. Files that
+        those files load in turn are not followed.
+        """
+        files = []
+        with contextlib.suppress(KeyError, FileNotFoundError):
+            files.append(_find_crystal_file(str(self.parameters['crystal_file'])))
+        for match in _PATH_ARG_RE.finditer(text):
+            path = Path(match.group(2))
+            for candidate in (path, path.with_name(f"{path.name}.cry")):
+                if candidate.is_file():
+                    files.append(candidate)
+                    break
+        return files
+
+    def _lookup_cache(
+        self,
+        cache: bool | str,
+        simpson_executable: str,
+        out_format: str,
+        b0: str | None,
+        nucleus: str | None,
+    ) -> tuple[DiskCache, str, object | None]:
+        """Open the result cache and return ``(cache, key, result or None)``."""
+        result_cache = DiskCache('results', directory=None if cache is True else cache)
+        text = str(self)
+        # Contents of crystal, shape and Tcl files the input reads, so editing
+        # one of them misses the cache
+        files = sorted({path.resolve() for path in self._referenced_files(text)})
+        key = hash_key(
+            _canonical_input(text), _simpson_identity(simpson_executable), out_format,
+            *(_file_identity(path) for path in files),
+        )
+        hit = result_cache.lookup(key, (f".{out_format}",))
+        if hit is None:
+            return result_cache, key, None
+        logger.debug("SIMPSON result cache hit %s", key)
+        b0, nucleus = self._output_metadata(b0, nucleus)
+        return result_cache, key, read_simp(str(hit[0]), format=out_format, b0=b0, nucleus=nucleus)
+
+    def _stage_input(
+        self,
+        workdir: Path,
+        filepath: str | None,
+        delete_files: bool,
+        out_format: str,
+    ) -> tuple[Path, Path, Path]:
+        """
+        Write the input file into ``workdir``.
 
-    Parameters
-    ----------
-    spinsys : str or object
-        Spin system definition. Can be a SIMPSON spinsys string or a Soprano
-        SpinSystem object with a ``to_simpson()`` method.
-    delete_files : bool
-        If True (default), delete input/output files after simulation.
-    filepath : str or None
-        Path to save the SIMPSON input file. If None, uses a temporary file.
-    **kwargs
-        Override any default simulation parameter. Common overrides:
-        ``proton_frequency``, ``spin_rate``, ``lb``, ``zerofill``,
-        ``detect_operator``.
+        Returns the input file, the path SIMPSON will write its output to
+        and the output path requested by ``out_name`` (with ``$par(name)``
+        replaced by the input stem). An absolute ``out_name`` or one with
+        ``..`` is written under its base name inside ``workdir``, and
+        ``_collect_output`` moves it to the requested place.
+        """
+        with contextlib.suppress(ValueError):
+            dimension = hilbert_dimension(self.generate_spinsys())
+            if dimension > _LARGE_DIMENSION:
+                logger.warning(
+                    "Spin system has Hilbert-space dimension %d; SIMPSON time grows steeply "
+                    "with it. SimpCalc.prune() can drop weakly coupled spins.", dimension,
+                )
+        stem = Path(filepath).stem if filepath else "simpson"
+        input_file = workdir / f"{stem}.in"
+        staged = self
+        with contextlib.suppress(KeyError, FileNotFoundError):
+            staged = self.with_parameters(crystal_file=_crystal_file_arg(str(self.parameters['crystal_file'])))
+
+        out_name = str(self.parameters.get('out_name',
+                       self.output_config.get('name', '$par(name)')))
+        out_name = out_name.replace('$par(name)', stem)
+        target = relative = Path(f"{out_name}.{out_format}")
+        if target.is_absolute() or '..' in target.parts:
+            # Keep SIMPSON inside the scratch directory
+            relative = Path(target.name)
+            staged = staged.with_parameters(out_name=Path(out_name).name)
+
+        input_file.write_text(_absolute_paths(str(staged), Path.cwd()))
+        if filepath is not None and not delete_files:
+            shutil.copyfile(input_file, filepath)
+
+        output_file = workdir / relative
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        return input_file, output_file, target
+
+    def _collect_output(
+        self,
+        stdout: str,
+        stderr: str,
+        output_file: Path,
+        target: Path,
+        out_format: str,
+        filepath: str | None,
+        read_output: bool,
+        delete_files: bool,
+        result_cache: DiskCache | None,
+        key: str | None,
+        b0: str | None,
+        nucleus: str | None,
+    ) -> str | object:
+        """Cache, keep and/or read the output of a finished SIMPSON run."""
+        if read_output and not output_file.exists():
+            raise FileNotFoundError(
+                f"SIMPSON output file not found at {output_file}\n"
+                f"SIMPSON stdout: {stdout}\n"
+                f"SIMPSON stderr: {stderr}"
+            )
 
-    Returns
-    -------
-    Simpy
-        Object containing the simulated spectrum.
-    """
+        if result_cache is not None:
+            try:
+                result_cache.write(key, f".{out_format}", lambda f: f.write(output_file.read_bytes()))
+                result_cache.maybe_evict()
+            except OSError as e:
+                logger.warning("Could not write result cache entry: %s", e)
+
+        if not delete_files and output_file.exists():
+            # Relative out_name values (with any subdirectories) are kept relative
+            # to where files are kept; absolute ones go where they point
+            keep_dir = Path(filepath).parent if filepath else Path.cwd()
+            target = keep_dir / target
+            target.parent.mkdir(parents=True, exist_ok=True)
+            output_file = Path(shutil.move(output_file, target))
+
+        if not read_output:
+            return stdout
+
+        # Read the output file
+        b0, nucleus = self._output_metadata(b0, nucleus)
+        return read_simp(str(output_file), format=out_format, b0=b0, nucleus=nucleus)
+
+
+def _simulation_calc(spinsys: str | object, **kwargs) -> SimpCalc:
+    """Build the ``SimpCalc`` behind ``simulate_spectrum`` (defaults, SW and offset)."""
     # Defaults
     defaults = {
         'proton_frequency': 800e6,
@@ -753,6 +1564,342 @@ def simulate_spectrum(
 
         params['sw'] = sw_hz
 
-    # Create calculator and run
-    calc = SimpCalc(spinsys, **params)
-    return calc.run(read_output=True, filepath=filepath, delete_files=delete_files)
+    return SimpCalc(spinsys, **params)
+
+
+def _analytic_engine(calc: SimpCalc, engine: str, given: Iterable[str] = ()) -> str | None:
+    """
+    Resolve the ``engine`` argument of ``simulate_spectrum`` (None means SIMPSON).
+
+    When ``'auto'`` replaces SIMPSON by an analytic engine, this is logged
+    at INFO level, or as a warning if ``given`` (the caller's keyword
+    arguments) sets parameters the engine ignores.
+    """
+    if engine == 'simpson':
+        return None
+    if engine != 'auto':
+        return engine
+    analytic = select_engine(calc)
+    if analytic is not None:
+        ignored = [key for key in _ANALYTIC_IGNORED if key in given]
+        log = logger.warning if ignored else logger.info
+        log(
+            "Using the '%s' engine instead of SIMPSON; it does not use %s. "
+            "Pass engine='simpson' to run SIMPSON.",
+            analytic, ", ".join(ignored or _ANALYTIC_IGNORED),
+        )
+    return analytic
+
+
+def _engine_parts(parts: list, engine: str, given: Iterable[str] = ()) -> tuple[list, list[int]]:
+    """
+    Compute the decomposed parts an analytic engine covers.
+
+    Returns the result list (None where SIMPSON is needed) and the indices
+    of the parts left for SIMPSON.
+    """
+    results = []
+    pending = []
+    for i, (part, _) in enumerate(parts):
+        analytic = _analytic_engine(part, engine, given)
+        results.append(None if analytic is None else simulate_analytic(part, analytic))
+        if analytic is None:
+            pending.append(i)
+    return results, pending
+
+
+def _plan_simulation(
+    spinsys: str | object, engine: str, decompose: bool, kwargs: dict
+) -> tuple[SimpCalc, object, list, list, list[int]]:
+    """
+    Build the calculator and compute what the analytic engines cover.
+
+    Returns ``(calc, result, parts, results, pending)``. ``result`` is the
+    spectrum when one engine covers the whole spin system, otherwise None.
+    ``parts`` holds the uncoupled parts when there are several (else it is
+    empty), with ``results`` and ``pending`` as from ``_engine_parts``.
+    """
+    calc = _simulation_calc(spinsys, **kwargs)
+    analytic = _analytic_engine(calc, engine, kwargs)
+    if analytic is not None:
+        return calc, simulate_analytic(calc, analytic), [], [], []
+
+    parts = calc.decompose() if decompose else []
+    if len(parts) < 2:
+        return calc, None, [], [], []
+    results, pending = _engine_parts(parts, engine, kwargs)
+    return calc, None, parts, results, pending
+
+
+def simulate_spectrum(
+    spinsys: str | object,
+    delete_files: bool = True,
+    filepath: str | None = None,
+    cache: bool | str = False,
+    engine: str = 'auto',
+    decompose: bool = True,
+    **kwargs,
+) -> object:
+    """
+    Simulate a spectrum from a spin system with smart defaults.
+
+    Automatically calculates the spectral width and center frequency from the
+    chemical shifts in the spin system, then runs a ``no_pulse`` simulation
+    via SIMPSON, or computes it in-process when an analytic engine covers
+    the spin system (see ``simpyson.engines``).
+
+    Parameters
+    ----------
+    spinsys : str or object
+        Spin system definition. Can be a SIMPSON spinsys string or a Soprano
+        SpinSystem object with a ``to_simpson()`` method.
+    delete_files : bool
+        If True (default), delete input/output files after simulation.
+    filepath : str or None
+        Path to save the SIMPSON input file. If None, uses a temporary file.
+    cache : bool or str
+        Result cache setting passed to ``SimpCalc.run``.
+    engine : str
+        ``'auto'`` (default) uses an in-process NumPy engine when one can
+        model the spin system and SIMPSON otherwise. The engines compute
+        their own powder average, so ``crystal_file`` and ``gamma_angles``
+        are not used; the switch is logged (as a warning if either was
+        passed). ``'simpson'`` always runs SIMPSON; an engine name
+        (``'csa'``, ``'quadrupolar'``) forces that engine.
+    decompose : bool
+        If True (default) and no input file is kept, uncoupled parts of the
+        spin system are simulated separately (each with an analytic engine
+        when one applies, otherwise with SIMPSON, concurrently) and summed
+        with their weights (see ``SimpCalc.decompose``). The result equals
+        the full simulation.
+    **kwargs
+        Override any default simulation parameter. Common overrides:
+        ``proton_frequency``, ``spin_rate``, ``lb``, ``zerofill``,
+        ``detect_operator``.
+
+    Returns
+    -------
+    Simpy
+        Object containing the simulated spectrum.
+    """
+    calc, result, parts, results, pending = _plan_simulation(
+        spinsys, engine, decompose and filepath is None and delete_files, kwargs
+    )
+    if result is not None:
+        return result
+    if parts:
+        b0, nucleus = calc._output_metadata(None, None)
+        simpson = run_many([parts[i][0] for i in pending], cache=cache, b0=b0, nucleus=nucleus)
+        for i, spectrum in zip(pending, simpson, strict=True):
+            results[i] = spectrum
+        return _weighted_sum(results, [weight for _, weight in parts], calc._out_format())
+    return calc.run(read_output=True, filepath=filepath, delete_files=delete_files, cache=cache)
+
+
+async def simulate_spectrum_async(
+    spinsys: str | object,
+    delete_files: bool = True,
+    filepath: str | None = None,
+    cache: bool | str = False,
+    timeout: float | None = None,
+    engine: str = 'auto',
+    decompose: bool = True,
+    **kwargs,
+) -> object:
+    """
+    Coroutine version of ``simulate_spectrum``.
+
+    Uses the same defaults and runs SIMPSON through ``SimpCalc.arun``.
+
+    Parameters
+    ----------
+    spinsys : str or object
+        Spin system definition (see ``simulate_spectrum``).
+    delete_files : bool
+        If True (default), delete input/output files after simulation.
+    filepath : str or None
+        Path to save the SIMPSON input file. If None, uses a temporary file.
+    cache : bool or str
+        Result cache setting passed to ``SimpCalc.arun``.
+    timeout : float or None
+        Timeout in seconds; SIMPSON is killed when it is exceeded.
+    engine : str
+        Engine selection (see ``simulate_spectrum``).
+    decompose : bool
+        Simulate uncoupled parts separately (see ``simulate_spectrum``);
+        their SIMPSON runs go through ``arun_many``.
+    **kwargs
+        Override any default simulation parameter.
+
+    Returns
+    -------
+    Simpy
+        Object containing the simulated spectrum.
+    """
+    # Building the calculator, decomposing and the analytic engines are
+    # CPU work, so they run in a worker thread instead of on the event loop
+    calc, result, parts, results, pending = await asyncio.to_thread(
+        _plan_simulation, spinsys, engine, decompose and filepath is None and delete_files, kwargs
+    )
+    if result is not None:
+        return result
+    if parts:
+        b0, nucleus = calc._output_metadata(None, None)
+        simpson = await arun_many(
+            [parts[i][0] for i in pending], cache=cache, timeout=timeout, b0=b0, nucleus=nucleus
+        )
+        for i, spectrum in zip(pending, simpson, strict=True):
+            results[i] = spectrum
+        return await asyncio.to_thread(
+            _weighted_sum, results, [weight for _, weight in parts], calc._out_format()
+        )
+    return await calc.arun(
+        read_output=True, filepath=filepath, delete_files=delete_files, cache=cache, timeout=timeout
+    )
+
+
+def _equivalent_clusters(atoms: object, sites: list[int], clusters: list) -> tuple[list, list]:
+    """
+    Group sites whose tensors and cluster environments are equivalent.
+
+    Two sites share a group when ``equivalent_sites`` matches them and their
+    clusters have the same sorted list of pair distances (to 1e-3 Angstrom)
+    between atoms of matching tensor classes. Returns the groups and the
+    cluster of each group's first site.
+    """
+    members = sorted({index for cluster in clusters for index in cluster.info['indices']})
+    tensor_class = {
+        index: k for k, group in enumerate(equivalent_sites(atoms, indices=members)) for index in group
+    }
+    grouped: dict[tuple, tuple[list, object]] = {}
+    for site, cluster in zip(sites, clusters, strict=True):
+        classes = [tensor_class[index] for index in cluster.info['indices']]
+        distances = cluster.get_all_distances()
+        couplings = sorted(
+            (min(classes[a], classes[b]), max(classes[a], classes[b]), round(float(distances[a, b]), 3))
+            for a, b in itertools.combinations(range(len(cluster)), 2)
+        )
+        key = (classes[0], tuple(couplings))
+        grouped.setdefault(key, ([], cluster))[0].append(int(site))
+    return [group for group, _ in grouped.values()], [cluster for _, cluster in grouped.values()]
+
+
+def _cluster_parts(spinsys_list: list, multiplicities: list, **kwargs) -> list[tuple[SimpCalc, float]]:
+    """
+    Build one calculator per cluster spin system, sharing SW and offset.
+
+    The central site (site 1) is the only one excited and detected, and
+    each result is scaled to one site times its multiplicity.
+    """
+    parsed = [parse_spinsys(spinsys) for spinsys in spinsys_list]
+    for p in parsed:
+        if p['channels'][:1] != p['nuclei'][:1]:
+            raise ValueError(
+                f"The observed site's nucleus ({p['nuclei'][0]}) must be the first channel, "
+                f"got channels {p['channels']}; build the spin systems with obs_nuc set"
+            )
+    # Estimate the window from the central sites only, so every cluster
+    # shares one axis
+    probe = _simulation_calc("".join(extract_spinsys(p, [1]) for p in parsed), **kwargs)
+
+    parts = []
+    for spinsys, p, multiplicity in zip(spinsys_list, parsed, multiplicities, strict=True):
+        calc = probe.with_parameters(spinsys=spinsys)
+        if len(p['nuclei']) > 1:
+            calc = calc.with_parameters(**{
+                key: re.sub(r'\bIn', 'I1', str(calc.parameters[key]))
+                for key in ('start_operator', 'detect_operator')
+            })
+        # Tr(rho D) of a site-1 operator grows with the dimension of the other spins
+        others = math.prod(int(2 * get_spin(nucleus) + 1) for nucleus in p['nuclei'][1:])
+        parts.append((calc, multiplicity / others))
+    return parts
+
+
+def simulate_clusters(
+    atoms: object,
+    sites: list[int],
+    build_spinsys,
+    n_neighbours: int = 4,
+    neighbours: list[int] | None = None,
+    isotopes: dict | None = None,
+    equivalent: bool = True,
+    max_workers: int | None = None,
+    cache: bool | str = False,
+    engine: str = 'auto',
+    **kwargs,
+) -> object:
+    """
+    Simulate a periodic structure as a sum of small per-site clusters.
+
+    Each observed site is simulated together with its ``n_neighbours``
+    most strongly coupled spins (see ``simpyson.utils.site_clusters``),
+    with only the site itself excited and detected. Sites with equivalent
+    NMR tensors and equivalent clusters are simulated once and weighted by
+    their multiplicity. The
+    clusters run concurrently and share the spectral window that
+    ``simulate_spectrum`` would choose for all sites together.
+
+    Parameters
+    ----------
+    atoms : ase.Atoms
+        Structure with the per-atom data ``build_spinsys`` needs.
+    sites : list of int
+        Indices of the observed sites (all of the same nucleus).
+    build_spinsys : callable
+        Called with each cluster (an ``ase.Atoms`` whose first atom is the
+        site) and returning its spinsys string or Soprano SpinSystem. The
+        site's nucleus must be the first channel, e.g.
+        ``lambda c: simple_spinsys(c, isotopes, ..., obs_nuc='27Al')``.
+    n_neighbours : int
+        Number of neighbours per cluster. With 0, every site is simulated
+        alone (with an analytic engine when one applies).
+    neighbours : list of int or None
+        Indices of the atoms that may be neighbours. Defaults to all atoms.
+    isotopes : dict or None
+        Mapping of element symbol to mass number used to rank couplings.
+    equivalent : bool
+        If True (default) and ``atoms`` has ``ms`` or ``efg`` arrays,
+        simulate one site per group of equivalent sites: same tensors
+        (``simpyson.utils.equivalent_sites``) and the same pair distances
+        between tensor-equivalent atoms in their clusters.
+    max_workers : int or None
+        Number of concurrent SIMPSON runs. If None, ``os.cpu_count()``.
+    cache : bool or str
+        Result cache setting passed to ``SimpCalc.run``.
+    engine : str
+        Engine selection for each cluster (see ``simulate_spectrum``).
+    **kwargs
+        Simulation parameters, as in ``simulate_spectrum``.
+
+    Returns
+    -------
+    Simpy
+        Sum of the cluster spectra, each normalized to one site and
+        weighted by its multiplicity.
+
+    Examples
+    --------
+    >>> total = simulate_clusters(
+    ...     atoms, al_idx, lambda c: write_spinsys(c, use_ms=True, q_order=2, ...),
+    ...     n_neighbours=3, neighbours=p_idx, spin_rate=40e3,
+    ... )
+    """
+    clusters = site_clusters(atoms, sites, n_neighbours, neighbours=neighbours, isotopes=isotopes)
+    if equivalent and (atoms.has('ms') or atoms.has('efg')):
+        groups, clusters = _equivalent_clusters(atoms, sites, clusters)
+    else:
+        groups = [[int(site)] for site in sites]
+    logger.debug("Simulating %d clusters for %d sites", len(clusters), len(sites))
+
+    parts = _cluster_parts(
+        [build_spinsys(cluster) for cluster in clusters], [len(group) for group in groups], **kwargs
+    )
+    results, pending = _engine_parts(parts, engine, kwargs)
+    b0, nucleus = parts[0][0]._output_metadata(None, None)
+    simpson = run_many(
+        [parts[i][0] for i in pending], max_workers=max_workers, cache=cache, b0=b0, nucleus=nucleus
+    )
+    for i, result in zip(pending, simpson, strict=True):
+        results[i] = result
+    return _weighted_sum(results, [weight for _, weight in parts], parts[0][0]._out_format())
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 
 import ase.io
@@ -146,6 +147,34 @@ def read_vasp(file: str, format: str) -> ase.Atoms:
     return atoms
 
 
+def _proton_freq_to_b0(proton_freq):
+    """
+    Convert a proton_frequency value to a b0 string like '800.0MHz'.
+
+    Parameters
+    ----------
+    proton_freq : int, float, or str
+        Proton frequency in Hz (numeric) or as a string with units.
+
+    Returns
+    -------
+    str or None
+        B0 string suitable for ``hz2ppm`` / ``ppm2hz``, or None if conversion
+        is not possible.
+    """
+    if isinstance(proton_freq, (int, float)):
+        if proton_freq > 1e6:
+            return f"{proton_freq / 1e6:.1f}MHz"
+        return f"{proton_freq}MHz"
+    if isinstance(proton_freq, str):
+        match = re.match(r'(\d+(?:\.\d+)?)\s*([kMGT]?[Hh]z)?', proton_freq)
+        if match:
+            value, unit = match.groups()
+            if not unit or unit.lower() in ('hz', 'khz', 'mhz', 'ghz', 'thz'):
+                return proton_freq if unit else f"{float(value)}MHz"
+    return None
+
+
 def hz2ppm(
     hz: np.ndarray | float,
     b0: str,
@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+from simpyson.converter import _proton_freq_to_b0, ppm2hz
+from simpyson.fft import fft, fid_to_spectrum, ifft
+from simpyson.simpy import LinearAxis, Simpy
+from simpyson.templates import NoPulse
+from simpyson.utils import get_larmor_freq, get_spin, parse_spinsys
+
+logger = logging.getLogger("simpyson")
+
+ENGINES = ('csa', 'quadrupolar')
+
+# Default number of powder orientations (uniform on a hemisphere)
+STATIC_ORIENTATIONS = 20000
+MAS_ORIENTATIONS = 2000
+
+MAGIC_ANGLE = np.arccos(1 / np.sqrt(3))
+
+# Upper bound on (site x orientation) x rotor-phase samples per batch
+_MAS_BATCH = 1 << 22
+
+
+def _to_hz(token: str, b0: str, nucleus: str) -> float:
+    """Convert a spinsys value to Hz (``'5p'`` means 5 ppm)."""
+    if token.endswith('p'):
+        return float(ppm2hz(float(token[:-1]), b0, nucleus))
+    return float(token)
+
+
+def _hemisphere(n: int) -> np.ndarray:
+    """
+    Return ``n`` equal-area unit vectors on the upper hemisphere.
+
+    Points are spaced uniformly in ``cos(beta)`` and by the golden angle in
+    ``alpha`` (a spherical Fibonacci lattice), so all carry equal weight.
+    The shift and second-order quadrupolar frequencies are even in the
+    field direction, so a hemisphere covers the whole powder.
+    """
+    k = np.arange(n) + 0.5
+    cos_beta = k / n
+    alpha = np.pi * (3.0 - np.sqrt(5.0)) * k
+    sin_beta = np.sqrt(1.0 - cos_beta ** 2)
+    return np.column_stack((sin_beta * np.cos(alpha), sin_beta * np.sin(alpha), cos_beta))
+
+
+def _csa_frequency(b: np.ndarray, iso: float, aniso: float, eta: float) -> np.ndarray:
+    """Shift frequency for field directions ``b`` (PAS frame, last axis xyz)."""
+    bx, by, bz = b[..., 0], b[..., 1], b[..., 2]
+    return iso + 0.5 * aniso * (3 * bz ** 2 - 1 - eta * (bx ** 2 - by ** 2))
+
+
+def _quadrupolar_ct_frequency(b: np.ndarray, scale: float, eta: float) -> np.ndarray:
+    """
+    Second-order quadrupolar shift of the central transition for field
+    directions ``b`` (EFG PAS frame, last axis xyz).
+
+    With ``V`` the EFG tensor normalised to ``Vzz = 1``, ``q = b.V.b`` and
+    ``p = |V.b|^2``, the shift is ``scale (S2 - 2 S1)`` where
+    ``S1 = p - q^2`` and ``S2 = (tr(V^2) - 2 p + q^2 / 2) / 2`` (the lab-frame
+    ``|V_{+-1}|^2`` and ``|V_{+-2}|^2`` terms). Its powder average is the
+    isotropic quadrupolar shift ``-scale (3 + eta^2) / 10``.
+    """
+    d = np.array([-0.5, -0.5, 1.0]) + np.multiply.outer(eta, [-0.5, 0.5, 0.0])
+    b2 = b ** 2
+    q = np.sum(d * b2, axis=-1)
+    p = np.sum(d ** 2 * b2, axis=-1)
+    s1 = p - q ** 2
+    s2 = ((3 + eta ** 2) / 2 - 2 * p + q ** 2 / 2) / 2
+    return scale * (s2 - 2 * s1)
+
+
+def _euler_matrix(euler: tuple[float, float, float]) -> np.ndarray:
+    """
+    Rotation taking crystal-frame vectors into a tensor PAS.
+
+    ``euler`` holds the SIMPSON ``(alpha, beta, gamma)`` angles in degrees
+    (zyz convention, PAS to crystal frame).
+    """
+    alpha, beta, gamma = np.radians(euler)
+
+    def rz(angle):
+        c, s = np.cos(angle), np.sin(angle)
+        return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+    c, s = np.cos(beta), np.sin(beta)
+    ry = np.array([[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]])
+    return rz(alpha) @ ry @ rz(gamma)
+
+
+def _frequencies(b: np.ndarray, sites: list[dict]) -> np.ndarray:
+    """
+    Observed frequency of every site for field directions ``b``.
+
+    Parameters
+    ----------
+    b : numpy.ndarray
+        Field directions in the crystal frame, shape ``(..., 3)``.
+    sites : list of dict
+        Sites as returned by ``_sites``. Missing keys default to no
+        quadrupolar coupling and zero Euler angles.
+
+    Returns
+    -------
+    numpy.ndarray
+        Frequencies in Hz, shape ``(len(sites), ...)``.
+    """
+    expand = (slice(None),) + (None,) * (b.ndim - 1)
+
+    def site_array(key, default=0.0):
+        return np.array([site.get(key, default) for site in sites])[expand]
+
+    def to_pas(key):
+        rotations = np.stack([_euler_matrix(site.get(key, (0.0, 0.0, 0.0))) for site in sites])
+        return np.einsum('sij,...j->s...i', rotations, b)
+
+    nu = _csa_frequency(to_pas('euler'), site_array('iso'), site_array('aniso'), site_array('eta'))
+    if any(site.get('quad', 0.0) for site in sites):
+        nu = nu + _quadrupolar_ct_frequency(to_pas('euler_q'), site_array('quad'), site_array('eta_q'))
+    return nu
+
+
+def _perpendicular_basis(u: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return two unit vectors completing each row of ``u`` to an orthonormal frame."""
+    helper = np.where(np.abs(u[:, 2:3]) < 0.9, [0.0, 0.0, 1.0], [1.0, 0.0, 0.0])
+    e1 = np.cross(u, helper)
+    e1 /= np.linalg.norm(e1, axis=1, keepdims=True)
+    return e1, np.cross(u, e1)
+
+
+def _mas_sidebands(
+    sites: list[dict],
+    spin_rate: float,
+    orientations: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sideband frequencies and intensities of uncoupled sites under MAS.
+
+    For every site and rotor-axis orientation the frequency is sampled at
+    ``K`` rotor phases over one period (the field sweeps a cone at the
+    magic angle around the rotor axis). Its Fourier coefficients
+    ``c_m`` give the accumulated phase
+    ``Phi(phi) = sum_{m != 0} c_m (exp(i m phi) - 1) / (i m nu_r)`` exactly,
+    and the FFT of ``exp(i Phi)`` gives the coefficients ``F_N``. After
+    averaging over the rotor phase gamma, sideband ``N`` sits at
+    ``c_0 + N nu_r`` with intensity ``|F_N|^2`` (Herzfeld-Berger; the
+    intensities of each crystallite sum to one).
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Flat arrays of frequencies (Hz) and weights.
+    """
+    u = _hemisphere(orientations)
+    e1, e2 = _perpendicular_basis(u)
+
+    # Enough rotor-phase samples to resolve every significant sideband
+    span = np.ptp(_frequencies(_hemisphere(256), sites), axis=1).max()
+    n_phase = 32
+    while n_phase < 8 * span / spin_rate + 16 and n_phase < 4096:
+        n_phase *= 2
+    phi = 2 * np.pi * np.arange(n_phase) / n_phase
+    m = np.fft.fftfreq(n_phase, 1 / n_phase)
+
+    # (orientation, phase, xyz) field directions in the crystal frame
+    b = (np.cos(MAGIC_ANGLE) * u[:, None, :]
+         + np.sin(MAGIC_ANGLE) * (np.cos(phi)[:, None] * e1[:, None, :]
+                                  + np.sin(phi)[:, None] * e2[:, None, :]))
+
+    freqs = []
+    weights = []
+    rows = max(1, _MAS_BATCH // (n_phase * len(sites)))
+    for start in range(0, orientations, rows):
+        coeff = fft(_frequencies(b[start:start + rows], sites), axis=-1) / n_phase
+        with np.errstate(divide='ignore', invalid='ignore'):
+            a = np.where(m != 0, coeff / (1j * m * spin_rate), 0.0)
+        phase = ifft(a, axis=-1) * n_phase - a.sum(axis=-1, keepdims=True)
+        amplitude = fft(np.exp(1j * phase.real), axis=-1) / n_phase
+        freqs.append(m * spin_rate + coeff[..., :1].real)
+        weights.append(np.abs(amplitude) ** 2)
+
+    freqs = np.concatenate(freqs, axis=1)
+    weights = np.concatenate(weights, axis=1) / orientations
+    return freqs.ravel(), weights.ravel()
+
+
+def _parameter(calc, name: str, default: float = 0.0) -> float:
+    """Read a numeric simulation parameter from the calculator or its pulse sequence."""
+    for source in (calc.parameters, getattr(calc.pulse_sequence, 'parameters', {})):
+        for key in (name, f'variable_{name}'):
+            if key in source:
+                return float(source[key])
+    return default
+
+
+def _output_setting(calc, name: str, default):
+    return calc.parameters.get(name, calc.output_config.get(name.replace('out_', ''), default))
+
+
+def _euler(values: list[str]) -> tuple[float, float, float]:
+    angles = tuple(float(v) for v in values[:3])
+    return angles + (0.0,) * (3 - len(angles))
+
+
+def _sites(calc, b0: str) -> list[dict] | None:
+    """
+    Describe every site of an uncoupled, single-channel spin system.
+
+    Each site holds its shift tensor (``iso``, ``aniso`` in Hz, ``eta``,
+    ``euler``) and, for quadrupolar nuclei, the second-order central
+    transition prefactor ``quad = (Cq / (2I(2I-1)))^2 (I(I+1) - 3/4) / nu0``
+    (Hz, signed Larmor frequency ``nu0``; zero for first-order couplings,
+    which do not shift the central transition), ``eta_q`` and ``euler_q``.
+
+    Returns None when the spin system has couplings, several channels, or
+    interactions the engines do not model.
+    """
+    try:
+        spinsys = parse_spinsys(calc.generate_spinsys())
+        nucleus = spinsys['nuclei'][0] if spinsys['nuclei'] else None
+        spin = get_spin(nucleus) if nucleus else None
+    except ValueError:
+        return None
+    nuclei = spinsys['nuclei']
+    if not nuclei or len(set(nuclei)) != 1 or spinsys['channels'] not in ([], [nucleus]):
+        return None
+
+    larmor = get_larmor_freq(b0, nucleus) * 1e6
+    sites = [
+        {'iso': 0.0, 'aniso': 0.0, 'eta': 0.0, 'euler': (0.0, 0.0, 0.0),
+         'quad': 0.0, 'eta_q': 0.0, 'euler_q': (0.0, 0.0, 0.0)}
+        for _ in nuclei
+    ]
+    for kind, (site, *_), values in spinsys['interactions']:
+        if len(values) < 3 or not 1 <= site <= len(sites):
+            return None
+        if kind == 'shift':
+            sites[site - 1].update(
+                iso=_to_hz(values[0], b0, nucleus),
+                aniso=_to_hz(values[1], b0, nucleus),
+                eta=float(values[2]),
+                euler=_euler(values[3:]),
+            )
+        elif kind == 'quadrupole' and spin > 0.5:
+            order, cq = int(float(values[0])), float(values[1])
+            quad = 0.0
+            if order == 2:
+                quad = (cq / (2 * spin * (2 * spin - 1))) ** 2 * (spin * (spin + 1) - 0.75) / larmor
+            sites[site - 1].update(quad=quad, eta_q=float(values[2]), euler_q=_euler(values[3:]))
+        else:
+            return None
+    return sites
+
+
+def select_engine(calc) -> str | None:
+    """
+    Return the in-process engine able to reproduce a SIMPSON run, if any.
+
+    Parameters
+    ----------
+    calc : SimpCalc
+        Calculator as built by ``simulate_spectrum``.
+
+    Returns
+    -------
+    str or None
+        ``'csa'`` for uncoupled spin-1/2 sites with only ``shift``
+        interactions (static or MAS, ``Inp`` detection), ``'quadrupolar'``
+        for uncoupled quadrupolar sites with ``shift`` and ``quadrupole``
+        interactions detected on the central transition (``Inc``), or None
+        if SIMPSON is needed.
+    """
+    if calc.pulse_sequence is not None and not isinstance(calc.pulse_sequence, NoPulse):
+        return None
+    if calc.parameters.get('start_operator') != 'Inx':
+        return None
+    if _output_setting(calc, 'out_format', 'spe') not in ('spe', 'fid'):
+        return None
+    b0 = _proton_freq_to_b0(calc.parameters.get('proton_frequency'))
+    sites = _sites(calc, b0) if b0 else None
+    if not sites:
+        return None
+
+    spin = get_spin(parse_spinsys(calc.generate_spinsys())['nuclei'][0])
+    detect = calc.parameters.get('detect_operator')
+    if spin == 0.5 and detect == 'Inp':
+        return 'csa'
+    if spin > 0.5 and detect == 'Inc':
+        return 'quadrupolar'
+    return None
+
+
+def _render(calc, freqs: np.ndarray, weights: np.ndarray, b0: str, nucleus: str) -> Simpy:
+    """
+    Turn a stick spectrum into the FID or spectrum SIMPSON would save.
+
+    The sticks (Hz, absolute) are moved into the frame of the carrier
+    ``offset`` and spread linearly over the two nearest points of a grid
+    with spacing ``sw / n``; an inverse FFT of that grid is the FID sampled
+    at the dwell time ``1 / sw`` (frequencies outside the window alias, as
+    in an acquisition). The first ``np`` points are then processed like
+    ``SimpCalc.generate_main``: ``faddlb`` (Lorentzian ``lb`` and Gaussian
+    ``gauss_lb``), ``fzerofill`` and, for spectra, ``fft`` (first point
+    halved) with ``ref``.
+    """
+    sw = _parameter(calc, 'sw')
+    npoints = int(_parameter(calc, 'np'))
+    zerofill = int(_output_setting(calc, 'zerofill', npoints))
+    lb = float(_output_setting(calc, 'lb', 20))
+    gauss_lb = float(_output_setting(calc, 'gauss_lb', 0))
+    out_format = _output_setting(calc, 'out_format', 'spe')
+    offset = _parameter(calc, 'offset')
+
+    n = max(npoints, zerofill)
+    position = np.mod((freqs - offset) / sw * n, n)
+    lower = np.floor(position)
+    frac = position - lower
+    lower = lower.astype(np.intp) % n
+    grid = np.bincount(lower, weights * (1 - frac), minlength=n)
+    grid += np.bincount((lower + 1) % n, weights * frac, minlength=n)
+
+    fid = ifft(grid.astype(np.complex128))[:npoints] * n
+    t = np.arange(npoints) / sw
+    fid *= np.exp(-np.pi * lb * t)
+    if gauss_lb:
+        fid *= np.exp(-((np.pi * gauss_lb * t) ** 2) / (4 * np.log(2)))
+    fid = np.concatenate((fid, np.zeros(max(zerofill - npoints, 0), complex)))[:zerofill]
+
+    simpy = Simpy(b0=b0, nucleus=nucleus)
+    if out_format == 'fid':
+        return simpy.from_fid(fid, None, zerofill, sw, copy=False)
+
+    if 'variable_ref' in calc.parameters or 'ref' in calc.parameters:
+        ref = _parameter(calc, 'ref')
+    else:
+        ref = 0.0
+    # SIMPSON's fft halves the t = 0 point (no baseline offset)
+    fid[0] *= 0.5
+    spectrum = fid_to_spectrum(fid)
+    hz = LinearAxis(-sw / 2 - ref, sw / zerofill, zerofill)
+    return simpy.from_spe(spectrum, None, zerofill, sw, hz, copy=False)
+
+
+def simulate_analytic(calc, engine: str = 'auto', orientations: int | None = None) -> Simpy:
+    """
+    Compute a SIMPSON simulation in-process with NumPy.
+
+    Parameters
+    ----------
+    calc : SimpCalc
+        Calculator describing the simulation. Its ``np``, ``sw``,
+        ``offset``, ``ref``, ``lb``, ``gauss_lb``, ``zerofill`` and
+        ``out_format`` settings are honoured as in ``SimpCalc.run``.
+    engine : str
+        ``'csa'``, ``'quadrupolar'`` or ``'auto'`` (pick with
+        ``select_engine``).
+    orientations : int or None
+        Number of powder orientations. Defaults to
+        ``STATIC_ORIENTATIONS`` (static) or ``MAS_ORIENTATIONS`` (MAS).
+
+    Returns
+    -------
+    Simpy
+        FID or spectrum on the same axis ``SimpCalc.run`` would return,
+        scaled like SIMPSON's ``Tr(rho(t) D)`` over the full Hilbert space:
+        at ``t = 0`` each site contributes ``(I + 1/2)^2 / 2`` times the
+        dimension of the other spins.
+
+    Raises
+    ------
+    ValueError
+        If the engine is unknown or cannot model this calculator.
+
+    Notes
+    -----
+    Both engines evaluate, for every site, the chemical shift frequency
+    ``iso + aniso/2 (3 cos^2(beta) - 1 - eta sin^2(beta) cos(2 alpha))`` and,
+    for ``'quadrupolar'``, the second-order quadrupolar shift of the
+    central transition (high-field limit, see
+    ``_quadrupolar_ct_frequency``), with the shift and EFG tensors placed
+    by their Euler angles. Static spectra are the histogram of these
+    frequencies over an equal-area orientation grid (see ``_render``);
+    under MAS (``spin_rate > 0``) the gamma-averaged Herzfeld-Berger
+    sidebands of every site and rotor orientation are rendered instead
+    (see ``_mas_sidebands``). The ``crystal_file`` of the calculator is
+    not used.
+    """
+    selected = select_engine(calc)
+    if engine == 'auto':
+        engine = selected
+        if engine is None:
+            raise ValueError("No analytic engine can model this simulation; run SIMPSON instead")
+    elif engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Available: {', '.join(ENGINES)}")
+    elif selected != engine:
+        raise ValueError(f"Engine '{engine}' cannot model this simulation")
+
+    b0 = _proton_freq_to_b0(calc.parameters['proton_frequency'])
+    nucleus = parse_spinsys(calc.generate_spinsys())['nuclei'][0]
+    sites = _sites(calc, b0)
+
+    spin_rate = float(_parameter(calc, 'spin_rate'))
+    if spin_rate > 0:
+        n_orient = orientations or MAS_ORIENTATIONS
+        freqs, weights = _mas_sidebands(sites, spin_rate, n_orient)
+    else:
+        n_orient = orientations or STATIC_ORIENTATIONS
+        freqs = _frequencies(_hemisphere(n_orient), sites).ravel()
+        weights = np.full(freqs.size, 1.0 / n_orient)
+    spin = get_spin(nucleus)
+    weights = weights * ((spin + 0.5) ** 2 / 2 * (2 * spin + 1) ** (len(sites) - 1))
+    logger.debug("Analytic '%s' engine: %d sites, %d orientations", engine, len(sites), n_orient)
+    return _render(calc, freqs, weights, b0, nucleus)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("simpyson")
+
+try:
+    import scipy.fft as _scipy_fft
+except ImportError:
+    _scipy_fft = None
+
+try:
+    import pyfftw.interfaces.cache as _fftw_cache
+    import pyfftw.interfaces.scipy_fft as _fftw
+except ImportError:
+    _fftw = None
+
+_BACKENDS = ('auto', 'scipy', 'numpy', 'pyfftw')
+
+_config: dict = {'backend': 'auto', 'workers': -1}
+
+
+def set_fft_backend(backend: str = 'auto', workers: int | None = None) -> None:
+    """
+    Select the FFT implementation used by ``Simpy`` conversions.
+
+    Parameters
+    ----------
+    backend : str
+        ``'scipy'`` (``scipy.fft``, multi-threaded), ``'numpy'``
+        (``numpy.fft``, single-threaded), ``'pyfftw'`` (FFTW with its
+        interface plan cache enabled) or ``'auto'`` (scipy if installed,
+        otherwise numpy).
+    workers : int or None
+        Number of threads for backends that support it. ``-1`` uses all
+        cores. If None, the current setting is kept.
+
+    Raises
+    ------
+    ValueError
+        If ``backend`` is unknown.
+    ImportError
+        If the requested backend is not installed.
+
+    Notes
+    -----
+    The scipy and numpy backends (both pocketfft) keep their own cache of
+    plans per transform size, so repeated conversions of equally sized data
+    reuse them. Threads only help for batches of transforms (2D input).
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown FFT backend '{backend}'. Available: {', '.join(_BACKENDS)}")
+    if backend == 'scipy' and _scipy_fft is None:
+        raise ImportError("The 'scipy' FFT backend requires scipy to be installed")
+    if backend == 'pyfftw':
+        if _fftw is None:
+            raise ImportError("The 'pyfftw' FFT backend requires pyFFTW to be installed")
+        _fftw_cache.enable()
+
+    _config['backend'] = backend
+    if workers is not None:
+        _config['workers'] = workers
+
+
+def get_fft_backend() -> tuple[str, int]:
+    """
+    Return the FFT backend in use and its worker setting.
+
+    Returns
+    -------
+    tuple of (str, int)
+        Resolved backend name (``'scipy'``, ``'numpy'`` or ``'pyfftw'``) and
+        number of workers.
+    """
+    backend = _config['backend']
+    if backend == 'auto':
+        backend = 'numpy' if _scipy_fft is None else 'scipy'
+    return backend, _config['workers']
+
+
+def _transform(x: np.ndarray, name: str, axis: int) -> np.ndarray:
+    backend, workers = get_fft_backend()
+    if backend == 'scipy':
+        return getattr(_scipy_fft, name)(x, axis=axis, workers=workers)
+    if backend == 'pyfftw':
+        return getattr(_fftw, name)(x, axis=axis, workers=workers)
+    return getattr(np.fft, name)(x, axis=axis)
+
+
+def fft(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    """
+    Forward FFT with the active backend.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Input signal(s).
+    axis : int
+        Axis to transform.
+
+    Returns
+    -------
+    numpy.ndarray
+        Transformed array.
+    """
+    return _transform(x, 'fft', axis)
+
+
+def ifft(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    """
+    Inverse FFT with the active backend.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Input spectrum (or spectra).
+    axis : int
+        Axis to transform.
+
+    Returns
+    -------
+    numpy.ndarray
+        Transformed array.
+    """
+    return _transform(x, 'ifft', axis)
+
+
+def fid_to_spectrum(fid: np.ndarray, axis: int = -1) -> np.ndarray:
+    """Return the centred spectrum ``fftshift(fft(fid))`` along ``axis``."""
+    return np.fft.fftshift(fft(fid, axis=axis), axes=axis)
+
+
+def spectrum_to_fid(spectrum: np.ndarray, axis: int = -1) -> np.ndarray:
+    """Return the FID ``ifft(ifftshift(spectrum))`` along ``axis``."""
+    return ifft(np.fft.ifftshift(spectrum, axes=axis), axis=axis)
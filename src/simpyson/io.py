@@ -1,27 +1,43 @@
 from __future__ import annotations
 
+import glob
+import io
+import itertools
+import json
 import logging
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 import csdmpy as csdm
 import numpy as np
 
-from simpyson.simpy import Simpy
+from simpyson.cache import DiskCache, hash_key
+from simpyson.simpy import LinearAxis, Simpy
+from simpyson.stack import SpectrumStack
 
 logger = logging.getLogger("simpyson")
 
+# Bumped whenever the layout of parse cache entries changes, so entries
+# written by older versions are never read back
+_CACHE_LAYOUT = 3
+
 
 def read_simp(
     filename: str,
     format: str | None = None,
     b0: str | None = None,
     nucleus: str | None = None,
+    cache: bool | str = False,
+    dtype: np.dtype | type = np.complex128,
 ) -> Simpy:
     """
     Read SIMPSON NMR data from a file into a unified Simpy object.
 
     The file format is determined from the extension if ``format`` is not
-    given explicitly.
+    given explicitly. SPE and FID files written with SIMPSON's ``-binary``
+    flag are detected from their header.
 
     Parameters
     ----------
@@ -36,6 +52,15 @@ def read_simp(
     nucleus : str or None
         Nucleus type (e.g., ``'1H'``, ``'13C'``).
         Needed for ppm conversion.
+    cache : bool or str
+        If True, keep the parsed arrays in the default cache directory (see
+        ``simpyson.cache.default_cache_dir``) and load them memory-mapped on
+        later calls instead of re-parsing. A string selects another cache
+        root. Entries are keyed by resolved path, size and mtime, so edited
+        files are re-parsed.
+    dtype : numpy.dtype
+        Complex dtype of the returned ``Simpy`` (``np.complex64`` halves
+        memory use).
 
     Returns
     -------
@@ -68,7 +93,19 @@ def read_simp(
         else:
             raise ValueError(f"Cannot determine file format of {filename}")
 
-    simpy_data = Simpy(b0=b0, nucleus=nucleus)
+    parse_cache = None
+    key = None
+    if cache:
+        parse_cache = DiskCache('parse', directory=None if cache is True else cache)
+        stat = Path(filename).stat()
+        key = hash_key(
+            Path(filename).resolve(), stat.st_size, stat.st_mtime_ns, format, _CACHE_LAYOUT
+        )
+        cached = _load_cached(parse_cache, key, b0, nucleus, dtype)
+        if cached is not None:
+            return cached
+
+    simpy_data = Simpy(b0=b0, nucleus=nucleus, dtype=dtype)
 
     try:
         if format == 'spe':
@@ -83,9 +120,306 @@ def read_simp(
             raise ValueError(f"Unsupported format {format}")
     except (ValueError, KeyError, IndexError, OSError) as e:
         raise OSError(f"Error reading file {filename} as format {format}: {e!s}") from e
+
+    if parse_cache is not None:
+        _store_cached(parse_cache, key, format, simpy_data)
     return simpy_data
 
 
+def _store_cached(parse_cache: DiskCache, key: str, format: str, simpy_data: Simpy) -> None:
+    """Save the parsed arrays of ``simpy_data`` as cache entry ``key``."""
+    if format == 'xreim':
+        data, axis_key, domain = simpy_data.xreim, 'time', 'xreim'
+    elif format == 'fid':
+        data, axis_key, domain = simpy_data.fid, 'time', 'fid'
+    else:
+        data, axis_key, domain = simpy_data.spe, 'hz', 'spe'
+
+    # The .npy holds only the complex signal. Evenly spaced axes go into the
+    # metadata as start/step/n; other axes get a float .axis.npy of their own
+    signal = data.data
+    axis = data.axis(axis_key)
+    meta = {
+        'domain': domain,
+        'np': float(data.get('np', signal.size)),
+        'sw': float(data.get('sw', 0.0)),
+        'axis': (
+            {'start': axis.start, 'step': axis.step, 'n': axis.n}
+            if isinstance(axis, LinearAxis) else None
+        ),
+    }
+    try:
+        parse_cache.write(key, '.npy', lambda f: np.save(f, signal))
+        if meta['axis'] is None:
+            values = np.asarray(axis, dtype=float)
+            parse_cache.write(key, '.axis.npy', lambda f: np.save(f, values))
+        # Written last, so a lookup never finds an entry with missing parts
+        parse_cache.write(key, '.json', lambda f: f.write(json.dumps(meta).encode()))
+        parse_cache.maybe_evict()
+    except OSError as e:
+        logger.warning("Could not write parse cache entry: %s", e)
+
+
+def _load_cached(
+    parse_cache: DiskCache,
+    key: str,
+    b0: str | None,
+    nucleus: str | None,
+    dtype: np.dtype | type,
+) -> Simpy | None:
+    """Rebuild a Simpy from cache entry ``key``, or return None on a miss."""
+    paths = parse_cache.lookup(key, ('.npy', '.json'))
+    if paths is None:
+        return None
+    try:
+        signal = np.load(paths[0], mmap_mode='r')
+        meta = json.loads(paths[1].read_text())
+        if meta['axis'] is None:
+            axis_path = parse_cache.lookup(key, ('.axis.npy',))
+            if axis_path is None:
+                return None
+            axis = np.load(axis_path[0])
+        else:
+            axis = LinearAxis(**meta['axis'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Ignoring unreadable parse cache entry %s: %s", key, e)
+        return None
+
+    # The signal stays backed by the read-only memory map. Lookups return
+    # read-only views of it; only make_writable() or assignment copies it
+    simpy_data = Simpy(b0=b0, nucleus=nucleus, dtype=dtype)
+    if meta['domain'] == 'xreim':
+        simpy_data.from_xreim(axis, signal, None, copy=False)
+    elif meta['domain'] == 'fid':
+        simpy_data.from_fid(signal, None, meta['np'], meta['sw'], axis, copy=False)
+    else:
+        simpy_data.from_spe(signal, None, meta['np'], meta['sw'], axis, copy=False)
+    return simpy_data
+
+
+def read_simp_many(
+    paths: str | list[str],
+    format: str | None = None,
+    b0: str | None = None,
+    nucleus: str | None = None,
+    workers: int | None = None,
+    use_processes: bool = False,
+    stack: bool = False,
+    cache: bool | str = False,
+    dtype: np.dtype | type = np.complex128,
+) -> list[Simpy] | SpectrumStack:
+    """
+    Read many SIMPSON output files concurrently.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        Either a list of file paths or a glob pattern (e.g.
+        ``'split_simulation_al/*.spe'``). Glob matches are sorted so the
+        output order is deterministic.
+    format : str or None
+        File format passed to ``read_simp``. If None, guessed per file from
+        its extension.
+    b0 : str or None
+        Magnetic field strength applied to every file.
+    nucleus : str or None
+        Nucleus type applied to every file.
+    workers : int or None
+        Maximum number of concurrent readers. If None, the executor default
+        is used.
+    use_processes : bool
+        If True, parse in a process pool instead of a thread pool. Worth it
+        for very large files, where parsing dominates the pickling cost.
+    stack : bool
+        If True, return a single ``SpectrumStack`` (one row per file,
+        labelled by path) instead of a list. All files must then share NP
+        and SW.
+    cache : bool or str
+        Parse cache setting passed to ``read_simp``.
+    dtype : numpy.dtype
+        Complex dtype passed to ``read_simp``.
+
+    Returns
+    -------
+    list of Simpy or SpectrumStack
+        One ``Simpy`` per file, in input order, or (with ``stack=True``) a
+        ``SpectrumStack`` on the shared axis.
+
+    Raises
+    ------
+    ValueError
+        If no files match, or ``stack=True`` and the files do not share the
+        same domain, NP and SW.
+    OSError
+        If any file cannot be read or parsed.
+    """
+    if isinstance(paths, (str, Path)):
+        pattern = str(paths)
+        path_list = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]  # noqa: PTH207
+    else:
+        path_list = [str(p) for p in paths]
+
+    if not path_list:
+        raise ValueError(f"No files found for {paths}")
+
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    reader = partial(
+        read_simp, format=format, b0=b0, nucleus=nucleus, cache=cache, dtype=dtype
+    )
+    with pool_cls(max_workers=workers) as pool:
+        results = list(pool.map(reader, path_list))
+
+    if not stack:
+        return results
+    return SpectrumStack.from_simpy(results, labels=path_list)
+
+
+def _decode_simp_binary(chardata: str) -> np.ndarray:
+    """
+    Decode the data block of a SIMPSON ``fsave -binary`` file.
+
+    SIMPSON stores each float as 4 bytes (23-bit mantissa, 8-bit exponent,
+    sign bit, little-endian) and packs every 3 bytes into 4 printable
+    characters offset by 33. Both steps are done on whole arrays.
+
+    Parameters
+    ----------
+    chardata : str
+        Data block with line breaks and the trailing ``END`` removed.
+
+    Returns
+    -------
+    numpy.ndarray
+        Float64 array of the decoded values (real/imag interleaved).
+
+    Raises
+    ------
+    ValueError
+        If the block length is not a multiple of 4 characters.
+    """
+    raw = np.frombuffer(chardata.encode('ascii'), dtype=np.uint8)
+    if raw.size % 4:
+        raise ValueError("Binary data block length is not a multiple of 4 characters")
+
+    c = (raw - 33).reshape(-1, 4)
+    packed = np.empty((c.shape[0], 3), dtype=np.uint8)
+    packed[:, 0] = (c[:, 0] & 0x3F) | ((c[:, 1] << 2) & 0xC0)
+    packed[:, 1] = (c[:, 1] & 0x0F) | ((c[:, 2] << 2) & 0xF0)
+    packed[:, 2] = (c[:, 2] & 0x03) | ((c[:, 3] << 2) & 0xFC)
+
+    nbytes = packed.size - packed.size % 4
+    b = packed.reshape(-1)[:nbytes].reshape(-1, 4).astype(np.int64)
+    mantissa = ((b[:, 2] & 0x7F) << 16) | (b[:, 1] << 8) | b[:, 0]
+    exponent = ((b[:, 3] & 0x7F) << 1) | (b[:, 2] >> 7)
+    values = np.ldexp(mantissa / float(1 << 23), exponent - 0x7F)
+    return np.where(b[:, 3] & 0x80, -values, values)
+
+
+def _parse_text_block(block: str, filename: str) -> np.ndarray:
+    """
+    Parse the ``real imag`` rows of a text data block with one NumPy call.
+
+    Parameters
+    ----------
+    block : str
+        Text between ``DATA`` and ``END``.
+    filename : str
+        File the block came from, used in error messages.
+
+    Returns
+    -------
+    numpy.ndarray
+        Interleaved float64 values (``re0, im0, re1, im1, ...``).
+
+    Raises
+    ------
+    ValueError
+        If a row does not have two columns.
+    """
+    if not block.strip():
+        return np.empty(0)
+    try:
+        rows = np.loadtxt(io.StringIO(block), dtype=np.float64, ndmin=2)
+    except ValueError as err:
+        raise ValueError(f"Expected 2 columns per row in {filename}: {err}") from err
+    if rows.shape[1] != 2:
+        raise ValueError(
+            f"Expected 2 columns per row in {filename}, got {rows.shape[1]}"
+        )
+    return rows.ravel()
+
+
+def _read_simp_data(filename: str) -> tuple[dict[str, float | str], np.ndarray]:
+    """
+    Parse a SIMPSON SPE or FID file (text or ``-binary``) in bulk.
+
+    The header is read line by line up to ``DATA``; the data block is then
+    converted in a single NumPy call and viewed as one complex array, so no
+    per-line Python work is done on the points. Binary files are recognised
+    by the ``FORMAT`` header line that SIMPSON writes for them.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the ``.spe`` or ``.fid`` file.
+
+    Returns
+    -------
+    header : dict
+        Header fields found before ``DATA`` (``'NP'``, ``'SW'``, ``'REF'``,
+        ...). Numeric values are converted to float.
+    data : numpy.ndarray
+        Complex128 array of length NP holding ``real + 1j*imag``.
+
+    Raises
+    ------
+    ValueError
+        If required header fields (NP, SW) are missing, if a text row does
+        not have two columns, or if the number of data rows does not match
+        NP.
+    """
+    header: dict[str, float | str] = {}
+    with Path(filename).open() as f:
+        for line in f:
+            if line.startswith('DATA'):
+                break
+            key, sep, value = line.partition('=')
+            if sep:
+                try:
+                    header[key.strip()] = float(value)
+                except ValueError:
+                    header[key.strip()] = value.strip()
+        block = f.read()
+
+    if 'NP' not in header or 'SW' not in header:
+        raise ValueError(
+            f"Missing required header fields in {filename}: "
+            f"{'NP' if 'NP' not in header else ''}"
+            f"{' and ' if 'NP' not in header and 'SW' not in header else ''}"
+            f"{'SW' if 'SW' not in header else ''} not found."
+        )
+
+    if 'FORMAT' in header:
+        # Encoded characters may contain 'END', so only strip the final one
+        chardata = ''.join(block.split())
+        chardata = chardata.removesuffix('END')
+        values = _decode_simp_binary(chardata)
+    else:
+        end = block.find('END')
+        if end >= 0:
+            block = block[:end]
+        values = _parse_text_block(block, filename)
+
+    npoints = int(header['NP'])
+    if values.size < 2 * npoints or (values.size != 2 * npoints and 'FORMAT' not in header):
+        raise ValueError(
+            f"Data block in {filename} has {values.size / 2:g} rows, "
+            f"expected NP={npoints}."
+        )
+    # Binary blocks may carry padding bytes after the last point
+    return header, values[:2 * npoints].view(np.complex128)
+
+
 def read_spe(filename: str, simpy_data: Simpy) -> None:
     """
     Read NMR data from a SIMPSON SPE file.
@@ -100,45 +434,19 @@ def read_spe(filename: str, simpy_data: Simpy) -> None:
     Raises
     ------
     ValueError
-        If required header fields (NP, SW) are missing.
+        If required header fields (NP, SW) are missing or the number of data
+        rows does not match NP.
     """
-    with Path(filename).open() as f:
-        data_sec = False
-        real: list[float] = []
-        imag: list[float] = []
-        ref = 0.0
-        np_value: float | None = None
-        sw: float | None = None
-        for line in f:
-            if line.startswith('NP'):
-                np_value = float(line.split('=')[1])
-            elif line.startswith('SW'):
-                sw = float(line.split('=')[1])
-            elif line.startswith('REF'):
-                ref = float(line.split('=')[1])
-            elif line.startswith('DATA'):
-                data_sec = True
-            elif data_sec and line.startswith('END'):
-                break
-            elif data_sec:
-                a, b = map(float, line.split())
-                real.append(a)
-                imag.append(b)
-
-        if np_value is None or sw is None:
-            raise ValueError(
-                f"Missing required header fields in {filename}: "
-                f"{'NP' if np_value is None else ''}"
-                f"{' and ' if np_value is None and sw is None else ''}"
-                f"{'SW' if sw is None else ''} not found."
-            )
+    header, data = _read_simp_data(filename)
+    np_value = header['NP']
+    sw = header['SW']
+    ref = header.get('REF', 0.0)
 
-        if ref != 0.0:
-            logger.debug("Applying REF=%g Hz from SPE header: hz = f_SPE - REF", ref)
-        indices = np.arange(np_value)
-        hz = sw * (indices / np_value - 0.5) - ref
+    if ref != 0.0:
+        logger.debug("Applying REF=%g Hz from SPE header: hz = f_SPE - REF", ref)
+    hz = LinearAxis(-sw / 2 - ref, sw / np_value, np_value)
 
-        simpy_data.from_spe(real, imag, np_value, sw, hz)
+    simpy_data.from_spe(data.real, data.imag, np_value, sw, hz)
 
 
 def read_fid(filename: str, simpy_data: Simpy) -> None:
@@ -155,62 +463,98 @@ def read_fid(filename: str, simpy_data: Simpy) -> None:
     Raises
     ------
     ValueError
-        If required header fields (NP, SW) are missing.
+        If required header fields (NP, SW) are missing or the number of data
+        rows does not match NP.
     """
-    with Path(filename).open() as f:
-        data_sec = False
-        real: list[float] = []
-        imag: list[float] = []
-        np_value: float | None = None
-        sw: float | None = None
-        for line in f:
-            if line.startswith('NP'):
-                np_value = float(line.split('=')[1])
-            elif line.startswith('SW'):
-                sw = float(line.split('=')[1])
-            elif line.startswith('DATA'):
-                data_sec = True
-            elif data_sec and line.startswith('END'):
-                break
-            elif data_sec:
-                a, b = map(float, line.split())
-                real.append(a)
-                imag.append(b)
+    header, data = _read_simp_data(filename)
+
+    # Let from_fid() compute the time axis (avoids duplicating the calculation)
+    simpy_data.from_fid(data.real, data.imag, header['NP'], header['SW'])
 
-        if np_value is None or sw is None:
-            raise ValueError(
-                f"Missing required header fields in {filename}: "
-                f"{'NP' if np_value is None else ''}"
-                f"{' and ' if np_value is None and sw is None else ''}"
-                f"{'SW' if sw is None else ''} not found."
-            )
 
-        # Let from_fid() compute the time axis (avoids duplicating the calculation)
-        simpy_data.from_fid(np.array(real), np.array(imag), np_value, sw)
+def iter_xreim(
+    filename: str, chunk_size: int = 65536
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Iterate over a SIMPSON ``-xreim`` file in blocks of rows.
+
+    Only one block of text is held in memory at a time, so arbitrarily long
+    traces can be processed with bounded memory.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the ``.xreim`` file.
+    chunk_size : int
+        Maximum number of rows per block.
+
+    Yields
+    ------
+    tuple of numpy.ndarray
+        ``(time, real, imag)`` arrays of up to ``chunk_size`` points.
 
+    Raises
+    ------
+    ValueError
+        If ``chunk_size`` is not positive or a row does not have three
+        columns.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
 
-def read_xreim(filename: str, simpy_data: Simpy) -> None:
+    line_no = 1
+    with Path(filename).open() as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            rows = [line.split() for line in lines]
+            for i, row in enumerate(rows):
+                if row and len(row) != 3:
+                    raise ValueError(
+                        f"Expected 3 columns per row in {filename}, "
+                        f"got {len(row)} on line {line_no + i}"
+                    )
+            line_no += len(lines)
+            block = np.array([row for row in rows if row], dtype=np.float64).reshape(-1, 3)
+            yield block[:, 0], block[:, 1], block[:, 2]
+
+
+def read_xreim(filename: str, simpy_data: Simpy, chunk_size: int = 65536) -> None:
     """
     Read NMR data from a SIMPSON file saved with the ``-xreim`` option.
 
+    Rows are streamed with ``iter_xreim`` into preallocated arrays, so peak
+    memory stays close to the size of the final data.
+
     Parameters
     ----------
     filename : str
         Path to the ``.xreim`` file.
     simpy_data : Simpy
         Object to populate with xreim data.
-    """
-    with Path(filename).open() as f:
-        time: list[float] = []
-        real: list[float] = []
-        imag: list[float] = []
-        for line in f:
-            parts = line.split()
-            time.append(float(parts[0]))
-            real.append(float(parts[1]))
-            imag.append(float(parts[2]))
+    chunk_size : int
+        Number of rows parsed per block.
 
-        simpy_data.from_xreim(np.array(time), np.array(real), np.array(imag))
+    Raises
+    ------
+    ValueError
+        If a row does not have three columns, e.g. in a truncated file.
+    """
+    with Path(filename).open('rb') as f:
+        max_rows = sum(buf.count(b'\n') for buf in iter(partial(f.read, 1 << 20), b'')) + 1
+
+    time = np.empty(max_rows)
+    signal = np.empty(max_rows, dtype=simpy_data.dtype)
+    n = 0
+    for t, re_part, im_part in iter_xreim(filename, chunk_size):
+        k = len(t)
+        time[n:n + k] = t
+        signal.real[n:n + k] = re_part
+        signal.imag[n:n + k] = im_part
+        n += k
+
+    simpy_data.from_xreim(time[:n], signal[:n], None, copy=False)
 
 
 def read_csdf(filename: str, simpy_data: Simpy) -> None:
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger("simpyson")
+
+
+def _run_calc(calc, run_kwargs: dict):
+    """Run one calculator (module level so process pools can pickle it)."""
+    return calc.run(**run_kwargs)
+
+
+class SimpsonPool:
+    """
+    Pool running many ``SimpCalc`` jobs concurrently.
+
+    Every job is its own SIMPSON process, so the default thread pool already
+    keeps one core busy per worker; the Python side only writes the input
+    file and parses the output. Use ``use_processes=True`` when parsing very
+    large outputs dominates.
+
+    Parameters
+    ----------
+    max_workers : int or None
+        Number of concurrent SIMPSON runs. If None, ``os.cpu_count()``.
+    use_processes : bool
+        If True, run jobs in a process pool instead of a thread pool. The
+        calculators and their results must then be picklable.
+
+    Examples
+    --------
+    >>> with SimpsonPool(max_workers=16) as pool:
+    ...     futures = [pool.submit(calc, timeout=600) for calc in calcs]
+    ...     spectra = [f.result() for f in futures]
+    """
+
+    def __init__(self, max_workers: int | None = None, use_processes: bool = False) -> None:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.max_workers = max_workers
+        self._executor = pool_cls(max_workers=max_workers)
+
+    def __enter__(self) -> SimpsonPool:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown(cancel_futures=exc_type is not None)
+
+    def submit(self, calc, **run_kwargs) -> Future:
+        """
+        Schedule ``calc.run(**run_kwargs)``.
+
+        Parameters
+        ----------
+        calc : SimpCalc
+            Calculator to run.
+        **run_kwargs
+            Arguments for ``SimpCalc.run`` (e.g. ``timeout``,
+            ``simpson_path``). ``filepath`` is not allowed, since concurrent
+            jobs would overwrite each other's input file.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves to the ``run`` result, or raises its exception
+            (``RuntimeError`` on SIMPSON failure,
+            ``subprocess.TimeoutExpired`` on timeout).
+        """
+        if run_kwargs.get('filepath') is not None:
+            raise ValueError("filepath cannot be set for pooled runs; each job uses its own input file")
+        return self._executor.submit(_run_calc, calc, run_kwargs)
+
+    def map(self, calcs, return_exceptions: bool = False, **run_kwargs) -> list:
+        """
+        Run all calculators and return their results in input order.
+
+        Parameters
+        ----------
+        calcs : iterable of SimpCalc
+            Calculators to run.
+        return_exceptions : bool
+            If False (default), the first failing job (in input order)
+            cancels the jobs that have not started and its exception is
+            raised. If True, failed jobs put their exception in the result
+            list instead.
+        **run_kwargs
+            Arguments passed to every ``SimpCalc.run`` call.
+
+        Returns
+        -------
+        list
+            One result per calculator (``Simpy`` objects by default).
+        """
+        futures = [self.submit(calc, **run_kwargs) for calc in calcs]
+        results = []
+        for i, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                if not return_exceptions:
+                    for pending in futures[i + 1:]:
+                        pending.cancel()
+                    raise
+                logger.warning("SIMPSON job %d failed: %s", i, exc)
+                results.append(exc)
+        return results
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Stop accepting jobs and release the workers."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def run_many(
+    calcs,
+    max_workers: int | None = None,
+    use_processes: bool = False,
+    return_exceptions: bool = False,
+    **run_kwargs,
+) -> list:
+    """
+    Run many ``SimpCalc`` jobs concurrently.
+
+    Parameters
+    ----------
+    calcs : iterable of SimpCalc
+        Calculators to run.
+    max_workers : int or None
+        Number of concurrent SIMPSON runs. If None, ``os.cpu_count()``.
+    use_processes : bool
+        If True, use a process pool instead of a thread pool.
+    return_exceptions : bool
+        If True, failed jobs put their exception in the result list instead
+        of raising.
+    **run_kwargs
+        Arguments passed to every ``SimpCalc.run`` call (e.g. ``timeout``,
+        ``simpson_path``, ``b0``).
+
+    Returns
+    -------
+    list
+        One result per calculator, in input order.
+
+    Raises
+    ------
+    RuntimeError
+        If a SIMPSON run fails and ``return_exceptions`` is False.
+    subprocess.TimeoutExpired
+        If a run exceeds ``timeout`` and ``return_exceptions`` is False.
+
+    Examples
+    --------
+    >>> spectra = run_many(site_calcs, max_workers=64, timeout=3600)
+    >>> total = add_spectra(spectra)
+    """
+    with SimpsonPool(max_workers=max_workers, use_processes=use_processes) as pool:
+        return pool.map(calcs, return_exceptions=return_exceptions, **run_kwargs)
+
+
+async def arun_many(
+    calcs,
+    max_concurrency: int | None = None,
+    return_exceptions: bool = False,
+    **run_kwargs,
+) -> list:
+    """
+    Run many ``SimpCalc`` jobs from asyncio with bounded concurrency.
+
+    Parameters
+    ----------
+    calcs : iterable of SimpCalc
+        Calculators to run with ``SimpCalc.arun``.
+    max_concurrency : int or None
+        Maximum number of SIMPSON processes alive at once (an
+        ``asyncio.Semaphore``). If None, ``os.cpu_count()``.
+    return_exceptions : bool
+        If False (default), the first failure cancels the remaining jobs
+        (killing their SIMPSON processes) and is raised. If True, failed
+        jobs put their exception in the result list instead.
+    **run_kwargs
+        Arguments passed to every ``SimpCalc.arun`` call (e.g. ``timeout``).
+
+    Returns
+    -------
+    list
+        One result per calculator, in input order.
+
+    Examples
+    --------
+    >>> spectra = await arun_many(calcs, max_concurrency=32, timeout=600)
+    """
+    if max_concurrency is None:
+        max_concurrency = os.cpu_count() or 1
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited(calc):
+        async with semaphore:
+            return await calc.arun(**run_kwargs)
+
+    tasks = [asyncio.ensure_future(limited(calc)) for calc in calcs]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        # Cancelling a job kills its SIMPSON process; wait until they are gone.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -3,15 +3,436 @@ from __future__ import annotations
 import copy as cp
 import logging
 import warnings
+import weakref
+from collections.abc import Iterator, MutableMapping
 from pathlib import Path
 
 import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
 
 from simpyson.converter import hz2ppm
+from simpyson.fft import fid_to_spectrum, spectrum_to_fid
 
 logger = logging.getLogger("simpyson")
 
 
+class LinearAxis(NDArrayOperatorsMixin):
+    """
+    Lazily evaluated evenly spaced axis ``start + step * i`` for ``i < n``.
+
+    Stores three numbers instead of ``n`` floats. It is the storage format
+    of evenly spaced axes inside ``SimpyData``; looking an axis up by key
+    returns a plain array. It supports ``len``, indexing, iteration and
+    NumPy functions (which receive the materialized values). Slicing and
+    affine arithmetic with scalars (``+``, ``-``, ``*``, ``/``) return new
+    ``LinearAxis`` objects in O(1), so e.g. ``hz / larmor`` gives the ppm
+    axis for free. The object is immutable: in-place operators such as
+    ``axis += 1`` rebind the name to a new axis.
+
+    Parameters
+    ----------
+    start : float
+        Value of the first point.
+    step : float
+        Spacing between consecutive points.
+    n : int
+        Number of points.
+    """
+
+    __slots__ = ('n', 'start', 'step')
+
+    def __init__(self, start: float, step: float, n: int) -> None:
+        self.start = float(start)
+        self.step = float(step)
+        self.n = int(n)
+
+    @property
+    def values(self) -> np.ndarray:
+        """Materialized axis values as a new float64 array."""
+        return self.start + self.step * np.arange(self.n)
+
+    @property
+    def shape(self) -> tuple[int]:
+        return (self.n,)
+
+    @property
+    def size(self) -> int:
+        return self.n
+
+    @property
+    def ndim(self) -> int:
+        return 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float64)
+
+    def index(self, value: float | np.ndarray) -> int | np.ndarray:
+        """
+        Return the index of the point closest to ``value``.
+
+        Parameters
+        ----------
+        value : float or array_like
+            Coordinate(s) on this axis.
+
+        Returns
+        -------
+        int or numpy.ndarray
+            Nearest index (clipped to the axis range) for each coordinate.
+        """
+        if self.step == 0:
+            idx = np.zeros(np.shape(value), dtype=int)
+        else:
+            idx = np.rint((np.asarray(value) - self.start) / self.step).astype(int)
+        idx = np.clip(idx, 0, max(self.n - 1, 0))
+        return int(idx) if idx.ndim == 0 else idx
+
+    def tolist(self) -> list[float]:
+        return self.values.tolist()
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            i = int(key)
+            if i < 0:
+                i += self.n
+            if not 0 <= i < self.n:
+                raise IndexError(f"index {key} is out of bounds for axis with size {self.n}")
+            return self.start + self.step * i
+        if isinstance(key, slice):
+            r = range(self.n)[key]
+            return LinearAxis(self.start + self.step * r.start, self.step * r.step, len(r))
+        return self.values[key]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.values
+        return values if dtype is None else values.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        out = kwargs.get('out')
+        if out is not None and any(isinstance(o, LinearAxis) for o in out):
+            if not all(o is self for o in out):
+                return NotImplemented
+            # In-place operator on an immutable axis: return a new one instead
+            del kwargs['out']
+        if method == '__call__' and not kwargs:
+            affine = self._affine(ufunc, inputs)
+            if affine is not None:
+                return affine
+        inputs = tuple(np.asarray(x) if isinstance(x, LinearAxis) else x for x in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def _affine(self, ufunc, inputs) -> LinearAxis | None:
+        """Apply scalar affine ufuncs without materializing the axis."""
+        if len(inputs) == 1:
+            if ufunc is np.negative:
+                return LinearAxis(-self.start, -self.step, self.n)
+            if ufunc is np.positive:
+                return LinearAxis(self.start, self.step, self.n)
+            return None
+
+        a, b = inputs
+        axis_first = a is self
+        other = b if axis_first else a
+        if isinstance(other, (bool, np.bool_)) or not isinstance(
+            other, (int, float, np.integer, np.floating)
+        ):
+            return None
+        c = float(other)
+        if ufunc is np.add:
+            return LinearAxis(self.start + c, self.step, self.n)
+        if ufunc is np.subtract:
+            if axis_first:
+                return LinearAxis(self.start - c, self.step, self.n)
+            return LinearAxis(c - self.start, -self.step, self.n)
+        if ufunc is np.multiply:
+            return LinearAxis(self.start * c, self.step * c, self.n)
+        if ufunc is np.true_divide and axis_first and c != 0:
+            return LinearAxis(self.start / c, self.step / c, self.n)
+        return None
+
+    def __repr__(self) -> str:
+        return f"LinearAxis(start={self.start!r}, step={self.step!r}, n={self.n})"
+
+
+def _as_axis(axis) -> LinearAxis | np.ndarray:
+    """Keep ``LinearAxis`` objects as they are and copy anything else to an array."""
+    return axis if isinstance(axis, LinearAxis) else np.array(axis)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Return a read-only view of ``array``."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class SimpyData(MutableMapping):
+    """
+    Dictionary-like view of one data domain of a ``Simpy`` object.
+
+    The signal is held in a single contiguous complex array (``data``);
+    ``'real'`` and ``'imag'`` are views into it rather than separate
+    arrays, so no ``real + 1j*imag`` temporaries are needed for FFTs.
+    Axes (``'hz'``, ``'time'``, ``'ppm'``) and the ``'np'``/``'sw'``
+    header values are exposed under the same keys as before. Evenly spaced
+    axes are stored as ``LinearAxis`` objects; the first lookup of one
+    materializes it into an array that later lookups return again, and
+    assigning the key drops that array.
+
+    A mapping made by ``share`` (``Simpy.copy``) holds read-only views of
+    its source's buffers and takes a private copy the first time it hands
+    one out by key, so it can be edited in place like any other mapping.
+    Attribute reads (``data``, ``real``, ``imag``, ``axis``) never copy.
+    The source stays writable: if a mapping made from it is still alive
+    when it hands out a buffer by key, the source copies its own buffers
+    once and leaves the originals to its copies.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Complex signal array.
+    np_value : int, float or None
+        Number of data points, or None if not applicable (xreim).
+    sw : float or None
+        Spectral width in Hz, or None if not applicable (xreim).
+    **axes : numpy.ndarray
+        Axis arrays stored under their keyword names.
+    """
+
+    __slots__ = (
+        '__weakref__', '_axes', '_borrowed', '_parent', '_sharers', '_values', 'data', 'np',
+        'sw',
+    )
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        np_value: int | float | None = None,
+        sw: float | None = None,
+        **axes: np.ndarray,
+    ) -> None:
+        self.data = data
+        self.np = np_value
+        self.sw = sw
+        self._axes = axes
+        # Arrays materialized from LinearAxis entries by lookups
+        self._values: dict[str, np.ndarray] = {}
+        # True if data and array axes are read-only views made by share()
+        self._borrowed = False
+        # Mappings made by share() that may still read our buffers
+        self._sharers: list[weakref.ref[SimpyData]] = []
+        # Mapping that lookups are forwarded to (the spectrum behind Simpy.ppm)
+        self._parent: SimpyData | None = None
+
+    @property
+    def real(self) -> np.ndarray:
+        """Real part of the signal (a view of ``data``)."""
+        return self.data.real
+
+    @property
+    def imag(self) -> np.ndarray:
+        """Imaginary part of the signal (a view of ``data``)."""
+        return self.data.imag
+
+    def make_writable(self) -> np.ndarray:
+        """
+        Return the signal buffer, copying it first if it is read-only.
+
+        Buffers shared with other objects by ``Simpy.copy`` and read-only
+        ones such as cached memory maps are copied once, so in-place edits
+        do not leak into other objects.
+
+        Returns
+        -------
+        numpy.ndarray
+            Writable complex buffer (``data``).
+        """
+        if self._parent is not None:
+            self.data = self._parent.make_writable()
+            return self.data
+        self._own()
+        if not self.data.flags.writeable:
+            self.data = np.array(self.data)
+        return self.data
+
+    def _own(self) -> None:
+        """Make the buffers handed out by key safe to edit in place."""
+        if self._sharers:
+            # Copies made by share() keep the originals; copy ours once
+            if any(ref() is not None for ref in self._sharers):
+                if self.data.flags.writeable:
+                    self.data = self.data.copy()
+                for key, axis in self._axes.items():
+                    if isinstance(axis, np.ndarray) and axis.flags.writeable:
+                        self._axes[key] = axis.copy()
+            self._sharers = []
+        if self._borrowed:
+            if not self.data.flags.writeable:
+                self.data = np.array(self.data)
+            for key, axis in self._axes.items():
+                if isinstance(axis, np.ndarray) and not axis.flags.writeable:
+                    self._axes[key] = np.array(axis)
+            self._borrowed = False
+
+    def share(self) -> SimpyData:
+        """
+        Return a new mapping that shares this one's buffers copy-on-write.
+
+        The new mapping holds read-only views of the signal and array axes
+        and copies them the first time it hands them out by key. This
+        mapping keeps its writable buffers.
+
+        Returns
+        -------
+        SimpyData
+            Mapping with the same values and its own axis dictionary.
+        """
+        # Materialized axes may have been edited in place, so share them as stored
+        self._axes.update(self._values)
+        self._values.clear()
+        axes = {
+            key: _read_only(axis) if isinstance(axis, np.ndarray) else axis
+            for key, axis in self._axes.items()
+        }
+        clone = SimpyData(_read_only(self.data), self.np, self.sw, **axes)
+        clone._borrowed = True
+        self._sharers = [ref for ref in self._sharers if ref() is not None]
+        self._sharers.append(weakref.ref(clone))
+        return clone
+
+    def __getstate__(self) -> dict:
+        # Sharing is tied to this process and is not part of the value
+        axes = {**self._axes, **self._values}
+        return {'data': self.data, 'np': self.np, 'sw': self.sw, '_axes': axes}
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._values = {}
+        self._borrowed = False
+        self._sharers = []
+        self._parent = None
+
+    def axis(self, key: str) -> LinearAxis | np.ndarray:
+        """
+        Return axis ``key`` without materializing or copying it.
+
+        Evenly spaced axes come back as ``LinearAxis`` unless a lookup has
+        already materialized them, in which case that array is returned
+        (it may have been edited in place). The result must be treated as
+        read-only.
+
+        Parameters
+        ----------
+        key : str
+            Axis name, e.g. ``'hz'``, ``'time'`` or ``'ppm'``.
+
+        Returns
+        -------
+        LinearAxis or numpy.ndarray
+            Stored axis.
+        """
+        axis = self._axes[key]
+        return self._values.get(key, axis)
+
+    def _header(self) -> dict:
+        return {k: v for k, v in (('np', self.np), ('sw', self.sw)) if v is not None}
+
+    def __getitem__(self, key: str):
+        if self._parent is not None and key in self:
+            return self._parent[key]
+        if key in ('np', 'sw'):
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if key not in ('real', 'imag'):
+            axis = self._axes[key]
+            if isinstance(axis, LinearAxis):
+                # Materialized per mapping, so never shared
+                values = self._values.get(key)
+                if values is None:
+                    values = self._values[key] = axis.values
+                return values
+        if self._sharers or self._borrowed:
+            self._own()
+        if key == 'real':
+            return self.data.real
+        if key == 'imag':
+            return self.data.imag
+        return self._axes[key]
+
+    def __setitem__(self, key: str, value) -> None:
+        if self._parent is not None and key in self:
+            self._parent[key] = value
+            self.data = self._parent.data
+            return
+        if key in ('real', 'imag'):
+            value = np.asarray(value)
+            other = self.data.imag if key == 'real' else self.data.real
+            if other.shape != value.shape:
+                other = np.zeros(value.shape)
+            data = np.empty(value.shape, dtype=self.data.dtype)
+            data.real = value if key == 'real' else other
+            data.imag = other if key == 'real' else value
+            self.data = data
+        elif key in ('np', 'sw'):
+            setattr(self, key, value)
+        else:
+            self._axes[key] = value
+            self._values.pop(key, None)
+
+    def __delitem__(self, key: str) -> None:
+        if key in ('real', 'imag', 'np', 'sw'):
+            raise KeyError(f"Cannot delete '{key}' from Simpy data")
+        del self._axes[key]
+        self._values.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        # Membership tests must not materialize or copy anything
+        if key in ('np', 'sw'):
+            return getattr(self, key) is not None
+        return key in ('real', 'imag') or key in self._axes
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'real'
+        yield 'imag'
+        yield from self._header()
+        yield from self._axes
+
+    def __len__(self) -> int:
+        return 2 + len(self._header()) + len(self._axes)
+
+    def __repr__(self) -> str:
+        return (
+            f"SimpyData(np={self.np}, sw={self.sw}, dtype={self.data.dtype}, "
+            f"axes={list(self._axes)})"
+        )
+
+
+def _to_complex(real, imag, dtype, copy: bool = True) -> np.ndarray:
+    """
+    Pack real and imaginary parts into one contiguous complex array.
+
+    If ``imag`` is None, ``real`` already holds the complex signal and is
+    only copied when ``copy`` is True (or its dtype differs).
+    """
+    if imag is None:
+        return np.array(real, dtype=dtype) if copy else np.asarray(real, dtype=dtype)
+    real = np.asarray(real)
+    data = np.empty(real.shape, dtype=dtype)
+    data.real = real
+    data.imag = imag
+    return data
+
+
 class Simpy:
     """
     Unified container for SIMPSON NMR data with automatic format conversions.
@@ -27,6 +448,9 @@ class Simpy:
     nucleus : str or None
         Nucleus type (e.g., ``'1H'``, ``'13C'``).
         Required for ppm conversion.
+    dtype : numpy.dtype
+        Complex dtype of the stored signals. ``np.complex64`` halves memory
+        use at single precision.
 
     Examples
     --------
@@ -36,12 +460,26 @@ class Simpy:
     >>> data.ppm['ppm']  # chemical shift axis in ppm
     """
 
-    def __init__(self, b0: str | None = None, nucleus: str | None = None) -> None:
+    __slots__ = (
+        '_b0', '_dtype', '_fid_data', '_metadata', '_nucleus', '_ppm_view', '_spe_data',
+        '_xreim_data',
+    )
+
+    def __init__(
+        self,
+        b0: str | None = None,
+        nucleus: str | None = None,
+        dtype: np.dtype | type = np.complex128,
+    ) -> None:
         self._b0 = b0
         self._nucleus = nucleus
-        self._fid_data: dict | None = None
-        self._spe_data: dict | None = None
-        self._xreim_data: dict | None = None
+        self._dtype = np.dtype(dtype)
+        if self._dtype.kind != 'c':
+            raise ValueError(f"dtype must be a complex type, got {self._dtype}")
+        self._fid_data: SimpyData | None = None
+        self._spe_data: SimpyData | None = None
+        self._xreim_data: SimpyData | None = None
+        self._ppm_view: SimpyData | None = None
         self._metadata: dict = {}
 
     @property
@@ -69,13 +507,18 @@ class Simpy:
             del self._spe_data['ppm']
 
     @property
-    def fid(self) -> dict | None:
+    def dtype(self) -> np.dtype:
+        """Complex dtype of the stored signals."""
+        return self._dtype
+
+    @property
+    def fid(self) -> SimpyData | None:
         """Access time-domain data, converting from spectrum if needed.
 
         Returns
         -------
-        dict or None
-            Dictionary with keys ``'real'``, ``'imag'``, ``'np'``, ``'sw'``,
+        SimpyData or None
+            Mapping with keys ``'real'``, ``'imag'``, ``'np'``, ``'sw'``,
             ``'time'`` (in ms), or None if no data is available.
         """
         if self._fid_data is None and self._spe_data is not None:
@@ -83,13 +526,13 @@ class Simpy:
         return self._fid_data
 
     @property
-    def spe(self) -> dict | None:
+    def spe(self) -> SimpyData | None:
         """Access frequency-domain data, converting from FID if needed.
 
         Returns
         -------
-        dict or None
-            Dictionary with keys ``'real'``, ``'imag'``, ``'np'``, ``'sw'``,
+        SimpyData or None
+            Mapping with keys ``'real'``, ``'imag'``, ``'np'``, ``'sw'``,
             ``'hz'`` (and optionally ``'ppm'``), or None if no data is
             available.
         """
@@ -98,75 +541,80 @@ class Simpy:
         return self._spe_data
 
     @property
-    def ppm(self) -> dict | None:
+    def ppm(self) -> SimpyData | None:
         """Access chemical shift data, computing from Hz if needed.
 
-        Requires both ``b0`` and ``nucleus`` to be set.
+        Requires both ``b0`` and ``nucleus`` to be set. The returned mapping
+        shares the spectrum buffer and is reused across accesses until the
+        spectrum or its ppm axis changes.
 
         Returns
         -------
-        dict or None
-            Dictionary with keys ``'ppm'``, ``'real'``, ``'imag'``, or None
+        SimpyData or None
+            Mapping with keys ``'real'``, ``'imag'``, ``'ppm'``, or None
             if conversion is not possible.
         """
-        if self.spe and 'ppm' not in self.spe and self._b0 and self._nucleus:
+        spe = self.spe
+        if spe is None:
+            return None
+        if 'ppm' not in spe and self._b0 and self._nucleus:
             self._compute_ppm()
-
-        if self.spe and 'ppm' in self.spe:
-            return {
-                'ppm': self.spe['ppm'],
-                'real': self.spe['real'],
-                'imag': self.spe['imag']
-            }
-        return None
+        if 'ppm' not in spe:
+            return None
+
+        ppm = spe._axes['ppm']
+        view = self._ppm_view
+        if view is None or view._parent is not spe or view._axes['ppm'] is not ppm:
+            view = SimpyData(spe.data, ppm=ppm)
+            # Lookups go to the spectrum, so building the view copies nothing
+            view._parent = spe
+            self._ppm_view = view
+        view.data = spe.data
+        return view
 
     @property
-    def xreim(self) -> dict | None:
+    def xreim(self) -> SimpyData | None:
         """Access xreim data.
 
         Returns
         -------
-        dict or None
-            Dictionary with keys ``'time'``, ``'real'``, ``'imag'``, or None.
+        SimpyData or None
+            Mapping with keys ``'time'``, ``'real'``, ``'imag'``, or None.
         """
         return self._xreim_data
 
     def _compute_spectrum(self) -> None:
-        """Convert FID to spectrum via FFT."""
+        """Convert FID to spectrum via FFT (see ``simpyson.fft.set_fft_backend``)."""
         if not self._fid_data:
             return
 
-        npoints = self._fid_data['np']
-        sw = self._fid_data['sw']
-        signal = self._fid_data['real'] + 1j * self._fid_data['imag']
-        spectrum = np.fft.fftshift(np.fft.fft(signal))
-
-        self._spe_data = {
-            'real': np.real(spectrum),
-            'imag': np.imag(spectrum),
-            'np': npoints,
-            'sw': sw,
-            'hz': sw * (np.arange(int(npoints)) / int(npoints) - 0.5)
-        }
+        npoints = self._fid_data.np
+        sw = self._fid_data.sw
+        spectrum = fid_to_spectrum(self._fid_data.data)
+
+        self._spe_data = SimpyData(
+            spectrum.astype(self._dtype, copy=False),
+            npoints,
+            sw,
+            hz=LinearAxis(-sw / 2, sw / npoints, npoints),
+        )
 
     def _compute_fid(self) -> None:
         """Convert spectrum to FID via inverse FFT."""
         if not self._spe_data:
             return
 
-        npoints = self._spe_data['np']
-        sw = self._spe_data['sw']
-        signal = self._spe_data['real'] + 1j * self._spe_data['imag']
-        time_signal = np.fft.ifft(np.fft.ifftshift(signal))
+        npoints = self._spe_data.np
+        sw = self._spe_data.sw
+        time_signal = spectrum_to_fid(self._spe_data.data)
         dt = 1.0 / sw
 
-        self._fid_data = {
-            'real': np.real(time_signal),
-            'imag': np.imag(time_signal),
-            'np': npoints,
-            'sw': sw,
-            'time': np.arange(int(npoints)) * dt * 1e3 # seconds to milliseconds
-        }
+        self._fid_data = SimpyData(
+            time_signal.astype(self._dtype, copy=False),
+            npoints,
+            sw,
+            time=LinearAxis(0.0, dt * 1e3, npoints),  # seconds to milliseconds
+        )
 
     def _compute_ppm(self) -> None:
         """Calculate ppm scale from Hz using b0 and nucleus."""
@@ -177,17 +625,18 @@ class Simpy:
             return
 
         try:
-            self._spe_data['ppm'] = hz2ppm(self._spe_data['hz'], self._b0, self._nucleus)
+            self._spe_data['ppm'] = hz2ppm(self._spe_data.axis('hz'), self._b0, self._nucleus)
         except ValueError as e:
             warnings.warn(f"Could not convert to ppm: {e}", stacklevel=2)
 
     def from_fid(
         self,
         real: np.ndarray | list,
-        imag: np.ndarray | list,
+        imag: np.ndarray | list | None,
         np_value: int | float,
         sw: float,
         time: np.ndarray | list | None = None,
+        copy: bool = True,
     ) -> Simpy:
         """
         Populate this object with FID (time-domain) data.
@@ -195,8 +644,9 @@ class Simpy:
         Parameters
         ----------
         real : array_like
-            Real part of the FID signal.
-        imag : array_like
+            Real part of the FID signal, or the complex signal if ``imag``
+            is None.
+        imag : array_like or None
             Imaginary part of the FID signal.
         np_value : int or float
             Number of data points.
@@ -205,6 +655,9 @@ class Simpy:
         time : array_like or None
             Time axis in milliseconds. If None, calculated from ``sw`` and
             ``np_value``.
+        copy : bool
+            If False and ``imag`` is None, keep a reference to the complex
+            signal instead of copying it.
 
         Returns
         -------
@@ -213,15 +666,13 @@ class Simpy:
         """
         if time is None:
             dt = 1.0 / sw
-            time = np.linspace(0, np_value*dt, int(np_value)) * 1e3  # seconds to milliseconds
-
-        self._fid_data = {
-            'real': np.array(real),
-            'imag': np.array(imag),
-            'np': np_value,
-            'sw': sw,
-            'time': np.array(time)
-        }
+            # Same points as np.linspace(0, np_value*dt, np_value), in milliseconds
+            n = int(np_value)
+            time = LinearAxis(0.0, np_value * dt * 1e3 / max(n - 1, 1), n)
+
+        self._fid_data = SimpyData(
+            _to_complex(real, imag, self._dtype, copy), np_value, sw, time=_as_axis(time)
+        )
 
         # Clear cached spectrum data
         self._spe_data = None
@@ -230,10 +681,11 @@ class Simpy:
     def from_spe(
         self,
         real: np.ndarray | list,
-        imag: np.ndarray | list,
+        imag: np.ndarray | list | None,
         np_value: int | float,
         sw: float,
         hz: np.ndarray | list | None = None,
+        copy: bool = True,
     ) -> Simpy:
         """
         Populate this object with spectrum (frequency-domain) data.
@@ -241,8 +693,9 @@ class Simpy:
         Parameters
         ----------
         real : array_like
-            Real part of the spectrum.
-        imag : array_like
+            Real part of the spectrum, or the complex spectrum if ``imag``
+            is None.
+        imag : array_like or None
             Imaginary part of the spectrum.
         np_value : int or float
             Number of data points.
@@ -251,6 +704,9 @@ class Simpy:
         hz : array_like or None
             Frequency axis in Hz. If None, calculated as a symmetric range
             around zero based on ``sw``.
+        copy : bool
+            If False and ``imag`` is None, keep a reference to the complex
+            spectrum instead of copying it.
 
         Returns
         -------
@@ -258,15 +714,11 @@ class Simpy:
             Self, for method chaining.
         """
         if hz is None:
-            hz = sw * (np.arange(int(np_value)) / int(np_value) - 0.5)
-
-        self._spe_data = {
-            'real': np.array(real),
-            'imag': np.array(imag),
-            'np': np_value,
-            'sw': sw,
-            'hz': np.array(hz)
-        }
+            hz = LinearAxis(-sw / 2, sw / np_value, np_value)
+
+        self._spe_data = SimpyData(
+            _to_complex(real, imag, self._dtype, copy), np_value, sw, hz=_as_axis(hz)
+        )
 
         # Calculate ppm if possible
         if self._b0 and self._nucleus:
@@ -280,7 +732,8 @@ class Simpy:
         self,
         time: np.ndarray | list,
         real: np.ndarray | list,
-        imag: np.ndarray | list,
+        imag: np.ndarray | list | None,
+        copy: bool = True,
     ) -> Simpy:
         """
         Populate this object with xreim data.
@@ -290,20 +743,24 @@ class Simpy:
         time : array_like
             Time axis.
         real : array_like
-            Real part of the signal.
-        imag : array_like
+            Real part of the signal, or the complex signal if ``imag`` is
+            None.
+        imag : array_like or None
             Imaginary part of the signal.
+        copy : bool
+            If False, keep references to the time axis and (when ``imag`` is
+            None) the complex signal instead of copying them. Useful when the
+            caller hands over freshly allocated buffers.
 
         Returns
         -------
         Simpy
             Self, for method chaining.
         """
-        self._xreim_data = {
-            'time': np.array(time),
-            'real': np.array(real),
-            'imag': np.array(imag)
-        }
+        self._xreim_data = SimpyData(
+            _to_complex(real, imag, self._dtype, copy),
+            time=np.array(time) if copy else np.asarray(time),
+        )
 
         # Clear cached FID and spectrum data
         self._fid_data = None
@@ -339,13 +796,9 @@ class Simpy:
         Simpy
             Self, for method chaining.
         """
-        self._spe_data = {
-            'real': np.array(real),
-            'imag': np.array(imag),
-            'np': np_value,
-            'sw': sw,
-            'hz': np.array(hz)
-        }
+        self._spe_data = SimpyData(
+            _to_complex(real, imag, self._dtype), np_value, sw, hz=_as_axis(hz)
+        )
 
         if self._b0 and self._nucleus:
             self._compute_ppm()
@@ -353,25 +806,33 @@ class Simpy:
         self._fid_data = None
         return self
 
-    def copy(self) -> Simpy:
+    def copy(self, deep: bool = False) -> Simpy:
         """
-        Create a deep copy of this Simpy object.
+        Create a copy of this Simpy object.
+
+        By default the copy is copy-on-write: it holds read-only views of
+        this object's data buffers and duplicates them the first time it
+        hands one out by key (e.g. ``copy.spe['real']``), see
+        ``SimpyData.share``. Relabelling copies (``b0``, ``nucleus``) and
+        reading ``.data`` or axes is essentially free. This object stays
+        writable.
+
+        Parameters
+        ----------
+        deep : bool
+            If True, duplicate all data arrays immediately.
 
         Returns
         -------
         Simpy
-            Independent copy with all data arrays duplicated.
+            Copy that can be modified without affecting this object.
         """
-        new_obj = Simpy(b0=self._b0, nucleus=self._nucleus)
-
-        if self._fid_data is not None:
-            new_obj._fid_data = cp.deepcopy(self._fid_data)
-
-        if self._spe_data is not None:
-            new_obj._spe_data = cp.deepcopy(self._spe_data)
+        new_obj = Simpy(b0=self._b0, nucleus=self._nucleus, dtype=self._dtype)
 
-        if self._xreim_data is not None:
-            new_obj._xreim_data = cp.deepcopy(self._xreim_data)
+        for name in ('_fid_data', '_spe_data', '_xreim_data'):
+            data = getattr(self, name)
+            if data is not None:
+                setattr(new_obj, name, cp.deepcopy(data) if deep else data.share())
 
         new_obj._metadata = cp.deepcopy(self._metadata)
 
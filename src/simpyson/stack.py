@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+from simpyson.converter import hz2ppm
+from simpyson.fft import fid_to_spectrum, spectrum_to_fid
+from simpyson.simpy import LinearAxis, Simpy
+
+logger = logging.getLogger("simpyson")
+
+
+class SpectrumStack:
+    """
+    Batch of spectra or FIDs sharing one axis, stored as a 2D complex array.
+
+    Operations (FFT, weighting, summation) act on all rows at once instead
+    of looping over individual ``Simpy`` objects.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Complex array of shape ``(n_rows, np)``.
+    domain : str
+        ``'spe'`` for frequency-domain rows, ``'fid'`` for time-domain rows.
+    sw : float
+        Spectral width in Hz.
+    axis : array_like or None
+        Shared axis (Hz for ``'spe'``, ms for ``'fid'``). If None, the
+        default SIMPSON axis for ``sw`` and the number of points is used.
+    b0 : str or None
+        Magnetic field strength, needed for ppm conversion.
+    nucleus : str or None
+        Nucleus type, needed for ppm conversion.
+    labels : list or None
+        Optional per-row labels (e.g. file paths).
+    coords : dict or None
+        Optional per-row coordinates, mapping a name (e.g. a swept
+        parameter) to an array with one value per row.
+    dims : tuple of str or None
+        Names of the grid dimensions when the rows form a regular grid in
+        C order (e.g. a ``SimpCalc.sweep`` over several parameters).
+    grid_shape : tuple of int or None
+        Number of points along each of ``dims``; its product must equal
+        the number of rows. See ``grid``.
+
+    Raises
+    ------
+    ValueError
+        If ``domain`` is unknown, ``data`` is not 2D, or the axis, label,
+        coordinate or grid sizes do not match the data.
+
+    Examples
+    --------
+    >>> stack = SpectrumStack.from_simpy(spectra)
+    >>> total = stack.sum(weights=multiplicities)
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        domain: str,
+        sw: float,
+        axis: np.ndarray | LinearAxis | None = None,
+        b0: str | None = None,
+        nucleus: str | None = None,
+        labels: list | None = None,
+        coords: dict | None = None,
+        dims: tuple[str, ...] | None = None,
+        grid_shape: tuple[int, ...] | None = None,
+    ) -> None:
+        if domain not in ('spe', 'fid'):
+            raise ValueError(f"domain must be 'spe' or 'fid', got '{domain}'")
+        data = np.asarray(data)
+        if data.ndim != 2:
+            raise ValueError(f"data must be 2D (rows, points), got shape {data.shape}")
+        if data.dtype.kind != 'c':
+            data = data.astype(np.complex128)
+
+        npoints = data.shape[1]
+        if axis is None:
+            if domain == 'spe':
+                axis = LinearAxis(-sw / 2, sw / npoints, npoints)
+            else:
+                axis = LinearAxis(0.0, 1e3 / sw, npoints)
+        elif not isinstance(axis, LinearAxis):
+            axis = np.asarray(axis)
+        if len(axis) != npoints:
+            raise ValueError(f"Axis has {len(axis)} points, data has {npoints}")
+        if labels is not None and len(labels) != data.shape[0]:
+            raise ValueError(f"Got {len(labels)} labels for {data.shape[0]} rows")
+        if coords is not None:
+            coords = {name: np.asarray(values) for name, values in coords.items()}
+            for name, values in coords.items():
+                if values.shape != (data.shape[0],):
+                    raise ValueError(
+                        f"Coordinate '{name}' has shape {values.shape}, expected ({data.shape[0]},)"
+                    )
+        if grid_shape is not None:
+            grid_shape = tuple(int(n) for n in grid_shape)
+            if int(np.prod(grid_shape)) != data.shape[0]:
+                raise ValueError(f"Grid shape {grid_shape} does not match {data.shape[0]} rows")
+            if dims is not None and len(dims) != len(grid_shape):
+                raise ValueError(f"Got {len(dims)} dims for grid shape {grid_shape}")
+
+        self.data = data
+        self.domain = domain
+        self.sw = sw
+        self._axis = axis
+        self._axis_values: np.ndarray | None = None
+        self.b0 = b0
+        self.nucleus = nucleus
+        self.labels = labels
+        self.coords = coords
+        self.dims = tuple(dims) if dims is not None else None
+        self.grid_shape = grid_shape
+
+    @classmethod
+    def from_simpy(
+        cls,
+        spectra: list[Simpy],
+        domain: str | None = None,
+        labels: list | None = None,
+        coords: dict | None = None,
+    ) -> SpectrumStack:
+        """
+        Stack ``Simpy`` objects that share NP, SW and axis.
+
+        Parameters
+        ----------
+        spectra : list of Simpy
+            Objects to stack.
+        domain : str or None
+            ``'spe'`` or ``'fid'``. If None, the domain the first object
+            holds natively is used (converting the others if needed).
+        labels : list or None
+            Optional per-row labels.
+        coords : dict or None
+            Optional per-row coordinates.
+
+        Returns
+        -------
+        SpectrumStack
+            New stack with one row per input object. ``b0``/``nucleus`` are
+            taken from the first object.
+
+        Raises
+        ------
+        ValueError
+            If the list is empty or the objects do not share NP, SW and axis.
+        """
+        if not spectra:
+            raise ValueError("Cannot build a SpectrumStack from an empty list")
+
+        first = spectra[0]
+        if domain is None:
+            domain = 'fid' if first._spe_data is None and first._fid_data is not None else 'spe'
+        axis_key = 'hz' if domain == 'spe' else 'time'
+
+        data_list = [getattr(s, domain) for s in spectra]
+        ref = data_list[0]
+        if ref is None:
+            raise ValueError(f"First object has no {domain} data")
+        for i, data in enumerate(data_list):
+            if (
+                data is None
+                or int(data['np']) != int(ref['np'])
+                or data['sw'] != ref['sw']
+                or not np.allclose(data.axis(axis_key), ref.axis(axis_key))
+            ):
+                label = labels[i] if labels is not None else f"#{i + 1}"
+                raise ValueError(
+                    f"Cannot stack {label}: all entries must share the same "
+                    f"domain ({domain}), NP and SW."
+                )
+
+        return cls(
+            np.stack([data.data for data in data_list]),
+            domain,
+            ref['sw'],
+            axis=ref.axis(axis_key),
+            b0=first.b0,
+            nucleus=first.nucleus,
+            labels=labels,
+            coords=coords,
+        )
+
+    @property
+    def axis(self) -> np.ndarray:
+        """Shared axis (Hz for ``'spe'``, ms for ``'fid'``) as an array.
+
+        Evenly spaced axes stay stored as ``LinearAxis``; the read-only
+        array made on first access is reused afterwards.
+        """
+        if isinstance(self._axis, LinearAxis):
+            if self._axis_values is None:
+                self._axis_values = self._axis.values
+                self._axis_values.flags.writeable = False
+            return self._axis_values
+        return self._axis
+
+    @property
+    def grid(self) -> np.ndarray:
+        """Rows as an array of shape ``grid_shape + (np,)`` (a view of ``data``).
+
+        Raises
+        ------
+        ValueError
+            If the stack has no ``grid_shape``.
+        """
+        if self.grid_shape is None:
+            raise ValueError("This stack has no grid shape")
+        return self.data.reshape(*self.grid_shape, self.np)
+
+    @property
+    def np(self) -> int:
+        """Number of points per row."""
+        return self.data.shape[1]
+
+    @property
+    def real(self) -> np.ndarray:
+        """Real parts of all rows (a view of ``data``)."""
+        return self.data.real
+
+    @property
+    def imag(self) -> np.ndarray:
+        """Imaginary parts of all rows (a view of ``data``)."""
+        return self.data.imag
+
+    @property
+    def ppm(self) -> np.ndarray | None:
+        """Shared chemical shift axis, or None without ``b0``/``nucleus``.
+
+        Raises
+        ------
+        ValueError
+            If the stack holds FIDs.
+        """
+        if self.domain != 'spe':
+            raise ValueError("ppm axis is only defined for spectra")
+        if not (self.b0 and self.nucleus):
+            return None
+        return np.asarray(hz2ppm(self._axis, self.b0, self.nucleus))
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __getitem__(self, key) -> Simpy | SpectrumStack:
+        if isinstance(key, (int, np.integer)):
+            return self._row_to_simpy(self.data[key])
+        labels = None
+        if self.labels is not None:
+            labels = list(np.asarray(self.labels, dtype=object)[key])
+        coords = None
+        if self.coords is not None:
+            coords = {name: values[key] for name, values in self.coords.items()}
+        # A subset of the rows is no longer a full grid
+        return self._replace(
+            self.data[key], labels=labels, coords=coords, dims=None, grid_shape=None
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"SpectrumStack(rows={len(self)}, np={self.np}, sw={self.sw}, "
+            f"domain='{self.domain}', dtype={self.data.dtype})"
+        )
+
+    def _replace(self, data: np.ndarray, **kwargs) -> SpectrumStack:
+        params = {
+            'domain': self.domain,
+            'sw': self.sw,
+            'axis': self._axis,
+            'b0': self.b0,
+            'nucleus': self.nucleus,
+            'labels': self.labels,
+            'coords': self.coords,
+            'dims': self.dims,
+            'grid_shape': self.grid_shape,
+        }
+        params.update(kwargs)
+        return SpectrumStack(data, **params)
+
+    def _row_to_simpy(self, row: np.ndarray) -> Simpy:
+        simpy = Simpy(b0=self.b0, nucleus=self.nucleus, dtype=self.data.dtype)
+        if self.domain == 'spe':
+            return simpy.from_spe(row.real, row.imag, self.np, self.sw, self._axis)
+        return simpy.from_fid(row.real, row.imag, self.np, self.sw, self._axis)
+
+    def sel(self, **conditions) -> SpectrumStack:
+        """
+        Select the rows whose coordinates equal the given values.
+
+        Parameters
+        ----------
+        **conditions
+            Coordinate name and the value to match, e.g. ``spin_rate=10e3``.
+
+        Returns
+        -------
+        SpectrumStack
+            Stack of the matching rows (possibly empty).
+
+        Raises
+        ------
+        KeyError
+            If a coordinate does not exist.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in conditions.items():
+            if self.coords is None or name not in self.coords:
+                raise KeyError(f"No coordinate '{name}' in this stack")
+            mask &= self.coords[name] == value
+        return self[np.flatnonzero(mask)]
+
+    def to_simpy(self) -> list[Simpy]:
+        """
+        Split the stack into one ``Simpy`` object per row.
+
+        Returns
+        -------
+        list of Simpy
+            Independent objects in row order.
+        """
+        return [self._row_to_simpy(row) for row in self.data]
+
+    def to_spectrum(self) -> SpectrumStack:
+        """
+        Fourier transform all FID rows at once.
+
+        Returns
+        -------
+        SpectrumStack
+            Frequency-domain stack (``self`` if already a spectrum stack).
+        """
+        if self.domain == 'spe':
+            return self
+        data = fid_to_spectrum(self.data, axis=-1).astype(self.data.dtype, copy=False)
+        return self._replace(data, domain='spe', axis=None)
+
+    def to_fid(self) -> SpectrumStack:
+        """
+        Inverse Fourier transform all spectrum rows at once.
+
+        Returns
+        -------
+        SpectrumStack
+            Time-domain stack (``self`` if already a FID stack).
+        """
+        if self.domain == 'fid':
+            return self
+        data = spectrum_to_fid(self.data, axis=-1).astype(self.data.dtype, copy=False)
+        return self._replace(data, domain='fid', axis=None)
+
+    def weighted(self, weights: np.ndarray | list) -> SpectrumStack:
+        """
+        Scale each row by a weight.
+
+        Parameters
+        ----------
+        weights : array_like
+            One weight per row.
+
+        Returns
+        -------
+        SpectrumStack
+            New stack with scaled rows.
+        """
+        weights = np.asarray(weights)
+        if weights.shape != (len(self),):
+            raise ValueError(f"Expected {len(self)} weights, got shape {weights.shape}")
+        return self._replace(self.data * weights[:, None])
+
+    def sum(self, weights: np.ndarray | list | None = None) -> Simpy:
+        """
+        Sum all rows, optionally weighted, into one ``Simpy`` object.
+
+        Parameters
+        ----------
+        weights : array_like or None
+            One weight per row. If None, rows are summed with equal weight.
+
+        Returns
+        -------
+        Simpy
+            Summed spectrum or FID on the shared axis.
+        """
+        if weights is None:
+            total = self.data.sum(axis=0)
+        else:
+            weights = np.asarray(weights)
+            if weights.shape != (len(self),):
+                raise ValueError(f"Expected {len(self)} weights, got shape {weights.shape}")
+            total = weights @ self.data
+        return self._row_to_simpy(total)
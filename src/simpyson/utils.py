@@ -1,20 +1,34 @@
 from __future__ import annotations
 
+import functools
+import heapq
 import json
+import logging
 from pathlib import Path
 
 import numpy as np
+from ase.neighborlist import neighbor_list
 from soprano.calculate.nmr.simpson import _header_template, _spinsys_template
-from soprano.data.nmr import _get_isotope_list
+from soprano.data.nmr import _get_isotope_data, _get_isotope_list
+from soprano.nmr.utils import _dip_constant
 from soprano.properties.nmr.dipolar import DipolarCoupling
 from soprano.selection import AtomSelection
 
+logger = logging.getLogger("simpyson")
+
 
 def _default_isotope_file() -> str:
     """Return the path to the bundled isotope data JSON file."""
     return str(Path(__file__).parent / 'isotope_data.json')
 
 
+@functools.lru_cache(maxsize=8)
+def _read_isotope_table(path: str, mtime_ns: int) -> dict:  # noqa: ARG001
+    """Parse an isotope data JSON file, memoized per path and modification time."""
+    with Path(path).open() as f:
+        return json.load(f)
+
+
 def _load_isotope_data(nucleus: str, isotope_file: str | None = None) -> dict:
     """
     Parse a nucleus string and load its isotope data row.
@@ -42,8 +56,7 @@ def _load_isotope_data(nucleus: str, isotope_file: str | None = None) -> dict:
     mass_number = int(''.join(filter(str.isdigit, nucleus)))
     element = ''.join(filter(str.isalpha, nucleus)).capitalize()
 
-    with Path(isotope_file).open() as f:
-        data = json.load(f)
+    data = _read_isotope_table(isotope_file, Path(isotope_file).stat().st_mtime_ns)
 
     if element in data and str(mass_number) in data[element]:
         return data[element][str(mass_number)]
@@ -144,7 +157,12 @@ def get_larmor_freq(b0: str, nucleus: str, isotope_file: str | None = None) -> f
 
     return larmor_freq
 
-def add_spectra(spectra_list: list, b0: str | None = None, nucleus: str | None = None):
+def add_spectra(
+    spectra_list: list,
+    b0: str | None = None,
+    nucleus: str | None = None,
+    weights: list | np.ndarray | None = None,
+):
     """
     Combine multiple Simpy objects into a single spectrum by summing.
 
@@ -156,6 +174,9 @@ def add_spectra(spectra_list: list, b0: str | None = None, nucleus: str | None =
         Magnetic field override (e.g., '400MHz').
     nucleus : str, optional
         Nucleus override (e.g., '1H').
+    weights : array_like, optional
+        One weight per spectrum (e.g. site multiplicities from
+        ``equivalent_sites``). If None, all spectra have weight 1.
 
     Returns
     -------
@@ -165,10 +186,15 @@ def add_spectra(spectra_list: list, b0: str | None = None, nucleus: str | None =
     Raises
     ------
     ValueError
-        If any spectrum in the list has no frequency-domain data.
+        If any spectrum in the list has no frequency-domain data, or the
+        number of weights does not match the number of spectra.
     """
     if not spectra_list:
         return None
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (len(spectra_list),):
+            raise ValueError(f"Expected {len(spectra_list)} weights, got shape {weights.shape}")
 
     # Validate spectra have frequency-domain data
     spe_data_list = []
@@ -178,32 +204,41 @@ def add_spectra(spectra_list: list, b0: str | None = None, nucleus: str | None =
             raise ValueError(f"Spectrum #{i} has no frequency-domain data to combine.")
         spe_data_list.append(spe)
 
-    result = spectra_list[0].copy()
-
-    if b0:
-        result.b0 = b0
-    if nucleus:
-        result.nucleus = nucleus
-
-    if len(spectra_list) == 1:
+    first = spectra_list[0]
+    if len(spectra_list) == 1 and (weights is None or weights[0] == 1):
+        # Copy-on-write: shares the data buffers until either side edits them
+        result = first.copy()
+        if b0:
+            result.b0 = b0
+        if nucleus:
+            result.nucleus = nucleus
         return result
 
+    result = type(first)(b0=b0 or first.b0, nucleus=nucleus or first.nucleus, dtype=first.dtype)
+
     # Check whether all spectra share the same Hz axis
-    ref_hz = spe_data_list[0]['hz']
+    ref_hz = spe_data_list[0].axis('hz')
     axes_match = all(
-        len(spe['hz']) == len(ref_hz) and np.allclose(spe['hz'], ref_hz)
+        len(spe.axis('hz')) == len(ref_hz) and np.allclose(spe.axis('hz'), ref_hz)
         for spe in spe_data_list[1:]
     )
 
     if axes_match:
-        # Fast path: identical Hz axes, just sum element-wise
-        for spe in spe_data_list[1:]:
-            result.spe['real'] += spe['real']
-            result.spe['imag'] += spe['imag']
+        # Fast path: identical Hz axes, sum the complex buffers element-wise
+        ref = spe_data_list[0]
+        if weights is None:
+            total = ref.data + spe_data_list[1].data
+            for spe in spe_data_list[2:]:
+                total += spe.data
+        else:
+            total = weights[0] * ref.data
+            for weight, spe in zip(weights[1:], spe_data_list[1:], strict=True):
+                total += weight * spe.data
+        result.from_spe(total, None, ref['np'], ref['sw'], ref.axis('hz'), copy=False)
     else:
         # Interpolate all spectra onto a common Hz grid
-        hz_min = min(spe['hz'][0] for spe in spe_data_list)
-        hz_max = max(spe['hz'][-1] for spe in spe_data_list)
+        hz_min = min(spe.axis('hz')[0] for spe in spe_data_list)
+        hz_max = max(spe.axis('hz')[-1] for spe in spe_data_list)
 
         # Use the smallest Hz step among all spectra
         steps = [spe['sw'] / spe['np'] for spe in spe_data_list]
@@ -216,11 +251,13 @@ def add_spectra(spectra_list: list, b0: str | None = None, nucleus: str | None =
         sum_real = np.zeros(n_common)
         sum_imag = np.zeros(n_common)
 
-        for spe in spe_data_list:
-            sum_real += np.interp(common_hz, spe['hz'], spe['real'],
-                                  left=0.0, right=0.0)
-            sum_imag += np.interp(common_hz, spe['hz'], spe['imag'],
-                                  left=0.0, right=0.0)
+        if weights is None:
+            weights = np.ones(len(spe_data_list))
+        for weight, spe in zip(weights, spe_data_list, strict=True):
+            sum_real += weight * np.interp(common_hz, spe['hz'], spe['real'],
+                                           left=0.0, right=0.0)
+            sum_imag += weight * np.interp(common_hz, spe['hz'], spe['imag'],
+                                           left=0.0, right=0.0)
 
         common_sw = common_hz[-1] - common_hz[0]
         result.from_spe(sum_real, sum_imag, n_common, common_sw, common_hz)
@@ -244,7 +281,10 @@ def simple_spinsys(
     get_dipolar: bool = False,
     dip_sel: object | None = None,
     obs_nuc: str | None = None,
-) -> str:
+    dip_cutoff: float | None = None,
+    dip_min_coupling: float | None = None,
+    file: object | None = None,
+) -> str | None:
     """
     Build a SIMPSON spinsys string from manually provided NMR parameters.
 
@@ -282,16 +322,35 @@ def simple_spinsys(
         Selection of atoms for dipolar couplings. Defaults to all atoms.
     obs_nuc : str or None
         Observed nucleus (e.g., ``'13C'``). Placed first in the channels list.
+    dip_cutoff : float or None
+        Only include dipolar couplings between atoms closer than this
+        distance (in Angstrom, nearest periodic image).
+    dip_min_coupling : float or None
+        Only include dipolar couplings whose magnitude is at least this
+        value (in Hz).
+    file : file-like or None
+        Text file handle. If given, the spinsys block is written to it
+        line by line instead of being built in memory.
 
     Returns
     -------
-    str
-        Complete SIMPSON spinsys block as a string.
+    str or None
+        Complete SIMPSON spinsys block as a string, or None if ``file`` is
+        given.
 
     Raises
     ------
     ValueError
-        If a quadrupolar order exceeds 2.
+        If a quadrupolar order exceeds 2, or a per-atom list has fewer
+        values than there are atoms.
+
+    Notes
+    -----
+    Without ``dip_cutoff`` and ``dip_min_coupling`` every pair in
+    ``dip_sel`` is coupled, which scales as N^2. With either of them, pairs
+    are found with a periodic cell-list search (``ase.neighborlist``) up to
+    the cutoff, or up to the distance at which the strongest possible
+    coupling drops below ``dip_min_coupling``.
     """
 
     # Header Block
@@ -308,69 +367,686 @@ def simple_spinsys(
         channels=" ".join(channels), nuclei=" ".join(nuclei)
     )
 
-    # Magnetic shielding Block
-    ms_block = ""
+    num_atoms = len(atoms)
+    # The line generators below zip these lists, so a short one would drop atoms
+    per_atom = {
+        'iso_ms': iso_ms, 'aniso_ms': aniso_ms, 'eta_ms': eta_ms, 'euler_ms': euler_ms,
+        'cq': cq, 'eta_q': eta_q, 'q_order': q_order, 'euler_q': euler_q,
+    }
+    for name, values in per_atom.items():
+        if values is not None and len(values) < num_atoms:
+            raise ValueError(f"{name} has {len(values)} values, expected one per atom ({num_atoms})")
+
+    if cq is not None and q_order is not None:
+        for i in range(num_atoms):
+            if cq[i] != 0 and q_order[i] > 2:
+                raise ValueError(
+                    f"Quadrupolar order must be 2 or less, got {q_order[i]} for atom {i+1}"
+                )
+
+    # Each block is a lazy sequence of lines, joined once or streamed
+    ms_lines = ()
     if iso_ms is not None:
-        num_atoms = len(atoms)
         aniso_ms_vals = aniso_ms if aniso_ms is not None else np.zeros(num_atoms)
         eta_ms_vals = eta_ms if eta_ms is not None else np.zeros(num_atoms)
         euler_ms_vals = euler_ms if euler_ms is not None else np.zeros((num_atoms, 3))
-
-        for i in range(num_atoms):
-            ms_block += "shift {} {}p {}p {} {} {} {}\n".format(
-                i + 1,
-                iso_ms[i],
-                aniso_ms_vals[i],
-                eta_ms_vals[i],
-                *euler_ms_vals[i],
+        ms_lines = (
+            f"shift {i} {iso}p {aniso}p {eta} {_join(euler)}\n"
+            for i, iso, aniso, eta, euler in zip(
+                range(1, num_atoms + 1), iso_ms, aniso_ms_vals, eta_ms_vals, euler_ms_vals,
+                strict=False,
             )
+        )
 
-    # Quadrupolar Block
-    efg_block = ""
+    efg_lines = ()
     if cq is not None:
-        num_atoms = len(atoms)
         eta_q_vals = eta_q if eta_q is not None else np.zeros(num_atoms)
         euler_q_vals = euler_q if euler_q is not None else np.zeros((num_atoms, 3))
+        q_order_vals = q_order if q_order is not None else [2] * num_atoms
+        efg_lines = (
+            f"quadrupole {i} {order} {c} {eta} {_join(euler)}\n"
+            for i, order, c, eta, euler in zip(
+                range(1, num_atoms + 1), q_order_vals, cq, eta_q_vals, euler_q_vals,
+                strict=False,
+            )
+            if c != 0
+        )
 
-        for i in range(num_atoms):
-            if cq[i] != 0:
-                if q_order is not None:
-                    if q_order[i] > 2:
-                        raise ValueError(
-                            f"Quadrupolar order must be 2 or less, got {q_order[i]} for atom {i+1}"
-                        )
-                    efg_block += "quadrupole {} {} {} {} {} {} {}\n".format(
-                        i + 1, q_order[i], cq[i], eta_q_vals[i], *euler_q_vals[i]
-                    )
-                else:
-                    efg_block += "quadrupole {} 2 {} {} {} {} {}\n".format(
-                        i + 1, cq[i], eta_q_vals[i], *euler_q_vals[i]
-                    )
-
-    # Dipolar Block
-    dip_block = ""
+    dip_lines = ()
     if get_dipolar:
         if dip_sel is None:
             dip_sel = AtomSelection.all(atoms)
 
         if len(dip_sel) > 1:
-            dip_couplings = DipolarCoupling.get(
-                atoms, sel_i=dip_sel, isotope_list=isotope_list
-            )
-            for (i, j), (d, v) in dip_couplings.items():
-                # Convert units
-                d_rad_s = d * 2 * np.pi
-
-                if np.allclose(v, [0, 0, 1]):
-                    beta, alpha = 0.0, 0.0
-                elif np.allclose(v, [0, 0, -1]):
-                    beta, alpha = 180.0, 0.0
-                else:
-                    beta = np.arccos(v[2]) * 180 / np.pi
-                    alpha = np.arctan2(v[1], v[0]) * 180 / np.pi
-
-                dip_block += f"dipole {i + 1} {j + 1} {d_rad_s} {beta} {alpha} 0.0\n"
-
-    return _spinsys_template.format(
-        header=header, ms=ms_block, efg=efg_block, dipolar=dip_block
+            if dip_cutoff is None and dip_min_coupling is None:
+                dip_couplings = DipolarCoupling.get(
+                    atoms, sel_i=dip_sel, isotope_list=isotope_list
+                )
+            else:
+                dip_couplings = _dipolar_neighbours(
+                    atoms, dip_sel, isotope_list, dip_cutoff, dip_min_coupling
+                )
+            dip_lines = _dipole_lines(dip_couplings)
+
+    if file is None:
+        return _spinsys_template.format(
+            header=header,
+            ms="".join(ms_lines),
+            efg="".join(efg_lines),
+            dipolar="".join(dip_lines),
+        )
+
+    # Same layout as _spinsys_template, written block by block
+    file.write(f"spinsys {{\n{header}\n")
+    for lines in (ms_lines, efg_lines, dip_lines):
+        file.writelines(lines)
+        file.write("\n")
+    file.write("}\n")
+    return None
+
+
+def _join(values) -> str:
+    """Space-separated ``str`` of each value."""
+    return " ".join(map(str, values))
+
+
+def _dipole_lines(dip_couplings: dict):
+    """
+    Yield SIMPSON ``dipole`` lines for a ``{(i, j): [d, versor]}`` mapping.
+
+    Couplings are converted from Hz to rad/s and the versors to polar
+    angles for all pairs at once.
+    """
+    if not dip_couplings:
+        return
+    pairs = np.array(list(dip_couplings.keys())) + 1
+    values = list(dip_couplings.values())
+    d_rad_s = np.array([d for d, _ in values]) * 2 * np.pi
+    versors = np.array([v for _, v in values])
+
+    beta = np.arccos(versors[:, 2]) * 180 / np.pi
+    alpha = np.arctan2(versors[:, 1], versors[:, 0]) * 180 / np.pi
+    up = np.isclose(versors, [0, 0, 1]).all(axis=1)
+    down = np.isclose(versors, [0, 0, -1]).all(axis=1)
+    beta[up], alpha[up] = 0.0, 0.0
+    beta[down], alpha[down] = 180.0, 0.0
+
+    # Lines are still formatted one f-string at a time: vectorized formatters
+    # (np.savetxt, np.char) use fixed precision and would change the output,
+    # while str(float) gives the shortest round-trip repr the files always had.
+    # float64 -> float keeps that repr and formats much faster than NumPy scalars
+    columns = (pairs.tolist(), d_rad_s.tolist(), beta.tolist(), alpha.tolist())
+    for (i, j), d, b, a in zip(*columns, strict=True):
+        yield f"dipole {i} {j} {d} {b} {a} 0.0\n"
+
+
+def _dipolar_neighbours(
+    atoms: object,
+    dip_sel: object,
+    isotope_list: list,
+    cutoff: float | None,
+    min_coupling: float | None,
+) -> dict:
+    """
+    Dipolar couplings of nearby pairs, from a periodic neighbour search.
+
+    Returns the same ``{(i, j): [d, versor]}`` mapping as Soprano's
+    ``DipolarCoupling.get`` (coupling in Hz, unit vector from ``i`` to the
+    nearest periodic image of ``j``, ``i < j``), restricted to pairs closer
+    than ``cutoff`` Angstrom and with ``|d| >= min_coupling`` Hz, sorted by
+    pair.
+    """
+    indices = np.unique(np.asarray(getattr(dip_sel, 'indices', dip_sel), dtype=int))
+    subset = atoms[indices]
+    gammas = _get_isotope_data(
+        subset.get_chemical_symbols(), 'gamma', isotope_list=[isotope_list[i] for i in indices]
     )
+
+    if min_coupling is not None:
+        # Distance at which the strongest possible pair falls to min_coupling
+        gamma = np.abs(gammas).max()
+        reach = (abs(_dip_constant(1.0, gamma, gamma)) / min_coupling) ** (1 / 3) * 1e10
+        cutoff = reach if cutoff is None else min(cutoff, reach)
+
+    first, second, dist, vec = neighbor_list('ijdD', subset, cutoff)
+    keep = first < second
+    first, second, dist, vec = first[keep], second[keep], dist[keep], vec[keep]
+
+    # Keep the nearest periodic image of every pair
+    order = np.lexsort((dist, second, first))
+    first, second, dist, vec = first[order], second[order], dist[order], vec[order]
+    nearest = np.ones(len(first), dtype=bool)
+    nearest[1:] = (first[1:] != first[:-1]) | (second[1:] != second[:-1])
+    first, second, dist, vec = first[nearest], second[nearest], dist[nearest], vec[nearest]
+
+    couplings = _dip_constant(dist * 1e-10, gammas[first], gammas[second])
+    if min_coupling is not None:
+        strong = np.abs(couplings) >= min_coupling
+        first, second, dist, vec, couplings = (
+            first[strong], second[strong], dist[strong], vec[strong], couplings[strong]
+        )
+    versors = vec / dist[:, None]
+    return {
+        (int(indices[i]), int(indices[j])): [d, v]
+        for i, j, d, v in zip(first, second, couplings, versors, strict=True)
+    }
+
+
+# Search radius (Angstrom) beyond which site_clusters stops looking for neighbours
+_MAX_CLUSTER_RADIUS = 50.0
+
+
+def site_clusters(
+    atoms: object,
+    sites: list[int],
+    n_neighbours: int = 4,
+    neighbours: list[int] | None = None,
+    isotopes: dict | None = None,
+) -> list:
+    """
+    Build a small cluster around each site of a periodic structure.
+
+    A cluster holds the site and the ``n_neighbours`` spins most strongly
+    dipolar-coupled to it (largest ``|gamma_i gamma_j| / r^3``), taken from
+    all periodic images. Periodic images of one atom are distinct spins,
+    so an atom can appear more than once in a cluster.
+
+    Parameters
+    ----------
+    atoms : ase.Atoms
+        Structure, possibly periodic, with any per-atom arrays (``ms``,
+        ``efg``, ...) needed to build the spin systems.
+    sites : list of int
+        Indices of the observed sites, one cluster each.
+    n_neighbours : int
+        Number of neighbours per cluster.
+    neighbours : list of int or None
+        Indices of the atoms that may be neighbours. Defaults to all atoms;
+        atoms of NMR-inactive isotopes are never used.
+    isotopes : dict or None
+        Mapping of element symbol to mass number, as in ``simple_spinsys``.
+
+    Returns
+    -------
+    list of ase.Atoms
+        One non-periodic cluster per site, with the site first, then its
+        neighbours by decreasing coupling, at the positions of the coupled
+        images. ``cluster.info['indices']`` holds the index in ``atoms`` of
+        every cluster atom.
+
+    Raises
+    ------
+    ValueError
+        If ``n_neighbours`` is negative, a site has no candidate
+        neighbours, or fewer than ``n_neighbours`` lie within 50 Angstrom.
+
+    Examples
+    --------
+    >>> clusters = site_clusters(atoms, sites=al_idx, n_neighbours=3, neighbours=p_idx)
+    >>> spinsys = simple_spinsys(clusters[0], {'Al': 27, 'P': 31}, get_dipolar=True, dip_cutoff=20)
+    """
+    if n_neighbours < 0:
+        raise ValueError(f"n_neighbours must be non-negative, got {n_neighbours}")
+    sites = np.asarray(sites, dtype=int)
+    if neighbours is None:
+        neighbours = range(len(atoms))
+    symbols = atoms.get_chemical_symbols()
+    gammas = np.abs(_get_isotope_data(symbols, 'gamma', isotopes or {}))
+    candidate = np.zeros(len(atoms), dtype=bool)
+    candidate[np.asarray(neighbours, dtype=int)] = True
+    candidate &= gammas > 0
+
+    # Search in a subset holding the sites and candidate neighbours
+    subset_idx = np.flatnonzero(candidate | np.isin(np.arange(len(atoms)), sites))
+    subset = atoms[subset_idx]
+    local = np.searchsorted(subset_idx, sites)
+    periodic = bool(np.any(atoms.pbc))
+    available = candidate[subset_idx].sum() - candidate[sites]
+
+    missing = np.flatnonzero(available == 0)
+    if n_neighbours and len(missing):
+        raise ValueError(
+            f"No candidate neighbours for site {int(sites[missing[0]])}; "
+            "check neighbours and isotopes"
+        )
+
+    chosen: list = [None] * len(sites)
+    radius = 4.0
+    while True:
+        first, second, dist, vec = neighbor_list('ijdD', subset, radius)
+        final = radius >= _MAX_CLUSTER_RADIUS
+        for k, site in enumerate(local):
+            if chosen[k] is not None:
+                continue
+            rows = np.flatnonzero((first == site) & candidate[subset_idx[second]])
+            strength = gammas[subset_idx[second[rows]]] / dist[rows] ** 3
+            order = np.lexsort((second[rows], dist[rows], -strength))[:n_neighbours]
+            rows, strength = rows[order], strength[order]
+            # Atoms beyond the radius cannot couple more strongly than this
+            bound = gammas.max() / radius ** 3
+            complete = len(rows) == n_neighbours and (
+                n_neighbours == 0 or final or strength[-1] >= bound
+            )
+            if complete or (not periodic and len(rows) == min(n_neighbours, available[k])):
+                chosen[k] = (subset_idx[second[rows]], vec[rows])
+        if all(c is not None for c in chosen):
+            break
+        if final:
+            k = next(k for k, c in enumerate(chosen) if c is None)
+            raise ValueError(
+                f"Found fewer than {n_neighbours} neighbours within {_MAX_CLUSTER_RADIUS} "
+                f"Angstrom of site {int(sites[k])}"
+            )
+        radius = min(radius * 1.5, _MAX_CLUSTER_RADIUS)
+
+    clusters = []
+    for site, (members, offsets) in zip(sites, chosen, strict=True):
+        indices = [int(site), *(int(i) for i in members)]
+        cluster = atoms[indices]
+        origin = atoms.positions[site]
+        cluster.positions = np.vstack([origin, origin + np.reshape(offsets, (-1, 3))])
+        cluster.pbc = False
+        cluster.info['indices'] = indices
+        clusters.append(cluster)
+    return clusters
+
+
+def _tensor_invariants(ms: np.ndarray | None, efg: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rotation-invariant descriptors of per-site ``ms``/``efg`` tensors.
+
+    Returns the shielding features (ppm: eigenvalues and the relative
+    orientation terms) and the EFG features (a.u.: eigenvalues), each of
+    shape ``(n_sites, k)``.
+    """
+    n_sites = len(ms if ms is not None else efg)
+    ms_features = np.zeros((n_sites, 0))
+    efg_features = np.zeros((n_sites, 0))
+    if efg is not None:
+        efg = (efg + efg.swapaxes(-1, -2)) / 2
+        efg_features = np.linalg.eigvalsh(efg)
+    if ms is not None:
+        ms = (ms + ms.swapaxes(-1, -2)) / 2
+        ms_features = np.linalg.eigvalsh(ms)
+    if ms is not None and efg is not None:
+        # Traces of products with the unit-norm EFG fix the orientation of
+        # the shielding tensor relative to the EFG, in ppm.
+        dev = ms - np.trace(ms, axis1=-2, axis2=-1)[:, None, None] * np.eye(3) / 3
+        dev_norm = np.linalg.norm(dev, axis=(-2, -1))
+        efg_norm = np.linalg.norm(efg, axis=(-2, -1))
+        unit = efg / np.where(efg_norm > 0, efg_norm, 1)[:, None, None]
+        dev2 = dev @ dev / np.where(dev_norm > 0, dev_norm, 1)[:, None, None]
+        unit2 = unit @ unit
+        mixed = np.stack([
+            np.einsum('nij,nji->n', dev, unit),
+            np.einsum('nij,nji->n', dev, unit2),
+            np.einsum('nij,nji->n', dev2, unit),
+            np.einsum('nij,nji->n', dev2, unit2),
+        ], axis=1)
+        ms_features = np.concatenate([ms_features, mixed], axis=1)
+    return ms_features, efg_features
+
+
+def equivalent_sites(
+    atoms: object,
+    indices: list[int] | None = None,
+    ms_tol: float = 0.05,
+    efg_tol: float = 1e-4,
+) -> list[list[int]]:
+    """
+    Group atoms whose NMR tensors are equivalent up to a rotation.
+
+    Crystallographically equivalent sites have identical shielding and EFG
+    tensors in rotated frames, so their powder spectra are identical. Each
+    group can be simulated once with a representative site and weighted by
+    the group size.
+
+    Two sites are equivalent when they are the same element and their
+    tensor eigenvalues and relative shielding/EFG orientation agree within
+    the tolerances.
+
+    Parameters
+    ----------
+    atoms : ase.Atoms
+        Structure with ``ms`` and/or ``efg`` arrays (e.g. read from a
+        CASTEP ``.magres`` file or with ``read_vasp``).
+    indices : list of int or None
+        Atom indices to group. Defaults to all atoms.
+    ms_tol : float
+        Tolerance on the shielding descriptors, in ppm.
+    efg_tol : float
+        Tolerance on the EFG eigenvalues, in atomic units.
+
+    Returns
+    -------
+    list of list of int
+        Sorted atom indices of every group, ordered by their first atom.
+        ``group[0]`` is the representative and ``len(group)`` its
+        multiplicity.
+
+    Raises
+    ------
+    ValueError
+        If ``atoms`` has neither an ``ms`` nor an ``efg`` array.
+
+    Examples
+    --------
+    >>> groups = equivalent_sites(atoms, indices=al_idx)
+    >>> spinsys = [write_spinsys(atoms[[g[0]]], use_ms=True, q_order=2) for g in groups]
+    >>> total = add_spectra(spectra, weights=[len(g) for g in groups])
+    """
+    if indices is None:
+        indices = range(len(atoms))
+    indices = np.asarray(indices, dtype=int)
+    ms = atoms.get_array('ms')[indices] if atoms.has('ms') else None
+    efg = atoms.get_array('efg')[indices] if atoms.has('efg') else None
+    if ms is None and efg is None:
+        raise ValueError("atoms has neither an 'ms' nor an 'efg' array")
+
+    ms_features, efg_features = _tensor_invariants(ms, efg)
+    symbols = np.asarray(atoms.get_chemical_symbols())[indices]
+
+    groups: list[list[int]] = []
+    representatives: list[int] = []
+    for i, index in enumerate(indices):
+        if representatives:
+            reps = np.asarray(representatives)
+            match = (
+                (symbols[reps] == symbols[i])
+                & (np.abs(ms_features[reps] - ms_features[i]) <= ms_tol).all(axis=1)
+                & (np.abs(efg_features[reps] - efg_features[i]) <= efg_tol).all(axis=1)
+            )
+            if match.any():
+                groups[int(np.argmax(match))].append(int(index))
+                continue
+        representatives.append(i)
+        groups.append([int(index)])
+    return sorted(sorted(group) for group in groups)
+
+
+_SPINSYS_SITES = {'shift': 1, 'quadrupole': 1, 'dipole': 2, 'jcoupling': 2}
+
+
+def parse_spinsys(spinsys: str | object) -> dict:
+    """
+    Split a SIMPSON spinsys block into nuclei and interaction lines.
+
+    Parameters
+    ----------
+    spinsys : str or object
+        SIMPSON spinsys string (with or without the ``spinsys { }``
+        wrapper) or a Soprano SpinSystem with a ``to_simpson()`` method.
+
+    Returns
+    -------
+    dict
+        ``'channels'`` and ``'nuclei'`` (lists of nucleus strings) and
+        ``'interactions'``, a list of ``(kind, sites, values)`` tuples in
+        file order. ``sites`` holds the 1-based site indices of the
+        interaction (one for ``shift``/``quadrupole``, two for
+        ``dipole``/``jcoupling``) and ``values`` the remaining tokens as
+        strings, e.g. ``('shift', (1,), ['5p', '10p', '0.5', '0', '0', '0'])``.
+
+    Raises
+    ------
+    ValueError
+        If an interaction line is not recognised.
+    """
+    if hasattr(spinsys, 'to_simpson'):
+        spinsys = spinsys.to_simpson()
+
+    result = {'channels': [], 'nuclei': [], 'interactions': []}
+    for line in str(spinsys).splitlines():
+        tokens = line.replace('{', ' ').replace('}', ' ').split()
+        if tokens and tokens[0] == 'spinsys':
+            tokens = tokens[1:]
+        if not tokens or tokens[0].startswith('#'):
+            continue
+        kind = tokens[0]
+        if kind in ('channels', 'nuclei'):
+            result[kind] = tokens[1:]
+        elif kind in _SPINSYS_SITES:
+            n_sites = _SPINSYS_SITES[kind]
+            sites = tuple(int(t) for t in tokens[1:1 + n_sites])
+            result['interactions'].append((kind, sites, tokens[1 + n_sites:]))
+        else:
+            raise ValueError(f"Unsupported spinsys line: '{line.strip()}'")
+    return result
+
+
+def coupling_components(spinsys: str | object | dict) -> list[list[int]]:
+    """
+    Group the sites of a spin system into uncoupled parts.
+
+    Two sites belong to the same part when a chain of ``dipole`` or
+    ``jcoupling`` lines connects them. Parts share no coupling, so each can
+    be simulated on its own.
+
+    Parameters
+    ----------
+    spinsys : str, object or dict
+        Spinsys string, Soprano SpinSystem, or the output of
+        ``parse_spinsys``.
+
+    Returns
+    -------
+    list of list of int
+        Sorted 1-based site indices of every part, ordered by their first
+        site.
+    """
+    parsed = spinsys if isinstance(spinsys, dict) else parse_spinsys(spinsys)
+    parent = list(range(len(parsed['nuclei']) + 1))
+
+    def root(site):
+        while parent[site] != site:
+            parent[site] = parent[parent[site]]
+            site = parent[site]
+        return site
+
+    for kind, sites, _ in parsed['interactions']:
+        if _SPINSYS_SITES[kind] == 2:
+            parent[root(sites[0])] = root(sites[1])
+
+    groups: dict[int, list[int]] = {}
+    for site in range(1, len(parent)):
+        groups.setdefault(root(site), []).append(site)
+    return sorted(groups.values())
+
+
+def extract_spinsys(spinsys: str | object | dict, sites: list[int]) -> str:
+    """
+    Build the spinsys body of a subset of sites.
+
+    The sites are renumbered ``1..len(sites)`` in the given order and only
+    interactions between them are kept. The ``channels`` line is copied
+    unchanged.
+
+    Parameters
+    ----------
+    spinsys : str, object or dict
+        Spinsys string, Soprano SpinSystem, or the output of
+        ``parse_spinsys``.
+    sites : list of int
+        1-based indices of the sites to keep.
+
+    Returns
+    -------
+    str
+        Spinsys body (``channels``, ``nuclei`` and interaction lines)
+        without the ``spinsys { }`` wrapper.
+    """
+    parsed = spinsys if isinstance(spinsys, dict) else parse_spinsys(spinsys)
+    index = {site: i for i, site in enumerate(sites, 1)}
+    lines = [
+        f"channels {' '.join(parsed['channels'])}",
+        f"nuclei {' '.join(parsed['nuclei'][site - 1] for site in sites)}",
+    ]
+    for kind, members, values in parsed['interactions']:
+        if all(site in index for site in members):
+            lines.append(" ".join([kind, *(str(index[site]) for site in members), *values]))
+    return "\n".join(lines) + "\n"
+
+
+def hilbert_dimension(spinsys: str | object | dict) -> int:
+    """
+    Return the Hilbert-space dimension of a spin system.
+
+    Parameters
+    ----------
+    spinsys : str, object or dict
+        Spinsys string, Soprano SpinSystem, or the output of
+        ``parse_spinsys``.
+
+    Returns
+    -------
+    int
+        Product of ``2I + 1`` over all nuclei.
+
+    Raises
+    ------
+    ValueError
+        If a nucleus is not in the isotope table.
+    """
+    parsed = spinsys if isinstance(spinsys, dict) else parse_spinsys(spinsys)
+    return int(np.prod([int(2 * get_spin(nucleus) + 1) for nucleus in parsed['nuclei']]))
+
+
+def _coupling_hz(kind: str, values: list[str]) -> float:
+    """Magnitude of a ``dipole`` (rad/s) or ``jcoupling`` (Hz) line, in Hz."""
+    if kind == 'dipole':
+        return abs(float(values[0])) / (2 * np.pi)
+    return max(abs(float(values[0])), abs(float(values[1])))
+
+
+def prune_spinsys(
+    spinsys: str | object | dict,
+    max_dim: int | None = None,
+    max_spins: int | None = None,
+    keep: list[int] | None = None,
+) -> tuple[str, list[int], list[tuple[str, tuple[int, int], float]]]:
+    """
+    Drop weakly coupled spins until the spin system is small enough.
+
+    Spins are removed one at a time, always the one most weakly coupled
+    (``dipole``/``jcoupling``, in Hz) to the protected spins, then to any
+    spin still present, until the Hilbert-space dimension is at most
+    ``max_dim`` and the number of spins at most ``max_spins``. The first
+    spin of the observed nucleus (the first channel), the sites in ``keep``
+    and the last spin of every channel are protected and never removed.
+    Other spins of the observed nucleus are pruned like any other spin, so
+    a homonuclear system keeps the ones most strongly coupled to the
+    protected spins.
+
+    Parameters
+    ----------
+    spinsys : str, object or dict
+        Spinsys string, Soprano SpinSystem, or the output of
+        ``parse_spinsys``.
+    max_dim : int or None
+        Target Hilbert-space dimension.
+    max_spins : int or None
+        Target number of spins.
+    keep : list of int or None
+        Further 1-based sites to keep.
+
+    Returns
+    -------
+    tuple of (str, list of int, list)
+        The pruned spinsys body (as from ``extract_spinsys``), the original
+        indices of the kept sites in their new order, and the discarded
+        couplings as ``(kind, (i, j), magnitude_hz)`` in removal order,
+        with original site indices.
+
+    Raises
+    ------
+    ValueError
+        If neither target is given, or the protected spins alone exceed it.
+
+    Examples
+    --------
+    >>> spinsys = (
+    ...     "channels 13C 1H\\n"
+    ...     "nuclei 13C 1H 1H\\n"
+    ...     "dipole 1 2 -62831.85 0 0 0\\n"
+    ...     "dipole 1 3 -3141.59 0 0 0\\n"
+    ... )
+    >>> body, kept, dropped = prune_spinsys(spinsys, max_spins=2)
+    >>> kept
+    [1, 2]
+    >>> [(kind, sites, round(hz)) for kind, sites, hz in dropped]
+    [('dipole', (1, 3), 500)]
+    """
+    if max_dim is None and max_spins is None:
+        raise ValueError("Give max_dim and/or max_spins")
+    parsed = spinsys if isinstance(spinsys, dict) else parse_spinsys(spinsys)
+    nuclei = parsed['nuclei']
+    dims = {site: int(2 * get_spin(nucleus) + 1) for site, nucleus in enumerate(nuclei, 1)}
+    protected = set(keep or ())
+    observed = [site for site, nucleus in enumerate(nuclei, 1) if nucleus == parsed['channels'][0]]
+    protected.update(observed[:1])
+
+    couplings: dict[int, dict[int, float]] = {site: {} for site in dims}
+    lines: dict[int, list] = {site: [] for site in dims}
+    for kind, sites, values in parsed['interactions']:
+        if _SPINSYS_SITES[kind] == 2:
+            i, j = sites
+            magnitude = _coupling_hz(kind, values)
+            couplings[i][j] = max(couplings[i].get(j, 0.0), magnitude)
+            couplings[j][i] = max(couplings[j].get(i, 0.0), magnitude)
+            lines[i].append((kind, sites, magnitude))
+            lines[j].append((kind, sites, magnitude))
+
+    remaining = set(dims)
+    per_channel = {n: sum(1 for m in nuclei if m == n) for n in set(nuclei)}
+    dimension = int(np.prod(list(dims.values())))
+
+    def score(site):
+        # Coupling to the kept spins first, then to any spin still present
+        partners = couplings[site].items()
+        return (
+            max((c for partner, c in partners if partner in protected), default=0.0),
+            max((c for partner, c in partners if partner in remaining), default=0.0),
+        )
+
+    # Lazy heap: an entry is stale if the site's score has dropped since.
+    # Removing a spin only lowers its partners' scores, so they get fresh
+    # entries after each removal and stale ones are skipped when popped.
+    heap = [(score(site), -site, site) for site in remaining - protected]
+    heapq.heapify(heap)
+    dropped = []
+    while (max_dim is not None and dimension > max_dim) or (max_spins is not None and len(remaining) > max_spins):
+        site = None
+        while heap:
+            strength, _, candidate = heapq.heappop(heap)
+            if candidate not in remaining:
+                continue
+            if strength != score(candidate):
+                continue
+            if nuclei[candidate - 1] in parsed['channels'] and per_channel[nuclei[candidate - 1]] == 1:
+                continue
+            site = candidate
+            break
+        if site is None:
+            raise ValueError(
+                f"Cannot prune to max_dim={max_dim}, max_spins={max_spins}: the "
+                f"{len(remaining)} remaining spins (dimension {dimension}) are all protected"
+            )
+        remaining.remove(site)
+        per_channel[nuclei[site - 1]] -= 1
+        dimension //= dims[site]
+        for partner in couplings[site]:
+            if partner in remaining and partner not in protected:
+                heapq.heappush(heap, (score(partner), -partner, partner))
+        # Couplings to partners removed earlier were recorded with them
+        dropped.extend(
+            (kind, sites, magnitude) for kind, sites, magnitude in lines[site]
+            if all(s in remaining for s in sites if s != site)
+        )
+
+    kept = sorted(remaining)
+    if len(kept) < len(nuclei):
+        logger.info(
+            "Pruned %d of %d spins; strongest discarded coupling %.1f Hz",
+            len(nuclei) - len(kept), len(nuclei), max((m for _, _, m in dropped), default=0.0),
+        )
+    return extract_spinsys(parsed, kept), kept, dropped
@@ -0,0 +1,68 @@
+"""Shared fixtures for the simpyson test suite."""
+from __future__ import annotations
+
+import stat
+import sys
+
+import pytest
+
+# Stand-in for the SIMPSON executable: reads the input file, honours the
+# fsave name ($par(name) is the input file stem, relative to the cwd), and
+# writes a constant spectrum whose value is the spin_rate parameter. If the
+# crystal_file names a .cry file, the value is scaled by sum(weight * alpha)
+# over its orientations, so orientation weighting can be checked. Like
+# SIMPSON's Tr(rho D) for n spin-1/2 nuclei, the value is also scaled by
+# n * 2**(n - 1) (1 for a single spin). The ref variable is written to the
+# REF header field, as fset -ref does. With FAKE_SIMPSON_PIDFILE set, the
+# process writes its pid there first.
+FAKE_SIMPSON = f'''#!{sys.executable}
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+if os.environ.get('FAKE_SIMPSON_PIDFILE'):
+    Path(os.environ['FAKE_SIMPSON_PIDFILE']).write_text(str(os.getpid()))
+src = Path(sys.argv[1]).read_text()
+
+
+def par(key, default):
+    m = re.search(rf'^\\s*(?:variable\\s+)?{{key}}\\s+(\\S+)', src, re.M)
+    return float(m.group(1)) if m else default
+
+
+if par('crash', 0):
+    sys.exit('simulated SIMPSON failure')
+time.sleep(par('sleep', 0))
+
+save = re.search(r'fsave \\$f (\\S+)', src).group(1)
+name = save.replace('$par(name)', Path(sys.argv[1]).stem)
+zerofill = re.search(r'fzerofill \\$f (\\d+)', src)
+npoints = int(zerofill.group(1)) if zerofill else int(par('np', 4))
+value = par('spin_rate', 1.0)
+nuclei = re.search(r'^\\s*nuclei\\s+(.+)$', src, re.M)
+n_spins = len(nuclei.group(1).split()) if nuclei else 1
+value *= n_spins * 2 ** (n_spins - 1)
+crystal = re.search(r'^\\s*crystal_file\\s+(\\S+)', src, re.M)
+if crystal and Path(crystal.group(1) + '.cry').exists():
+    rows = Path(crystal.group(1) + '.cry').read_text().split('\\n')[1:]
+    value *= sum(float(r.split()[0]) * float(r.split()[-1]) for r in rows if r.strip())
+kind = 'FID' if name.endswith('.fid') else 'SPE'
+Path(name).write_text(
+    f"SIMP\\nNP={{npoints}}\\nSW={{par('sw', 100.0)}}\\nREF={{par('ref', 0.0)}}\\nTYPE={{kind}}\\nDATA\\n"
+    + f"{{value}} 0\\n" * npoints
+    + "END\\n"
+)
+print('fake simpson done')
+'''
+
+
+@pytest.fixture
+def fake_simpson(tmp_path):
+    """Path to a fake ``simpson`` executable for running SimpCalc offline."""
+    path = tmp_path / "bin" / "simpson"
+    path.parent.mkdir()
+    path.write_text(FAKE_SIMPSON)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
@@ -0,0 +1,81 @@
+"""Tests for simpyson.cache — the size-bounded on-disk cache."""
+from __future__ import annotations
+
+import os
+
+from simpyson import cache as cache_module
+from simpyson.cache import DiskCache, default_cache_dir, hash_key
+
+
+def _write_entry(cache, key, nbytes, mtime):
+    path = cache.write(key, '.bin', lambda f: f.write(b'x' * nbytes))
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_default_cache_dir_env(monkeypatch, tmp_path):
+    monkeypatch.setenv('SIMPYSON_CACHE_DIR', str(tmp_path))
+    assert default_cache_dir() == tmp_path
+
+
+def test_hash_key_is_stable():
+    assert hash_key('a', 1, 2.5) == hash_key('a', 1, 2.5)
+    assert hash_key('a', 1) != hash_key('a', 2)
+
+
+def test_lookup_requires_all_files(tmp_path):
+    cache = DiskCache('test', directory=str(tmp_path))
+    cache.write('k', '.npy', lambda f: f.write(b'data'))
+    assert cache.lookup('k', ('.npy',)) is not None
+    assert cache.lookup('k', ('.npy', '.json')) is None
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = DiskCache('test', directory=str(tmp_path), max_bytes=250)
+    old = _write_entry(cache, 'old', 100, 1_000)
+    mid = _write_entry(cache, 'mid', 100, 2_000)
+    new = _write_entry(cache, 'new', 100, 3_000)
+    cache.evict()
+    assert not old.exists()
+    assert mid.exists()
+    assert new.exists()
+
+
+def test_maybe_evict_scans_only_past_limit(tmp_path, monkeypatch):
+    cache = DiskCache('test', directory=str(tmp_path), max_bytes=250)
+    scans = []
+    evict = DiskCache.evict
+    monkeypatch.setattr(DiskCache, 'evict', lambda self: scans.append(1) or evict(self))
+    old = _write_entry(cache, 'old', 100, 1_000)
+    cache.maybe_evict()  # first call scans to learn the size
+    _write_entry(cache, 'mid', 100, 2_000)
+    cache.maybe_evict()
+    assert len(scans) == 1
+    new = _write_entry(cache, 'new', 100, 3_000)
+    cache.maybe_evict()
+    assert len(scans) == 2
+    assert not old.exists()
+    assert new.exists()
+
+
+def test_maybe_evict_rescans_periodically(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, 'EVICT_SCAN_EVERY', 2)
+    cache = DiskCache('test', directory=str(tmp_path))
+    cache.directory.mkdir()
+    cache.maybe_evict()
+    # Written by another process, unseen by the running total
+    (cache.directory / 'other.bin').write_bytes(b'x' * 100)
+    cache.max_bytes = 115
+    _write_entry(cache, 'a', 10, 1_000)
+    cache.maybe_evict()
+    assert (cache.directory / 'a.bin').exists()
+    _write_entry(cache, 'b', 10, 2_000)
+    cache.maybe_evict()
+    assert not (cache.directory / 'a.bin').exists()
+
+
+def test_clear(tmp_path):
+    cache = DiskCache('test', directory=str(tmp_path))
+    path = cache.write('k', '.npy', lambda f: f.write(b'data'))
+    cache.clear()
+    assert not path.exists()
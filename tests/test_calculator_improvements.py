@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
-from simpyson.calculator import SimpCalc
+from simpyson.calculator import SimpCalc, _canonical_input, _scratch_root
+from simpyson.utils import parse_spinsys
 
 
 def test_validation_spinsys():
@@ -43,3 +51,232 @@ def test_dry_run():
     cmd = calc.run(dry_run=True)
     assert isinstance(cmd, str)
     assert "simpson" in cmd
+
+
+@pytest.mark.parametrize("out_format", ["fid", "spe"])
+def test_binary_output(out_format):
+    """Test out_binary adds SIMPSON's -binary flag to fsave."""
+    calc = SimpCalc(
+        spinsys="spinsys { channels 1H }",
+        np=1024,
+        out_format=out_format,
+        out_binary=True,
+    )
+    assert f".{out_format} -binary" in calc.generate_main()
+
+
+def test_binary_output_xreim_raises():
+    """Test out_binary is rejected for xreim output."""
+    calc = SimpCalc(spinsys="spinsys { channels 1H }", out_format="xreim", out_binary=True)
+    with pytest.raises(ValueError, match="Binary output"):
+        calc.generate_main()
+
+
+def _runnable_calc(**overrides):
+    params = {
+        'proton_frequency': 400e6, 'spin_rate': 10000, 'start_operator': 'Inx',
+        'detect_operator': 'Inp', 'np': 8, 'sw': 20000, 'method': 'direct',
+        'crystal_file': 'rep100', 'gamma_angles': 10, 'verbose': 0,
+    }
+    params.update(overrides)
+    return SimpCalc("channels 1H\nnuclei 1H\nshift 1 5p 0 0 0 0 0", pulse_sequence='no_pulse', **params)
+
+
+def test_run_isolated_scratch_dirs(fake_simpson, tmp_path, monkeypatch):
+    """Concurrent runs with the same out_name must not clash."""
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    monkeypatch.setenv("SIMPYSON_SCRATCH_DIR", str(scratch))
+    monkeypatch.chdir(tmp_path)
+
+    calcs = [_runnable_calc(spin_rate=rate, out_name="shared", variable_sleep=0.05) for rate in range(1, 9)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda c: c.run(simpson_path=fake_simpson), calcs))
+
+    assert [r.spe['real'][0] for r in results] == list(range(1, 9))
+    assert list(scratch.iterdir()) == []
+    assert not (tmp_path / "shared.spe").exists()
+
+
+def test_run_keep_files(fake_simpson, tmp_path):
+    """delete_files=False keeps the input at filepath and the output next to it."""
+    filepath = tmp_path / "job.in"
+    _runnable_calc().run(filepath=str(filepath), delete_files=False, simpson_path=fake_simpson)
+
+    assert filepath.exists()
+    assert (tmp_path / "job.spe").exists()
+
+
+def test_scratch_root_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("SIMPYSON_SCRATCH_DIR", str(tmp_path))
+    assert _scratch_root() == str(tmp_path)
+    monkeypatch.delenv("SIMPYSON_SCRATCH_DIR")
+    assert _scratch_root() in ("/dev/shm", tempfile.gettempdir())
+
+
+def test_run_result_cache(fake_simpson, tmp_path, monkeypatch):
+    """A repeated run with an equivalent input is served from the cache."""
+    first = _runnable_calc(spin_rate=2000).run(simpson_path=fake_simpson, cache=str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("SIMPSON should not run on a cache hit")
+
+    monkeypatch.setattr(subprocess, "run", fail)
+    # Same simulation written differently: float format and site order
+    calc = SimpCalc(
+        "channels 1H\nnuclei 1H\nshift 1 5.0p 0 0 0 0 0",
+        pulse_sequence='no_pulse',
+        proton_frequency=4e8, spin_rate=2e3, start_operator='Inx',
+        detect_operator='Inp', np=8, sw=2e4, method='direct',
+        crystal_file='rep100', gamma_angles=10, verbose=0,
+    )
+    second = calc.run(simpson_path=fake_simpson, cache=str(tmp_path))
+
+    np.testing.assert_array_equal(second.spe['real'], first.spe['real'])
+    assert second.b0 == first.b0
+    assert second.nucleus == first.nucleus
+
+
+def test_canonical_input_site_order():
+    a = "spinsys {\nnuclei 1H 1H\nshift 1 1p 0 0 0 0 0\ndipole 1 2 -3e4 0 0 0\n}"
+    b = "spinsys {\nnuclei 1H 1H\ndipole 2 1 -30000.0 0 0 0\nshift  1 1.0p 0 0 0 0 0\n}"
+    assert _canonical_input(a) == _canonical_input(b)
+    assert _canonical_input(a) != _canonical_input(a.replace("1p", "2p"))
+
+
+def test_canonical_input_keeps_full_precision():
+    a = "shift 1 1000 0 0 0 0 0"
+    assert _canonical_input(a) == _canonical_input("shift 1 1e3 0 0 0 0 0")
+    assert _canonical_input(a) == _canonical_input("shift 1 1000.0 0 0 0 0 0")
+    assert _canonical_input(a) != _canonical_input("shift 1 1000.0000000001 0 0 0 0 0")
+
+
+def test_run_result_cache_keyed_on_binary(fake_simpson, tmp_path):
+    """A different SIMPSON executable misses the cache."""
+    cache_dir = tmp_path / "cache"
+    _runnable_calc().run(simpson_path=fake_simpson, cache=str(cache_dir))
+    other = tmp_path / "other_simpson"
+    shutil.copy(fake_simpson, other)
+    with other.open("a") as f:
+        f.write("# another build\n")
+    _runnable_calc().run(simpson_path=str(other), cache=str(cache_dir))
+
+    assert len(list((cache_dir / "results").iterdir())) == 2
+
+
+@pytest.mark.parametrize("out_format", ["spe", "fid"])
+def test_run_shards_matches_unsharded(fake_simpson, tmp_path, out_format):
+    """Sharded orientation averaging reproduces the full powder average."""
+    rng = np.random.default_rng(3)
+    orientations = np.column_stack([rng.uniform(0, 360, 11), rng.uniform(0, 180, 11), rng.uniform(0.5, 1, 11)])
+    orientations[:, 2] /= orientations[:, 2].sum()
+    crystal = tmp_path / "powder.cry"
+    crystal.write_text(f"{len(orientations)}\n" + "\n".join(" ".join(map(str, row.tolist())) for row in orientations))
+
+    calc = _runnable_calc(crystal_file=str(tmp_path / "powder"), out_format=out_format)
+    full = calc.run(simpson_path=fake_simpson)
+    sharded = calc.run(simpson_path=fake_simpson, shards=4)
+
+    domain = getattr(sharded, out_format)
+    np.testing.assert_allclose(domain['real'], getattr(full, out_format)['real'])
+    assert sharded.b0 == full.b0
+    assert sharded.nucleus == full.nucleus
+
+
+def test_run_shards_builtin_crystal_falls_back(fake_simpson, caplog):
+    with caplog.at_level("WARNING", logger="simpyson"):
+        result = _runnable_calc().run(simpson_path=fake_simpson, shards=2)
+    assert "Crystal file 'rep100' not found" in caplog.text
+    assert "Running without shards" in caplog.text
+    np.testing.assert_allclose(
+        result.spe['real'], _runnable_calc().run(simpson_path=fake_simpson).spe['real']
+    )
+    with pytest.raises(ValueError, match="shards cannot be combined"):
+        _runnable_calc().run(simpson_path=fake_simpson, shards=2, cache=True)
+    with pytest.raises(ValueError, match="delete_files=False"):
+        _runnable_calc().run(simpson_path=fake_simpson, shards=2, delete_files=False)
+
+
+THREE_SPINS = "channels 1H\nnuclei 1H 1H 1H\nshift 1 5p 0 0 0 0 0\nshift 3 1p 0 0 0 0 0\ndipole 1 2 -3e4 0 0 0"
+
+
+def test_decompose_weights():
+    calc = SimpCalc(THREE_SPINS, pulse_sequence='no_pulse', start_operator='Inx', detect_operator='Inp')
+    parts = calc.decompose()
+
+    assert [part.generate_spinsys().count('1H') for part, _ in parts] == [3, 2]
+    assert "dipole 1 2" in parts[0][0].generate_spinsys()
+    assert "shift 1 1p" in parts[1][0].generate_spinsys()
+    # Each part is weighted by the dimension of the spins it leaves out
+    assert [weight for _, weight in parts] == [2.0, 4.0]
+
+    site_indexed = SimpCalc(THREE_SPINS, pulse_sequence='no_pulse', start_operator='I1x', detect_operator='Inp')
+    assert site_indexed.decompose() == [(site_indexed, 1.0)]
+
+
+def test_decompose_keeps_channels():
+    spinsys = "channels 13C 1H\nnuclei 13C 1H 13C 1H\ndipole 1 2 -2e4 0 0 0\ndipole 3 4 -2e4 0 0 0"
+    calc = SimpCalc(spinsys, pulse_sequence='cp_mas', start_operator='Inx', detect_operator='Inp')
+    calc.generate_pulseq()  # fills the CPMAS turnoff list from the full system
+    parts = calc.decompose()
+
+    assert len(parts) == 2
+    for part, _ in parts:
+        assert "channels 13C 1H" in part.generate_spinsys()
+        assert "turnoff dipole_1_2\n" in part.generate_pulseq()
+
+    # A lone 1H has no 13C, so it is merged instead of becoming its own part
+    lone = SimpCalc(spinsys + "\nnuclei 13C 1H 13C 1H 1H", start_operator='Inx', detect_operator='Inp')
+    assert sorted(len(parse_spinsys(p.generate_spinsys())['nuclei']) for p, _ in lone.decompose()) == [2, 3]
+
+
+def test_run_decompose_matches_full(fake_simpson):
+    calc = _runnable_calc(spin_rate=1000)
+    calc.spinsys = THREE_SPINS
+    full = calc.run(simpson_path=fake_simpson)
+    split = calc.run(simpson_path=fake_simpson, decompose=True)
+
+    np.testing.assert_allclose(split.spe['real'], full.spe['real'])
+    assert split.nucleus == full.nucleus
+    with pytest.raises(ValueError, match="decompose cannot be combined"):
+        calc.run(simpson_path=fake_simpson, decompose=True, read_output=False)
+
+
+def test_arun_decompose_matches_full(fake_simpson):
+    calc = _runnable_calc(spin_rate=1000)
+    calc.spinsys = THREE_SPINS
+    full = calc.run(simpson_path=fake_simpson)
+    split = asyncio.run(calc.arun(simpson_path=fake_simpson, decompose=True))
+
+    np.testing.assert_allclose(split.spe['real'], full.spe['real'])
+    with pytest.raises(ValueError, match="decompose cannot be combined"):
+        asyncio.run(calc.arun(simpson_path=fake_simpson, decompose=True, read_output=False))
+
+
+NETWORK = (
+    "channels 13C 1H\nnuclei 1H 13C 1H 1H\nshift 2 10p 0 0 0 0 0\n"
+    "dipole 1 2 -6e4 0 0 0\ndipole 2 3 -6e3 0 0 0\ndipole 2 4 -6e2 0 0 0\ndipole 1 4 -6e2 0 0 0"
+)
+
+
+def test_prune_renumbers_operators_and_turnoff():
+    calc = SimpCalc(NETWORK, pulse_sequence='cp_mas', start_operator='I3x', detect_operator='I2p')
+    calc.generate_pulseq()  # fills the CPMAS turnoff list from the full system
+    pruned, dropped = calc.prune(max_spins=2)
+
+    # 1H 3 is named by the start operator, so the stronger 1H 1 goes instead
+    assert parse_spinsys(pruned.generate_spinsys())['nuclei'] == ['13C', '1H']
+    assert (pruned.parameters['start_operator'], pruned.parameters['detect_operator']) == ('I2x', 'I1p')
+    assert "turnoff dipole_1_2\n" in pruned.generate_pulseq()
+    assert [(kind, sites) for kind, sites, _ in dropped] == [
+        ('dipole', (2, 4)), ('dipole', (1, 4)), ('dipole', (1, 2)),
+    ]
+    assert "nuclei 1H 13C 1H 1H" in calc.generate_spinsys()
+
+
+def test_run_warns_for_large_spin_systems(fake_simpson, caplog):
+    calc = _runnable_calc()
+    calc.spinsys = "channels 1H\nnuclei " + " ".join(["1H"] * 11) + "\nshift 1 5p 0 0 0 0 0"
+    with caplog.at_level("WARNING", logger="simpyson"):
+        calc.run(simpson_path=fake_simpson)
+    assert "dimension 2048" in caplog.text
@@ -0,0 +1,249 @@
+"""Tests for simpyson.engines — in-process lineshape engines."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ase.io import read
+from soprano.calculate.nmr.simpson import write_spinsys
+
+from simpyson.calculator import (
+    _simulation_calc,
+    _weighted_sum,
+    simulate_clusters,
+    simulate_spectrum,
+)
+from simpyson.converter import ppm2hz
+from simpyson.engines import (
+    MAGIC_ANGLE,
+    _csa_frequency,
+    _euler_matrix,
+    _frequencies,
+    _hemisphere,
+    _mas_sidebands,
+    _perpendicular_basis,
+    _sites,
+    select_engine,
+    simulate_analytic,
+)
+from simpyson.io import read_simp
+from simpyson.utils import get_larmor_freq
+
+WRITE_DIR = Path(__file__).parent.parent / 'examples' / 'write'
+
+B0 = '800.0MHz'
+CSA_13C = "channels 13C\nnuclei 13C\nshift 1 100p 60p 0 0 0 0"
+QUAD_27AL = (
+    "channels 27Al\nnuclei 27Al 27Al\n"
+    "shift 1 10p 20p 0.3 30 60 90\nshift 2 60p 0 0 0 0 0\n"
+    "quadrupole 1 2 4e6 0.4 10 20 30\nquadrupole 2 2 2e6 0 0 0 0"
+)
+
+
+@pytest.fixture(autouse=True)
+def _no_simpson(monkeypatch):
+    """The engines must never need the SIMPSON executable."""
+    monkeypatch.setenv("PATH", "")
+
+
+def test_static_csa_axial_lineshape():
+    spectrum = simulate_spectrum(CSA_13C, spin_rate=0, lb=50, sw=80000, variable_offset=ppm2hz(100, B0, '13C'),
+                                 variable_ref=-ppm2hz(100, B0, '13C'))
+    ppm = np.asarray(spectrum.ppm['ppm'])
+    real = spectrum.spe['real']
+    # eta = 0: singularity at iso - aniso/2, edge at iso + aniso
+    assert ppm[np.argmax(real)] == pytest.approx(70, abs=0.5)
+    inside = ppm[real > 0.02 * real.max()]
+    assert inside.min() == pytest.approx(70, abs=2)
+    assert inside.max() == pytest.approx(160, abs=2)
+
+
+def test_static_csa_matches_time_domain_sum():
+    calc = _simulation_calc(CSA_13C, spin_rate=0, lb=50, out_format='fid')
+    result = simulate_analytic(calc, orientations=500)
+
+    sw = calc.parameters['sw']
+    offset = calc.parameters['variable_offset']
+    freqs = _csa_frequency(_hemisphere(500), ppm2hz(100, B0, '13C'), ppm2hz(60, B0, '13C'), 0.0)
+    t = np.arange(calc.parameters['np']) / sw
+    expected = 0.5 * np.exp(2j * np.pi * np.outer(t, freqs - offset)).mean(axis=1) * np.exp(-np.pi * 50 * t)
+
+    np.testing.assert_allclose(result.fid.data, expected, atol=1e-5)
+
+
+def test_site_intensities_add_up():
+    spinsys = "channels 13C\nnuclei 13C 13C\nshift 1 100p 60p 0.5 0 0 0\nshift 2 20p 0 0 0 0 0"
+    result = simulate_spectrum(spinsys, spin_rate=0, out_format='fid')
+    # Tr(Ix Ip) = 1/2 per site, times the dimension of the other spin
+    assert result.fid['real'][0] == pytest.approx(2 * 0.5 * 2)
+
+
+def test_mas_sideband_moments():
+    site = {'iso': 1000.0, 'aniso': 12000.0, 'eta': 0.4}
+    freqs, weights = _mas_sidebands([site], 5000.0, 2000)
+
+    assert weights.sum() == pytest.approx(1.0)
+    assert np.sum(weights * freqs) == pytest.approx(1000.0)
+    # The second moment of the sidebands equals that of the static powder pattern
+    static_m2 = 12000.0**2 * (1 + 0.4**2 / 3) / 5
+    assert np.sum(weights * (freqs - 1000.0) ** 2) == pytest.approx(static_m2, rel=1e-3)
+    # Sidebands sit at iso + N * spin_rate
+    np.testing.assert_allclose(np.mod(freqs[weights > 1e-6] - 1000.0 + 2500.0, 5000.0), 2500.0, atol=1e-6)
+
+
+def test_mas_sidebands_match_gamma_averaged_propagation():
+    site = {'iso': 1000.0, 'aniso': 12000.0, 'eta': 0.4}
+    spin_rate = 5000.0
+    freqs, weights = _mas_sidebands([site], spin_rate, 1)
+    t = np.arange(64) / 40000
+    fid = np.exp(2j * np.pi * np.outer(t, freqs)) @ weights
+
+    # Integrate the rotor-modulated frequency and average over start phases
+    u = _hemisphere(1)
+    e1, e2 = _perpendicular_basis(u)
+    steps = 4096
+    phi = 2 * np.pi * np.arange(10 * steps) / steps
+    b = (np.cos(MAGIC_ANGLE) * u + np.sin(MAGIC_ANGLE) * (np.cos(phi)[:, None] * e1 + np.sin(phi)[:, None] * e2))
+    nu = _csa_frequency(b, site['iso'], site['aniso'], site['eta'])
+    phase = 2 * np.pi * np.concatenate(([0], np.cumsum((nu[1:] + nu[:-1]) / 2))) / (steps * spin_rate)
+    starts = np.arange(0, steps, 16)
+    idx = starts[:, None] + np.round(t * steps * spin_rate).astype(int)
+    expected = np.exp(1j * (phase[idx] - phase[starts, None])).mean(axis=0)
+
+    np.testing.assert_allclose(fid, expected, atol=1e-5)
+
+
+def test_fast_mas_gives_isotropic_peak():
+    spectrum = simulate_spectrum(CSA_13C, spin_rate=1e6, lb=50, sw=80000, variable_offset=ppm2hz(100, B0, '13C'),
+                                 variable_ref=-ppm2hz(100, B0, '13C'))
+    ppm = np.asarray(spectrum.ppm['ppm'])
+    assert ppm[np.argmax(spectrum.spe['real'])] == pytest.approx(100, abs=0.5)
+    assert select_engine(_simulation_calc(CSA_13C, spin_rate=10e3)) == 'csa'
+
+
+def _spin_operators(spin):
+    m = np.arange(spin, -spin - 1, -1)
+    raising = np.diag(np.sqrt(spin * (spin + 1) - m[1:] * (m[1:] + 1)), 1)
+    return (raising + raising.T) / 2, (raising - raising.T) / 2j, np.diag(m)
+
+
+def test_quadrupolar_ct_frequency_matches_exact_diagonalization():
+    spin, larmor, cq, eta_q = 2.5, get_larmor_freq(B0, '27Al') * 1e6, 4e6, 0.4
+    scale = (cq / (2 * spin * (2 * spin - 1))) ** 2 * (spin * (spin + 1) - 0.75) / larmor
+    site = {'quad': scale, 'eta_q': eta_q, 'euler_q': (10.0, 20.0, 30.0)}
+    ops = _spin_operators(spin)
+
+    # EFG tensor in the crystal frame, normalised to Vzz = 1 in its PAS
+    rotation = _euler_matrix(site['euler_q'])
+    efg = rotation.T @ np.diag([-(1 + eta_q) / 2, -(1 - eta_q) / 2, 1.0]) @ rotation
+    for b in _hemisphere(5):
+        # Lab frame with z along the field
+        e1 = np.cross(b, [1.0, 0.0, 0.0])
+        e1 /= np.linalg.norm(e1)
+        lab = np.array([e1, np.cross(b, e1), b])
+        v = lab @ efg @ lab.T
+        hamiltonian = larmor * ops[2] + cq / (2 * spin * (2 * spin - 1)) * sum(
+            v[i, j] * ops[i] @ ops[j] for i in range(3) for j in range(3)
+        )
+        levels = np.linalg.eigvalsh(hamiltonian)
+        exact = levels[3] - levels[2] - larmor
+        assert _frequencies(b, [site])[0] == pytest.approx(exact, rel=1e-4)
+
+
+def test_quadrupolar_isotropic_shift():
+    calc = _simulation_calc(QUAD_27AL, spin_rate=20e3)
+    assert select_engine(calc) == 'quadrupolar'
+    assert select_engine(_simulation_calc(QUAD_27AL, spin_rate=20e3, detect_operator='Inp')) is None
+
+    larmor = get_larmor_freq(B0, '27Al') * 1e6
+    expected = []
+    for iso, cq, eta_q in ((10, 4e6, 0.4), (60, 2e6, 0.0)):
+        scale = (cq / 20) ** 2 * 8 / larmor
+        expected.append(ppm2hz(iso, B0, '27Al') - scale * (3 + eta_q ** 2) / 10)
+
+    # The powder average of the static and MAS frequencies is the isotropic shift
+    sites = _sites(calc, B0)
+    for freqs, weights in (
+        (_frequencies(_hemisphere(20000), sites), np.full((2, 20000), 1 / 20000)),
+        tuple(x.reshape(2, -1) for x in _mas_sidebands(sites, 20e3, 2000)),
+    ):
+        np.testing.assert_allclose(np.sum(freqs * weights, axis=1), expected, rtol=1e-4)
+
+
+def test_quadrupolar_engine_end_to_end():
+    fid = simulate_spectrum(QUAD_27AL, spin_rate=20e3, out_format='fid')
+    # SIMPSON scaling: Tr(Ix Inc) = (I + 1/2)^2 / 2 per site, times the other spin's dimension
+    assert fid.fid['real'][0] == pytest.approx(2 * 4.5 * 6)
+    static = simulate_spectrum(QUAD_27AL, spin_rate=0, engine='quadrupolar')
+    assert static.spe['np'] == 4096
+
+
+@pytest.mark.parametrize(("spinsys", "params"), [
+    ("channels 13C\nnuclei 13C 13C\nshift 1 10p 0 0 0 0 0\ndipole 1 2 -1000 0 0 0", {'spin_rate': 0}),
+    ("channels 13C 1H\nnuclei 13C 1H\nshift 1 10p 0 0 0 0 0", {'spin_rate': 0}),
+    ("channels 13C\nnuclei 13C\nshift 1 10p 0 0 0 0 0", {'spin_rate': 0, 'pulse_sequence': 'pulse_90'}),
+    ("channels 13C\nnuclei 13C\nshift 1 10p 0 0 0 0 0", {'spin_rate': 0, 'out_format': 'xreim'}),
+])
+def test_select_engine_falls_back_to_simpson(spinsys, params):
+    assert select_engine(_simulation_calc(spinsys, **params)) is None
+
+
+def test_auto_engine_logs_switch(caplog):
+    with caplog.at_level("INFO", logger="simpyson"):
+        simulate_spectrum(CSA_13C, spin_rate=0)
+    assert "Using the 'csa' engine instead of SIMPSON" in caplog.text
+    assert caplog.records[-1].levelname == "INFO"
+
+    caplog.clear()
+    with caplog.at_level("INFO", logger="simpyson"):
+        simulate_spectrum(CSA_13C, spin_rate=0, crystal_file='zcw232')
+    assert "does not use crystal_file" in caplog.text
+    assert caplog.records[-1].levelname == "WARNING"
+
+
+def test_engine_argument():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        simulate_spectrum(CSA_13C, spin_rate=0, engine='magic')
+    with pytest.raises(FileNotFoundError):
+        simulate_spectrum(CSA_13C, spin_rate=0, engine='simpson')
+
+
+# ---------------------------------------------------------------------------
+# Weighting checked against recorded SIMPSON output
+# ---------------------------------------------------------------------------
+
+def test_decompose_weights_match_recorded_simpson():
+    # ethanol_sim.spe: SIMPSON run of six uncoupled 1H sites (ethanol_sim.in)
+    text = (WRITE_DIR / 'ethanol_sim.in').read_text()
+    spinsys = text[text.index('spinsys {') + len('spinsys {'):text.index('}')]
+    calc = _simulation_calc(spinsys, proton_frequency=400e6, spin_rate=40e3, crystal_file='rep256',
+                            gamma_angles=6, np=2048, sw=10000.0, lb=10, zerofill=4096, variable_offset=0.0)
+    parts = calc.decompose()
+    assert [weight for _, weight in parts] == [32.0] * 6
+
+    total = _weighted_sum([simulate_analytic(part, 'csa') for part, _ in parts],
+                          [weight for _, weight in parts], 'spe')
+    simpson = read_simp(str(WRITE_DIR / 'ethanol_sim.spe'), format='spe')
+    # The integral fixes the weights; the lineshape differs only by the powder grid
+    assert total.spe['real'].sum() == pytest.approx(simpson.spe['real'].sum(), rel=1e-4)
+    assert total.spe['real'].max() == pytest.approx(simpson.spe['real'].max(), rel=0.01)
+    assert np.abs(total.spe['real'] - simpson.spe['real']).max() < 0.1 * simpson.spe['real'].max()
+
+
+def test_cluster_multiplicities_match_recorded_simpson():
+    # castep_sim_p.spe: SIMPSON run of all eight 31P sites of AlPO-14 together
+    atoms = read(WRITE_DIR / 'AlPO-14.magres')
+    p_idx = [atom.index for atom in atoms if atom.symbol == 'P']
+    total = simulate_clusters(
+        atoms, p_idx, lambda c: write_spinsys(c, use_ms=True, grad={'P': -1}, ref={'P': 283.839}),
+        n_neighbours=0, spin_rate=40e3, np=2048, proton_frequency=800e6, sw=30e3, lb=200,
+        zerofill=4096, variable_offset=0.0, variable_ref=0.0,
+    )
+    simpson = read_simp(str(WRITE_DIR / 'castep_sim_p.spe'), format='spe')
+    # simulate_clusters normalizes to one spin per site; SIMPSON's Tr(rho D)
+    # over eight spin-1/2 sites carries a factor 2**7 on every site
+    expected = simpson.spe['real'] / 2 ** (len(p_idx) - 1)
+    assert total.spe['real'].sum() == pytest.approx(expected.sum(), rel=1e-4)
+    assert total.spe['real'].max() == pytest.approx(expected.max(), rel=0.01)
+    assert np.abs(total.spe['real'] - expected).max() < 0.05 * expected.max()
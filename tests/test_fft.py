@@ -0,0 +1,61 @@
+"""Tests for simpyson.fft — the pluggable FFT backend."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from simpyson import fft
+from simpyson.simpy import Simpy
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    backend, workers = fft._config['backend'], fft._config['workers']
+    yield
+    fft.set_fft_backend(backend, workers)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "scipy"])
+def test_backends_match_numpy(backend, monkeypatch):
+    if backend == 'scipy':
+        pytest.importorskip("scipy")
+    signal = np.random.default_rng(0).standard_normal((3, 64)) + 0j
+    expected = np.fft.fftshift(np.fft.fft(signal), axes=-1)
+
+    module = np.fft if backend == 'numpy' else fft._scipy_fft
+    calls = []
+    original = module.fft
+
+    def spy(*args, **kwargs):
+        calls.append(kwargs)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, 'fft', spy)
+    fft.set_fft_backend(backend, workers=2)
+    np.testing.assert_allclose(fft.fid_to_spectrum(signal), expected)
+    assert len(calls) == 1
+    if backend == 'scipy':
+        assert calls[0]['workers'] == 2
+    np.testing.assert_allclose(fft.spectrum_to_fid(fft.fid_to_spectrum(signal)), signal)
+
+
+def test_auto_resolves_to_installed_backend(monkeypatch):
+    pytest.importorskip("scipy")
+    fft.set_fft_backend('auto', workers=4)
+    assert fft.get_fft_backend() == ('scipy', 4)
+    monkeypatch.setattr(fft, '_scipy_fft', None)
+    assert fft.get_fft_backend() == ('numpy', 4)
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError, match="Unknown FFT backend"):
+        fft.set_fft_backend('fftpack')
+
+
+def test_simpy_conversion_uses_backend():
+    pytest.importorskip("scipy")
+    fft.set_fft_backend('numpy')
+    s = Simpy().from_fid(np.ones(16), np.zeros(16), 16, 100.0)
+    fft.set_fft_backend('scipy')
+    s2 = Simpy().from_fid(np.ones(16), np.zeros(16), 16, 100.0)
+    np.testing.assert_allclose(s.spe['real'], s2.spe['real'])
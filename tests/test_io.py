@@ -1,15 +1,55 @@
 """Tests for simpyson.io — reading and writing SIMPSON files."""
 from __future__ import annotations
 
+import math
 import os
+from pathlib import Path
 
 import numpy as np
 import pytest
 
-from simpyson.io import read_fid, read_simp, read_spe, read_xreim
-from simpyson.simpy import Simpy
+from simpyson.io import (
+    iter_xreim,
+    read_fid,
+    read_simp,
+    read_simp_many,
+    read_spe,
+    read_xreim,
+)
+from simpyson.simpy import LinearAxis, Simpy
 
 EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', 'examples', 'read')
+SPLIT_DIR = os.path.join(
+    os.path.dirname(__file__), '..', 'examples', 'write', 'split_simulation_al'
+)
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def _encode_simp_binary(values):
+    """Encode floats the way SIMPSON's ``fsave -binary`` does."""
+    data = bytearray()
+    for value in values:
+        m, e = math.frexp(abs(value))
+        mantissa = int(m * (1 << 23)) & 0x7FFFFF
+        exponent = (e + 0x7F) & 0xFF
+        sign = 0x80 if value < 0 else 0
+        data += bytes([
+            mantissa & 0xFF,
+            (mantissa >> 8) & 0xFF,
+            ((mantissa >> 16) & 0x7F) | ((exponent & 1) << 7),
+            sign | (exponent >> 1),
+        ])
+    data += bytes(-len(data) % 3)
+    chars = []
+    for i in range(0, len(data), 3):
+        b0, b1, b2 = data[i:i + 3]
+        chars += [
+            b0 & 0x3F,
+            ((b0 >> 2) & 0x30) | (b1 & 0x0F),
+            ((b1 >> 2) & 0x3C) | (b2 & 0x03),
+            (b2 >> 2) & 0x3F,
+        ]
+    return ''.join(chr(c + 33) for c in chars)
 
 
 # ---------------------------------------------------------------------------
@@ -49,6 +89,114 @@ class TestReadSimp:
             read_simp("nonexistent_file.spe")
 
 
+# ---------------------------------------------------------------------------
+# read_simp_many
+# ---------------------------------------------------------------------------
+
+class TestReadSimpMany:
+    def test_glob_returns_sorted_list(self):
+        pattern = os.path.join(SPLIT_DIR, 'castep_sim_al_*.spe')
+        results = read_simp_many(pattern, workers=4)
+        assert len(results) == 8
+        expected = read_simp(os.path.join(SPLIT_DIR, 'castep_sim_al_0.spe'))
+        np.testing.assert_array_equal(results[0].spe['real'], expected.spe['real'])
+
+    def test_stack_shares_axis(self):
+        paths = [os.path.join(SPLIT_DIR, f'vasp_sim_al_{i}.spe') for i in range(3)]
+        stacked = read_simp_many(paths, stack=True)
+        assert stacked.real.shape == (3, len(stacked.axis))
+        assert stacked.labels == paths
+
+    def test_stack_mismatched_np_raises(self, tmp_path):
+        for name, npoints in (('a.spe', 2), ('b.spe', 4)):
+            Simpy().from_spe(np.ones(npoints), np.zeros(npoints), npoints, 100.0).write(
+                str(tmp_path / name), format='spe'
+            )
+        with pytest.raises(ValueError, match="Cannot stack"):
+            read_simp_many(str(tmp_path / '*.spe'), stack=True)
+
+    def test_no_match_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="No files found"):
+            read_simp_many(str(tmp_path / '*.spe'))
+
+
+# ---------------------------------------------------------------------------
+# Parse cache
+# ---------------------------------------------------------------------------
+
+class TestReadSimpCache:
+    def test_cache_hit_skips_parsing(self, tmp_path, monkeypatch):
+        path = os.path.join(EXAMPLES_DIR, 'ethanol.spe')
+        first = read_simp(path, cache=str(tmp_path))
+        assert list((tmp_path / 'parse').glob('*.npy'))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parser called on cache hit")
+
+        monkeypatch.setattr('simpyson.io.read_spe', fail)
+        second = read_simp(path, b0="400MHz", nucleus="1H", cache=str(tmp_path))
+        np.testing.assert_array_equal(second.spe['real'], first.spe['real'])
+        np.testing.assert_array_equal(second.spe['hz'], first.spe['hz'])
+        assert second.spe['np'] == 4096
+        assert second.ppm is not None
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        spe_file = tmp_path / "data.spe"
+        Simpy().from_spe([1.0, 2.0], [0.0, 0.0], 2, 100.0).write(str(spe_file), format='spe')
+        read_simp(str(spe_file), cache=str(tmp_path / 'cache'))
+
+        Simpy().from_spe([5.0, 6.0, 7.0], [0.0, 0.0, 0.0], 3, 100.0).write(
+            str(spe_file), format='spe'
+        )
+        os.utime(spe_file, ns=(0, 10**18))
+        data = read_simp(str(spe_file), cache=str(tmp_path / 'cache'))
+        np.testing.assert_array_equal(data.spe['real'], [5.0, 6.0, 7.0])
+
+    def test_fid_cache_roundtrip(self, tmp_path):
+        path = os.path.join(EXAMPLES_DIR, 'ethanol.fid')
+        first = read_simp(path, cache=str(tmp_path))
+        second = read_simp(path, cache=str(tmp_path))
+        np.testing.assert_array_equal(second.fid['imag'], first.fid['imag'])
+        np.testing.assert_array_equal(second.fid['time'], first.fid['time'])
+
+    def test_cache_hit_keeps_memory_map(self, tmp_path):
+        path = os.path.join(EXAMPLES_DIR, 'ethanol.spe')
+        first = read_simp(path, cache=str(tmp_path))
+        second = read_simp(path, b0='400MHz', nucleus='13C', cache=str(tmp_path))
+        data = base = second.spe.data
+        while base.base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+        assert not second.spe.data.flags.writeable
+        second.spe['real']
+        assert second.ppm is not None
+        assert second.spe.data is data
+
+        second.spe.make_writable()[0] = 1e9
+        assert second.spe.data.flags.writeable
+        assert first.spe['real'][0] != 1e9
+        third = read_simp(path, cache=str(tmp_path))
+        np.testing.assert_array_equal(third.spe['real'], first.spe['real'])
+
+    def test_cache_stores_only_the_signal(self, tmp_path):
+        path = os.path.join(EXAMPLES_DIR, 'ethanol.spe')
+        read_simp(path, cache=str(tmp_path))
+        (npy,) = (tmp_path / 'parse').glob('*.npy')
+        stored = np.load(npy)
+        assert stored.shape == (4096,)
+        assert stored.dtype == np.complex128
+        second = read_simp(path, cache=str(tmp_path))
+        assert isinstance(second.spe.axis('hz'), LinearAxis)
+
+    def test_explicit_axis_roundtrip(self, tmp_path, xreim_file):
+        path, rows = xreim_file
+        read_simp(path, cache=str(tmp_path / 'cache'))
+        assert list((tmp_path / 'cache' / 'parse').glob('*.axis.npy'))
+        data = read_simp(path, cache=str(tmp_path / 'cache'))
+        np.testing.assert_allclose(data.xreim['time'], rows[:, 0])
+        np.testing.assert_allclose(data.xreim['real'], rows[:, 1])
+
+
 # ---------------------------------------------------------------------------
 # read_spe
 # ---------------------------------------------------------------------------
@@ -79,6 +227,62 @@ class TestReadSpe:
         with pytest.raises(ValueError, match="Missing required header"):
             read_spe(str(bad_file), data)
 
+    def test_row_count_mismatch_raises(self, tmp_path):
+        bad_file = tmp_path / "short.spe"
+        bad_file.write_text("SIMP\nNP=4\nSW=100\nDATA\n1.0 2.0\n3.0 4.0\nEND")
+        data = Simpy()
+        with pytest.raises(ValueError, match="expected NP=4"):
+            read_spe(str(bad_file), data)
+
+    def test_ragged_rows_raise(self, tmp_path):
+        # 1 + 3 values add up to NP=2 rows but are not two columns
+        bad_file = tmp_path / "ragged.spe"
+        bad_file.write_text("SIMP\nNP=2\nSW=100\nDATA\n1.0\n2.0 3.0 4.0\nEND")
+        data = Simpy()
+        with pytest.raises(ValueError, match="Expected 2 columns"):
+            read_spe(str(bad_file), data)
+
+    def test_binary_format(self, tmp_path):
+        real = np.array([1.5, -2.25, 0.0, 1e-3])
+        imag = np.array([-7.0, 3.0e4, 0.125, -1e-6])
+        interleaved = np.column_stack((real, imag)).ravel()
+        encoded = _encode_simp_binary(interleaved)
+        lines = [encoded[i:i + 64] for i in range(0, len(encoded), 64)]
+        spe_file = tmp_path / "binary.spe"
+        spe_file.write_text(
+            "SIMP\nNP=4\nSW=100\nTYPE=SPE\nFORMAT=BINARY\nDATA\n"
+            + "\n".join(lines) + "\nEND\n"
+        )
+        data = Simpy()
+        read_spe(str(spe_file), data)
+        np.testing.assert_allclose(data.spe['real'], real, rtol=1e-6)
+        np.testing.assert_allclose(data.spe['imag'], imag, rtol=1e-6)
+
+    def test_binary_file_matches_text(self):
+        # ethanol_sim.spe in the FORMAT=BINARY encoding; the fixture decodes
+        # identically with nmrglue's independent SIMPSON reader.
+        binary = read_simp(os.path.join(DATA_DIR, 'ethanol_sim_binary.spe'), format='spe')
+        text = read_simp(
+            os.path.join(os.path.dirname(__file__), '..', 'examples', 'write', 'ethanol_sim.spe'),
+            format='spe',
+        )
+        assert binary.spe['np'] == text.spe['np'] == 4096
+        np.testing.assert_allclose(binary.spe['hz'], text.spe['hz'])
+        np.testing.assert_allclose(binary.spe['real'], text.spe['real'], rtol=3e-7, atol=1e-12)
+        np.testing.assert_allclose(binary.spe['imag'], text.spe['imag'], rtol=3e-7, atol=1e-12)
+
+    def test_ref_shifts_hz_axis(self, tmp_path):
+        spe_file = tmp_path / "ref.spe"
+        spe_file.write_text(
+            "SIMP\nNP=4\nSW=100\nREF=10\nTYPE=SPE\nDATA\n"
+            "1 -1\n2 -2\n3 -3\n4 -4\nEND"
+        )
+        data = Simpy()
+        read_spe(str(spe_file), data)
+        np.testing.assert_allclose(data.spe['hz'], [-60.0, -35.0, -10.0, 15.0])
+        np.testing.assert_allclose(data.spe['real'], [1, 2, 3, 4])
+        np.testing.assert_allclose(data.spe['imag'], [-1, -2, -3, -4])
+
 
 # ---------------------------------------------------------------------------
 # read_fid
@@ -108,6 +312,53 @@ class TestReadFid:
         assert fid['time'][-1] == pytest.approx(expected_max_ms, rel=0.01)
 
 
+# ---------------------------------------------------------------------------
+# read_xreim / iter_xreim
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def xreim_file(tmp_path):
+    rows = np.column_stack((np.arange(10) * 0.1, np.arange(10.0), -np.arange(10.0)))
+    path = tmp_path / "trace.xreim"
+    np.savetxt(path, rows)
+    return str(path), rows
+
+
+class TestReadXreim:
+    def test_iter_chunks(self, xreim_file):
+        path, rows = xreim_file
+        blocks = list(iter_xreim(path, chunk_size=4))
+        assert [len(t) for t, _, _ in blocks] == [4, 4, 2]
+        np.testing.assert_allclose(np.concatenate([re for _, re, _ in blocks]), rows[:, 1])
+
+    def test_read_matches_rows(self, xreim_file):
+        path, rows = xreim_file
+        data = Simpy()
+        read_xreim(path, data, chunk_size=3)
+        np.testing.assert_allclose(data.xreim['time'], rows[:, 0])
+        np.testing.assert_allclose(data.xreim['real'], rows[:, 1])
+        np.testing.assert_allclose(data.xreim['imag'], rows[:, 2])
+
+    def test_bad_columns_raise(self, tmp_path):
+        path = tmp_path / "bad.xreim"
+        path.write_text("0 1\n2 3\n")
+        with pytest.raises(ValueError, match="3 columns"):
+            list(iter_xreim(str(path)))
+
+    def test_ragged_rows_raise(self, tmp_path):
+        path = tmp_path / "ragged.xreim"
+        path.write_text("0 1\n2 3 4 5\n")
+        with pytest.raises(ValueError, match="got 2 on line 1"):
+            list(iter_xreim(str(path)))
+
+    def test_truncated_file_raises(self, xreim_file):
+        path, _ = xreim_file
+        text = Path(path).read_text()
+        Path(path).write_text(text[:text.rindex(' ')])
+        with pytest.raises(ValueError, match="got 2 on line 10"):
+            read_xreim(path, Simpy(), chunk_size=4)
+
+
 # ---------------------------------------------------------------------------
 # Write round-trip
 # ---------------------------------------------------------------------------
@@ -38,12 +38,12 @@ def test_simulate_spectrum_quadrupolar():
 
     try:
         # Quadrupolar nucleus should get Inc
-        simulate_spectrum(spinsys_23na)
+        simulate_spectrum(spinsys_23na, engine='simpson', decompose=False)
         assert captured_params.get('detect_operator') == 'Inc'
 
         # Explicit override should be respected
         captured_params.clear()
-        simulate_spectrum(spinsys_23na, detect_operator='Inp')
+        simulate_spectrum(spinsys_23na, detect_operator='Inp', engine='simpson', decompose=False)
         assert captured_params.get('detect_operator') == 'Inp'
 
         # Spin-1/2 nucleus should keep Inp
@@ -53,7 +53,7 @@ def test_simulate_spectrum_quadrupolar():
         nuclei 1H
         shift 1 0 0 0 0 0 0
         """
-        simulate_spectrum(spinsys_1h)
+        simulate_spectrum(spinsys_1h, engine='simpson', decompose=False)
         assert captured_params.get('detect_operator') == 'Inp'
 
     finally:
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from simpyson import calculator
+from simpyson.calculator import SimpCalc, simulate_spectrum_async
+from simpyson.runner import SimpsonPool, arun_many, run_many
+
+
+def _calc(**overrides):
+    params = {
+        'proton_frequency': 400e6,
+        'spin_rate': 10000,
+        'start_operator': 'Inx',
+        'detect_operator': 'Inp',
+        'np': 8,
+        'sw': 20000,
+        'method': 'direct',
+        'crystal_file': 'rep100',
+        'gamma_angles': 10,
+        'verbose': 0,
+    }
+    params.update(overrides)
+    return SimpCalc("channels 1H\nnuclei 1H\nshift 1 5p 0 0 0 0 0", pulse_sequence='no_pulse', **params)
+
+
+@pytest.fixture(autouse=True)
+def _scratch_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_run_many_keeps_input_order(fake_simpson):
+    calcs = [_calc(spin_rate=rate, variable_sleep=0.2 if rate == 1000 else 0) for rate in (1000, 2000, 3000)]
+    results = run_many(calcs, max_workers=3, simpson_path=fake_simpson)
+
+    assert [r.spe['real'][0] for r in results] == [1000, 2000, 3000]
+    assert all(r.b0 == '400.0MHz' and r.nucleus == '1H' for r in results)
+
+
+def test_run_many_raises_job_error(fake_simpson):
+    calcs = [_calc(), _calc(variable_crash=1)]
+    with pytest.raises(RuntimeError, match="simulated SIMPSON failure"):
+        run_many(calcs, max_workers=2, simpson_path=fake_simpson)
+
+
+def test_run_many_return_exceptions(fake_simpson):
+    calcs = [_calc(variable_crash=1), _calc(spin_rate=500)]
+    results = run_many(calcs, max_workers=2, return_exceptions=True, simpson_path=fake_simpson)
+
+    assert isinstance(results[0], RuntimeError)
+    np.testing.assert_allclose(results[1].spe['real'], 500)
+
+
+def test_run_many_timeout(fake_simpson):
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_many([_calc(variable_sleep=5)], timeout=0.5, simpson_path=fake_simpson)
+
+
+def test_pool_submit_returns_futures(fake_simpson):
+    with SimpsonPool(max_workers=2) as pool:
+        futures = [pool.submit(_calc(spin_rate=rate), simpson_path=fake_simpson) for rate in (10, 20)]
+        assert [f.result().spe['real'][0] for f in futures] == [10, 20]
+
+
+def test_pool_rejects_shared_filepath():
+    with SimpsonPool(max_workers=1) as pool, pytest.raises(ValueError, match="filepath"):
+        pool.submit(_calc(), filepath="job.in")
+
+
+def test_pool_process_backend(fake_simpson):
+    results = run_many([_calc(spin_rate=7)], max_workers=1, use_processes=True, simpson_path=fake_simpson)
+    np.testing.assert_allclose(results[0].spe['real'], 7)
+
+
+def test_sweep_product_coords(fake_simpson):
+    result = _calc().sweep(spin_rate=[100, 200], lb=[10, 20, 30], run_kwargs={'simpson_path': fake_simpson})
+
+    assert len(result) == 6
+    assert list(result.coords['spin_rate']) == [100, 100, 100, 200, 200, 200]
+    assert list(result.coords['lb']) == [10, 20, 30] * 2
+    np.testing.assert_allclose(result.sel(spin_rate=200, lb=20).real, 200)
+    assert result.dims == ('spin_rate', 'lb')
+    assert result.grid_shape == (2, 3)
+    assert result.grid.shape == (2, 3, 8)
+    np.testing.assert_allclose(result.grid[1, :, 0], 200)
+    assert np.shares_memory(result.grid, result.data)
+    assert result.to_fid().grid_shape == (2, 3)
+    assert result.sel(spin_rate=200).grid_shape is None
+
+
+def test_sweep_zip(fake_simpson):
+    result = _calc().sweep(mode='zip', spin_rate=[1, 2, 3], sw=[100, 200, 300],
+                           stack=False, run_kwargs={'simpson_path': fake_simpson})
+
+    assert [point for point, _ in result] == [
+        {'spin_rate': 1, 'sw': 100}, {'spin_rate': 2, 'sw': 200}, {'spin_rate': 3, 'sw': 300},
+    ]
+    assert [spe.spe['sw'] for _, spe in result] == [100, 200, 300]
+    stacked = _calc().sweep(mode='zip', spin_rate=[1, 2], lb=[10, 20],
+                            run_kwargs={'simpson_path': fake_simpson})
+    assert stacked.dims is None
+    assert stacked.grid_shape is None
+
+
+def test_sweep_invalid_arguments():
+    with pytest.raises(ValueError, match="same length"):
+        _calc().sweep(mode='zip', spin_rate=[1, 2], sw=[100])
+    with pytest.raises(ValueError, match="Unknown sweep mode"):
+        _calc().sweep(mode='grid', spin_rate=[1])
+    with pytest.raises(ValueError, match="at least one"):
+        _calc().sweep()
+
+
+def test_with_parameters_updates_template():
+    calc = SimpCalc("channels 1H 13C\nnuclei 1H 13C", pulse_sequence='cp_mas', pcp=1000, **_calc().parameters)
+    changed = calc.with_parameters(pcp=250, out_format='fid', spin_rate=5000)
+
+    assert changed.pulse_sequence.parameters['variable_pcp'] == 250
+    assert calc.pulse_sequence.parameters['variable_pcp'] == 1000
+    assert 'variable pcp             250' in changed.generate_par()
+    assert changed.parameters['spin_rate'] == 5000
+    assert '.fid' in changed.generate_main()
+
+
+def test_with_parameters_spinsys():
+    calc = _calc()
+    changed = calc.with_parameters(spinsys=lambda s: s.replace("5p", "7p"))
+    assert "shift 1 7p" in changed.generate_spinsys()
+    assert "shift 1 5p" in calc.generate_spinsys()
+    assert calc.with_parameters(spinsys="channels 13C\nnuclei 13C").generate_spinsys().startswith("spinsys")
+
+
+def test_with_parameters_rederives_reference():
+    calc = _calc(variable_offset=1000)
+    changed = calc.with_parameters(variable_offset=3000)
+    assert changed.parameters['variable_ref'] == -3000
+    assert changed.pulse_sequence.parameters['variable_offset'] == 3000
+    assert calc.parameters['variable_ref'] == -1000
+    explicit = _calc(variable_offset=1000, variable_ref=50).with_parameters(offset=3000)
+    assert explicit.parameters['variable_ref'] == 50
+    assert 'variable offset          3000' in explicit.generate_par()
+
+
+def test_sweep_offset_moves_reference(fake_simpson):
+    result = _calc(variable_offset=1000).sweep(
+        variable_offset=[1000, 3000], stack=False, run_kwargs={'simpson_path': fake_simpson}
+    )
+    # hz = f_SPE - REF with REF = -offset
+    assert [spe.spe['hz'][0] for _, spe in result] == pytest.approx([-10000 + 1000, -10000 + 3000])
+
+
+def test_with_parameters_rejects_unknown_keys():
+    with pytest.raises(ValueError, match="Unknown parameter 'Cq'"):
+        _calc().with_parameters(Cq=4e6)
+    with pytest.raises(ValueError, match="Unknown parameter 'Cq'"):
+        _calc().sweep(Cq=[1e6, 2e6])
+    assert 'variable x' in _calc().with_parameters(variable_x=3).generate_par()
+
+
+def test_sweep_spinsys(fake_simpson):
+    two_spins = "channels 1H\nnuclei 1H 1H\nshift 1 5p 0 0 0 0 0\nshift 2 6p 0 0 0 0 0\ndipole 1 2 -5000 0 0 0"
+    result = _calc().sweep(spinsys=[_calc().spinsys, two_spins], run_kwargs={'simpson_path': fake_simpson})
+    # The fake SIMPSON scales by n * 2**(n - 1) for n spins
+    np.testing.assert_allclose(result.real[:, 0], [10000, 40000])
+
+
+def _assert_killed(pidfile):
+    pid = int(pidfile.read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_run_resolves_relative_crystal_file(fake_simpson, tmp_path):
+    (tmp_path / "crystals").mkdir()
+    (tmp_path / "crystals" / "powder.cry").write_text("2\n1.0 0.0 0.5\n3.0 0.0 0.5\n")
+    calc = _calc(crystal_file="crystals/powder", out_name="out/sim")
+
+    result = calc.run(simpson_path=fake_simpson)
+    np.testing.assert_allclose(result.spe['real'], 10000 * 2.0)
+    np.testing.assert_allclose(asyncio.run(calc.arun(simpson_path=fake_simpson)).spe['real'], 10000 * 2.0)
+    assert "crystal_file         crystals/powder" in str(calc)
+
+
+def test_out_name_subdirectory_is_kept(fake_simpson, tmp_path):
+    keep = tmp_path / "keep"
+    keep.mkdir()
+    calc = _calc(out_name="sub/rel")
+    result = calc.run(simpson_path=fake_simpson, filepath=str(keep / "job.in"), delete_files=False)
+    np.testing.assert_allclose(result.spe['real'], 10000)
+    assert (keep / "sub" / "rel.spe").exists()
+    assert not (keep / "rel.spe").exists()
+
+
+@pytest.mark.parametrize("out_name", ["{tmp}/out/abs", "../escape"])
+def test_out_name_outside_run_directory_stays_in_scratch(fake_simpson, tmp_path, out_name):
+    calc = _calc(out_name=out_name.format(tmp=tmp_path))
+    result = calc.run(simpson_path=fake_simpson)
+    np.testing.assert_allclose(result.spe['real'], 10000)
+    assert not (tmp_path / "out").exists()
+    assert not (tmp_path.parent / "escape.spe").exists()
+
+
+def test_absolute_out_name_is_moved_to_its_path(fake_simpson, tmp_path):
+    keep = tmp_path / "keep"
+    keep.mkdir()
+    calc = _calc(out_name=f"{tmp_path}/out/$par(name)_abs")
+    result = calc.run(simpson_path=fake_simpson, filepath=str(keep / "job.in"), delete_files=False)
+    np.testing.assert_allclose(result.spe['real'], 10000)
+    assert (tmp_path / "out" / "job_abs.spe").exists()
+
+
+def test_templated_out_name(fake_simpson, tmp_path):
+    calc = _calc(out_name="sub/$par(name)_run")
+    result = calc.run(simpson_path=fake_simpson, delete_files=False)
+    np.testing.assert_allclose(result.spe['real'], 10000)
+    assert (tmp_path / "sub" / "simpson_run.spe").exists()
+
+
+def test_result_cache_tracks_crystal_file_contents(fake_simpson, tmp_path):
+    crystal = tmp_path / "powder.cry"
+    crystal.write_text("1\n1.0 0.0 1.0\n")
+    calc = _calc(crystal_file="powder")
+    cache = str(tmp_path / "cache")
+    np.testing.assert_allclose(calc.run(simpson_path=fake_simpson, cache=cache).spe['real'], 10000)
+
+    crystal.write_text("1\n3.0 0.0 1.0\n")
+    np.testing.assert_allclose(calc.run(simpson_path=fake_simpson, cache=cache).spe['real'], 30000)
+    assert len(list((tmp_path / "cache" / "results").glob("*.spe"))) == 2
+
+
+def test_crystal_dir_used_with_and_without_shards(fake_simpson, tmp_path, monkeypatch):
+    crystal_dir = tmp_path / "crystals"
+    crystal_dir.mkdir()
+    (crystal_dir / "powder.cry").write_text("2\n1.0 0.0 0.5\n3.0 0.0 0.5\n")
+    monkeypatch.setenv("SIMPSON_CRYSTAL_DIR", str(crystal_dir))
+    calc = _calc(crystal_file="powder")
+
+    np.testing.assert_allclose(calc.run(simpson_path=fake_simpson).spe['real'], 10000 * 2.0)
+    np.testing.assert_allclose(calc.run(simpson_path=fake_simpson, shards=2).spe['real'], 10000 * 2.0)
+
+
+def test_shards_rejected_with_cache_before_decomposing(fake_simpson):
+    calc = SimpCalc("channels 1H\nnuclei 1H 1H\nshift 1 5p 0 0 0 0 0\nshift 2 6p 0 0 0 0 0",
+                    pulse_sequence='no_pulse', **_calc().parameters)
+    with pytest.raises(ValueError, match="shards cannot be combined"):
+        calc.run(simpson_path=fake_simpson, decompose=True, shards=2, cache=True)
+
+
+def test_arun_matches_run(fake_simpson):
+    calc = _calc(spin_rate=1234)
+    result = asyncio.run(calc.arun(simpson_path=fake_simpson))
+
+    np.testing.assert_allclose(result.spe['real'], 1234)
+    assert result.b0 == '400.0MHz'
+    assert result.nucleus == '1H'
+
+
+def test_arun_errors(fake_simpson):
+    with pytest.raises(RuntimeError, match="simulated SIMPSON failure"):
+        asyncio.run(_calc(variable_crash=1).arun(simpson_path=fake_simpson))
+
+
+def test_arun_timeout_kills_child(fake_simpson, tmp_path, monkeypatch):
+    pidfile = tmp_path / "pid"
+    monkeypatch.setenv("FAKE_SIMPSON_PIDFILE", str(pidfile))
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(_calc(variable_sleep=30).arun(simpson_path=fake_simpson, timeout=0.5))
+
+    assert time.monotonic() - start < 10
+    _assert_killed(pidfile)
+
+
+def test_arun_cancel_kills_child(fake_simpson, tmp_path, monkeypatch):
+    pidfile = tmp_path / "pid"
+    monkeypatch.setenv("FAKE_SIMPSON_PIDFILE", str(pidfile))
+
+    async def main():
+        task = asyncio.ensure_future(_calc(variable_sleep=30).arun(simpson_path=fake_simpson))
+        while not pidfile.exists():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    _assert_killed(pidfile)
+
+
+def test_arun_many_order_and_errors(fake_simpson):
+    calcs = [_calc(spin_rate=rate, variable_sleep=0.1 * (3 - rate)) for rate in (1, 2, 3)]
+    results = asyncio.run(arun_many(calcs, max_concurrency=2, simpson_path=fake_simpson))
+    assert [r.spe['real'][0] for r in results] == [1, 2, 3]
+
+    results = asyncio.run(arun_many([_calc(variable_crash=1), _calc()], return_exceptions=True,
+                                    simpson_path=fake_simpson))
+    assert isinstance(results[0], RuntimeError)
+    assert results[1].spe['real'][0] == 10000
+
+
+def test_simulate_spectrum_async(fake_simpson, monkeypatch):
+    monkeypatch.setenv("PATH", str(Path(fake_simpson).parent), prepend=os.pathsep)
+    result = asyncio.run(simulate_spectrum_async(
+        "channels 1H\nnuclei 1H\nshift 1 5p 0 0 0 0 0", spin_rate=100, zerofill=16, timeout=30,
+        engine='simpson',
+    ))
+
+    assert result.spe['np'] == 16
+    np.testing.assert_allclose(result.spe['real'], 100)
+
+
+def test_simulate_spectrum_async_engine_off_loop(monkeypatch):
+    threads = []
+    analytic = calculator.simulate_analytic
+
+    def record(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return analytic(*args, **kwargs)
+
+    monkeypatch.setattr(calculator, 'simulate_analytic', record)
+    result = asyncio.run(simulate_spectrum_async(
+        "channels 13C\nnuclei 13C\nshift 1 100p 60p 0 0 0 0", spin_rate=0, engine='csa',
+    ))
+
+    assert result.spe['np'] > 0
+    assert threads
+    assert threading.main_thread() not in threads
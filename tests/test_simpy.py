@@ -4,7 +4,7 @@ from __future__ import annotations
 import numpy as np
 import pytest
 
-from simpyson.simpy import Simpy
+from simpyson.simpy import LinearAxis, Simpy
 
 
 # ---------------------------------------------------------------------------
@@ -184,6 +184,72 @@ def test_copy_is_independent(simple_spectrum):
     assert simple_spectrum.spe['real'][0] != 999999
 
 
+def test_copy_shares_buffers_until_written(simple_spectrum):
+    clone = simple_spectrum.copy()
+    assert np.shares_memory(clone.spe.data, simple_spectrum.spe.data)
+    assert not clone.spe.data.flags.writeable
+    assert simple_spectrum.spe.data.flags.writeable
+    clone.spe['real'][0] = 1.0
+    assert not np.shares_memory(clone.spe.data, simple_spectrum.spe.data)
+    assert simple_spectrum.spe['real'][0] != 1.0
+
+
+def test_copy_relabel_does_not_copy():
+    s = Simpy(b0="400MHz", nucleus="1H").from_spe(np.ones(8), np.zeros(8), 8, 4000.0)
+    clones = [s.copy() for _ in range(3)]
+    for clone in clones:
+        clone.nucleus = "13C"
+        assert clone.ppm['ppm'][0] != pytest.approx(s.ppm['ppm'][0])
+        assert np.shares_memory(clone.spe.real, s.spe.data)
+        assert np.shares_memory(clone.ppm.imag, s.spe.data)
+
+
+def test_copy_source_stays_writable(simple_spectrum):
+    original = simple_spectrum.spe.data[0].real
+    clone = simple_spectrum.copy()
+    other = simple_spectrum.copy()
+    simple_spectrum.spe['real'][0] = 999999
+    simple_spectrum.spe['real'] *= 2
+    simple_spectrum.spe['hz'][0] = -1.0
+    # The source copied its own buffers; its copies still share the originals
+    assert np.shares_memory(clone.spe.data, other.spe.data)
+    assert simple_spectrum.spe['real'][0] == 2 * 999999
+    assert clone.spe['real'][0] == original
+    assert clone.spe['hz'][0] != -1.0
+
+
+def test_copy_writes_through_ppm():
+    s = Simpy(b0="400MHz", nucleus="1H").from_spe(np.ones(8), np.zeros(8), 8, 4000.0)
+    clone = s.copy()
+    clone.ppm['real'][0] = 5.0
+    assert clone.spe['real'][0] == 5.0
+    assert s.spe['real'][0] == 1.0
+
+
+def test_copy_of_copy_is_independent(simple_spectrum):
+    original = simple_spectrum.spe['real'][0]
+    clone = simple_spectrum.copy()
+    grandchild = clone.copy()
+    clone.spe['real'][0] = 1.0
+    simple_spectrum.spe['real'][0] = 2.0
+    assert grandchild.spe['real'][0] == original
+    assert clone.spe['real'][0] == 1.0
+
+
+def test_copy_relabel_keeps_original_ppm():
+    s = Simpy(b0="400MHz", nucleus="1H").from_spe(np.ones(8), np.zeros(8), 8, 4000.0)
+    clone = s.copy()
+    clone.nucleus = "13C"
+    assert clone.ppm['ppm'][0] != pytest.approx(s.ppm['ppm'][0])
+
+
+def test_deep_copy_is_writable(simple_spectrum):
+    clone = simple_spectrum.copy(deep=True)
+    assert clone.spe.data.flags.writeable
+    clone.spe['real'][0] = 999999
+    assert simple_spectrum.spe['real'][0] != 999999
+
+
 # ---------------------------------------------------------------------------
 # Write (SIMPSON format)
 # ---------------------------------------------------------------------------
@@ -231,3 +297,127 @@ def test_method_chaining():
     # Just verify from_fid also chains
     s2 = Simpy()
     assert s2.from_fid([1, 2], [0, 0], 2, 100.0) is s2
+
+
+# ---------------------------------------------------------------------------
+# Complex storage
+# ---------------------------------------------------------------------------
+
+def test_real_imag_are_views(simple_spectrum):
+    spe = simple_spectrum.spe
+    assert np.shares_memory(spe['real'], spe.data)
+    assert np.shares_memory(spe['imag'], spe.data)
+    np.testing.assert_allclose(spe.data, spe['real'] + 1j * spe['imag'])
+
+
+def test_complex64_mode():
+    s = Simpy(dtype=np.complex64)
+    s.from_fid(np.ones(16), np.zeros(16), 16, 100.0)
+    assert s.fid.data.dtype == np.complex64
+    assert s.spe['real'].dtype == np.float32
+    assert s.copy().dtype == np.complex64
+
+
+def test_non_complex_dtype_raises():
+    with pytest.raises(ValueError, match="complex"):
+        Simpy(dtype=np.float64)
+
+
+def test_data_mapping_keys(simple_spectrum):
+    spe = simple_spectrum.spe
+    assert list(spe) == ['real', 'imag', 'np', 'sw', 'hz']
+    spe['real'] = np.zeros(64)
+    np.testing.assert_array_equal(spe.data.real, 0.0)
+    assert 'np' not in Simpy().from_xreim([0, 1], [1, 2], [0, 0]).xreim
+
+
+# ---------------------------------------------------------------------------
+# Linear axes
+# ---------------------------------------------------------------------------
+
+def test_linear_axis_behaves_like_array():
+    axis = LinearAxis(-5.0, 2.5, 5)
+    np.testing.assert_allclose(axis, [-5.0, -2.5, 0.0, 2.5, 5.0])
+    assert len(axis) == 5
+    assert axis[-1] == pytest.approx(5.0)
+    np.testing.assert_allclose(axis[1:4], [-2.5, 0.0, 2.5])
+    np.testing.assert_allclose(np.interp([0.0], axis, np.arange(5)), [2.0])
+
+
+def test_linear_axis_affine_ops_stay_lazy():
+    axis = LinearAxis(0.0, 1.0, 4)
+    scaled = (axis - 1.0) / 2.0
+    assert isinstance(scaled, LinearAxis)
+    np.testing.assert_allclose(scaled, [-0.5, 0.0, 0.5, 1.0])
+    assert isinstance(-axis, LinearAxis)
+    assert not isinstance(axis * np.ones(4), LinearAxis)
+
+
+def test_linear_axis_index_lookup():
+    axis = LinearAxis(-100.0, 10.0, 21)
+    assert axis.index(0.0) == 10
+    assert axis.index(4.0) == 10
+    assert axis.index(1e6) == 20
+    np.testing.assert_array_equal(axis.index([-100.0, 100.0]), [0, 20])
+
+
+def test_linear_axis_inplace_ops_rebind():
+    axis = LinearAxis(0.0, 1.0, 4)
+    original = axis
+    axis += 1.0
+    assert isinstance(axis, LinearAxis)
+    np.testing.assert_allclose(axis, [1.0, 2.0, 3.0, 4.0])
+    np.testing.assert_allclose(original, [0.0, 1.0, 2.0, 3.0])
+
+
+def test_default_axes_are_linear(simple_fid):
+    assert isinstance(simple_fid.fid.axis('time'), LinearAxis)
+    assert isinstance(simple_fid.spe.axis('hz'), LinearAxis)
+
+
+def test_axis_lookup_is_cached(simple_fid):
+    spe = simple_fid.spe
+    hz = spe['hz']
+    assert type(hz) is np.ndarray
+    assert spe['hz'] is hz
+    assert isinstance(spe._axes['hz'], LinearAxis)
+    spe['hz'] = LinearAxis(0.0, 1.0, 64)
+    assert isinstance(spe.axis('hz'), LinearAxis)
+    assert spe['hz'] is not hz
+    assert spe['hz'][1] == 1.0
+
+
+def test_ppm_lookup_is_cached():
+    s = Simpy(b0="400MHz", nucleus="1H").from_spe(np.ones(8), np.zeros(8), 8, 4000.0)
+    ppm = s.ppm['ppm']
+    assert s.ppm['ppm'] is ppm
+    assert s.spe['ppm'] is ppm
+
+
+def test_axis_lookup_supports_ndarray_api(simple_fid):
+    hz = simple_fid.spe['hz']
+    expected = -5000.0 + 10000.0 / 64 * np.arange(64)
+    np.testing.assert_allclose(hz.copy(), expected)
+    assert hz.min() == pytest.approx(expected.min())
+    assert hz.max() == pytest.approx(expected.max())
+    assert hz.mean() == pytest.approx(expected.mean())
+    assert hz.astype(np.float32).dtype == np.float32
+
+
+def test_axis_inplace_update(simple_fid):
+    simple_fid.spe['hz'] -= 100.0
+    assert simple_fid.spe['hz'][0] == pytest.approx(-5100.0)
+    simple_fid.spe['hz'][0] = 0.0
+    assert simple_fid.spe.axis('hz')[0] == 0.0
+    simple_fid.spe['hz'] = simple_fid.spe.axis('hz')[1:]
+    assert len(simple_fid.spe['hz']) == 63
+
+
+def test_ppm_view_is_cached():
+    s = Simpy(b0="400MHz", nucleus="1H")
+    s.from_spe(np.ones(8), np.zeros(8), 8, 4000.0)
+    first = s.ppm
+    assert s.ppm is first
+    assert first.axis('ppm') is s.spe.axis('ppm')
+    s.b0 = "600MHz"
+    assert s.ppm is not first
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 import math
+import os
+from pathlib import Path
 
+import numpy as np
 import pytest
-from simpyson.calculator import SimpCalc, simulate_spectrum
-from simpyson.converter import ppm2hz
-from simpyson.utils import get_larmor_freq
+from ase import Atoms
 
+from simpyson.calculator import (
+    SimpCalc,
+    _cluster_parts,
+    _simulation_calc,
+    simulate_clusters,
+    simulate_spectrum,
+)
+from simpyson.converter import _proton_freq_to_b0, ppm2hz
+from simpyson.engines import simulate_analytic
+from simpyson.utils import get_larmor_freq, simple_spinsys
 
 SPINSYS_1H = """
 channels 1H
@@ -184,3 +195,105 @@ quadrupole 1 2 -4391507.0 0.13 118.0 107.0 -62.0
     par_block = calc.generate_par()
     assert "spin_rate" in par_block
     assert "sw" in par_block
+
+
+
+def test_simulate_spectrum_decomposes(fake_simpson, monkeypatch):
+    """Uncoupled parts run separately (SIMPSON or an engine) and are summed."""
+    monkeypatch.setenv("PATH", str(Path(fake_simpson).parent), prepend=os.pathsep)
+    spinsys = "channels 13C\nnuclei 13C 13C 13C\nshift 1 10p 0 0 0 0 0\nshift 3 50p 20p 0 0 0 0\ndipole 1 2 -2000 0 0 0"
+    params = {'spin_rate': 10e3, 'sw': 20e3, 'np': 64, 'zerofill': 64}
+    result = simulate_spectrum(spinsys, **params)
+
+    (_, pair_weight), (lone, lone_weight) = _simulation_calc(spinsys, **params).decompose()
+    assert (pair_weight, lone_weight) == (2.0, 4.0)
+    # The coupled pair goes through (fake) SIMPSON: spin_rate * 2 * 2 per point
+    expected = pair_weight * 40e3 + lone_weight * simulate_analytic(lone).spe['real']
+    np.testing.assert_allclose(result.spe['real'], expected)
+
+
+def _shielding_spinsys(cluster):
+    """Spinsys of a 13C cluster from the eigenvalues of its ms tensors."""
+    eigenvalues = np.linalg.eigvalsh(cluster.get_array('ms'))
+    iso = eigenvalues.mean(axis=1)
+    aniso = eigenvalues[:, 2] - iso
+    return simple_spinsys(
+        cluster, {'C': 13, 'H': 1}, iso_ms=iso, aniso_ms=aniso,
+        eta_ms=(eigenvalues[:, 1] - eigenvalues[:, 0]) / aniso, obs_nuc='13C',
+    )
+
+
+def _carbon_atoms():
+    """Three 13C sites; the first two have the same tensor in rotated frames."""
+    rotation = np.linalg.qr(np.random.default_rng(0).normal(size=(3, 3)))[0]
+    tensor = np.array([[10.0, 3.0, 0.0], [3.0, 20.0, 1.0], [0.0, 1.0, 60.0]])
+    atoms = Atoms('C3', positions=[[0, 0, 0], [5, 0, 0], [0, 5, 0]], cell=[10, 10, 10], pbc=True)
+    atoms.set_array('ms', np.array([tensor, rotation @ tensor @ rotation.T, np.diag([30.0, 40.0, 50.0])]))
+    return atoms
+
+
+def test_simulate_clusters_single_sites():
+    """Without neighbours the clusters add up to the uncoupled system."""
+    atoms = _carbon_atoms()
+    params = {'spin_rate': 0, 'proton_frequency': 400e6, 'np': 512}
+    parts = _cluster_parts([_shielding_spinsys(atoms[[0]]), _shielding_spinsys(atoms[[2]])], [2, 1], **params)
+    assert [weight for _, weight in parts] == [2.0, 1.0]
+
+    result = simulate_clusters(atoms, [0, 1, 2], _shielding_spinsys, n_neighbours=0, **params)
+    full = simulate_spectrum(_shielding_spinsys(atoms), **params)
+    assert result.spe['sw'] == pytest.approx(full.spe['sw'])
+    # Clusters are normalized per site; the full system carries 2**(3 - 1)
+    np.testing.assert_allclose(4 * result.spe['real'], full.spe['real'])
+
+
+def test_cluster_parts_observe_central_site():
+    spinsys = [
+        "channels 13C 1H\nnuclei 13C 1H\nshift 1 10p 0 0 0 0 0\nshift 2 90p 0 0 0 0 0\ndipole 1 2 -5000 0 0 0",
+        "channels 13C 1H\nnuclei 13C 1H 1H\nshift 1 30p 0 0 0 0 0\ndipole 1 2 -5000 0 0 0",
+    ]
+    parts = _cluster_parts(spinsys, [1, 3], spin_rate=10e3)
+    assert [weight for _, weight in parts] == [0.5, 0.75]
+    calc = parts[0][0]
+    assert (calc.parameters['start_operator'], calc.parameters['detect_operator']) == ('I1x', 'I1p')
+    # The window is centred on the observed sites only (10-30 ppm)
+    assert calc.parameters['variable_offset'] == pytest.approx(ppm2hz(20, _proton_freq_to_b0(800e6), '13C'))
+    assert parts[1][0].parameters['variable_offset'] == calc.parameters['variable_offset']
+
+
+def test_cluster_parts_require_observed_channel_first():
+    with pytest.raises(ValueError, match="first channel"):
+        _cluster_parts(["channels 1H 13C\nnuclei 13C 1H\nshift 1 10p 0 0 0 0 0"], [1])
+
+
+def test_simulate_clusters_runs_simpson(fake_simpson, monkeypatch):
+    """Clusters with neighbours run through SIMPSON and are weighted."""
+    monkeypatch.setenv("PATH", str(Path(fake_simpson).parent), prepend=os.pathsep)
+    atoms = _carbon_atoms() + Atoms('H', positions=[[1, 0, 0]])
+    atoms.arrays['ms'][3] = np.diag([1.0, 2.0, 4.0])
+    result = simulate_clusters(
+        atoms, [0, 1, 2], _shielding_spinsys, n_neighbours=1, neighbours=[3],
+        spin_rate=10e3, sw=20e3, np=16, zerofill=16,
+    )
+    # Two clusters of two spins (fake SIMPSON: spin_rate * 2 * 2), weights 2/2 and 1/2
+    np.testing.assert_allclose(result.spe['real'], (1.0 + 0.5) * 40e3)
+
+
+@pytest.mark.parametrize(('x', 'multiplicities'), [(1.0, [1, 1, 1]), (2.5, [2, 1])])
+def test_simulate_clusters_compare_environments(fake_simpson, monkeypatch, x, multiplicities):
+    """Tensor-equivalent sites are only grouped if their clusters match too."""
+    monkeypatch.setenv("PATH", str(Path(fake_simpson).parent), prepend=os.pathsep)
+    seen = []
+
+    def spy(spinsys_list, counts, **kwargs):
+        seen.extend(counts)
+        return _cluster_parts(spinsys_list, counts, **kwargs)
+
+    monkeypatch.setattr('simpyson.calculator._cluster_parts', spy)
+    # The H neighbour is 1 and 4 Angstrom from sites 0 and 1, or 2.5 from both
+    atoms = _carbon_atoms() + Atoms('H', positions=[[x, 0, 0]])
+    atoms.arrays['ms'][3] = np.diag([1.0, 2.0, 4.0])
+    simulate_clusters(
+        atoms, [0, 1, 2], _shielding_spinsys, n_neighbours=1, neighbours=[3],
+        spin_rate=10e3, sw=20e3, np=16, zerofill=16,
+    )
+    assert seen == multiplicities
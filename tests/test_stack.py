@@ -0,0 +1,93 @@
+"""Tests for simpyson.stack — batched spectra on a shared axis."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from simpyson.simpy import LinearAxis, Simpy
+from simpyson.stack import SpectrumStack
+
+
+@pytest.fixture
+def fids():
+    rng = np.random.default_rng(7)
+    return [
+        Simpy(b0="400MHz", nucleus="1H").from_fid(
+            rng.standard_normal(32), rng.standard_normal(32), 32, 8000.0
+        )
+        for _ in range(4)
+    ]
+
+
+def test_from_simpy_shape(fids):
+    stack = SpectrumStack.from_simpy(fids)
+    assert len(stack) == 4
+    assert stack.np == 32
+    assert stack.domain == 'fid'
+
+
+def test_batched_fft_matches_simpy(fids):
+    spectra = SpectrumStack.from_simpy(fids).to_spectrum()
+    for row, simpy in zip(spectra.to_simpy(), fids, strict=True):
+        np.testing.assert_allclose(row.spe['real'], simpy.spe['real'], atol=1e-12)
+        np.testing.assert_allclose(row.spe['hz'], simpy.spe['hz'])
+
+
+def test_axis_stays_linear(fids):
+    stack = SpectrumStack.from_simpy(fids)
+    np.testing.assert_allclose(stack.axis, fids[0].fid['time'])
+    assert not stack.axis.flags.writeable
+    assert isinstance(stack._axis, LinearAxis)
+
+
+def test_fid_roundtrip(fids):
+    stack = SpectrumStack.from_simpy(fids)
+    np.testing.assert_allclose(stack.to_spectrum().to_fid().data, stack.data, atol=1e-12)
+
+
+def test_weighted_sum(fids):
+    stack = SpectrumStack.from_simpy(fids).to_spectrum()
+    weights = [1.0, 2.0, 0.0, 0.5]
+    total = stack.sum(weights=weights)
+    expected = sum(w * s.spe.data for w, s in zip(weights, fids, strict=True))
+    np.testing.assert_allclose(total.spe.data, expected, atol=1e-12)
+    np.testing.assert_allclose(stack.weighted(weights).sum().spe.data, expected, atol=1e-12)
+
+
+def test_slicing(fids):
+    stack = SpectrumStack.from_simpy(fids, labels=['a', 'b', 'c', 'd'])
+    sub = stack[1:3]
+    assert isinstance(sub, SpectrumStack)
+    assert sub.labels == ['b', 'c']
+    assert isinstance(stack[0], Simpy)
+
+
+def test_ppm_axis(fids):
+    fid_stack = SpectrumStack.from_simpy(fids, domain='fid')
+    with pytest.raises(ValueError, match="only defined for spectra"):
+        _ = fid_stack.ppm
+    np.testing.assert_allclose(fid_stack.to_spectrum().ppm, fids[0].ppm['ppm'])
+
+
+def test_mismatched_np_raises(fids):
+    other = Simpy().from_fid(np.ones(16), np.zeros(16), 16, 8000.0)
+    with pytest.raises(ValueError, match="Cannot stack"):
+        SpectrumStack.from_simpy([*fids, other])
+
+
+def test_coords_follow_slicing(fids):
+    stack = SpectrumStack.from_simpy(fids, coords={'pcp': [100, 200, 100, 200]})
+    np.testing.assert_array_equal(stack[1:].coords['pcp'], [200, 100, 200])
+    np.testing.assert_array_equal(stack.sel(pcp=100).data, stack.data[[0, 2]])
+    with pytest.raises(KeyError):
+        stack.sel(spin_rate=1)
+    with pytest.raises(ValueError, match="Coordinate 'pcp'"):
+        SpectrumStack.from_simpy(fids, coords={'pcp': [1, 2]})
+
+
+def test_grid_shape_validated(fids):
+    data = SpectrumStack.from_simpy(fids).data
+    with pytest.raises(ValueError, match="Grid shape"):
+        SpectrumStack(data, 'fid', 1000.0, grid_shape=(len(fids) + 1,))
+    with pytest.raises(ValueError, match="no grid shape"):
+        _ = SpectrumStack(data, 'fid', 1000.0).grid
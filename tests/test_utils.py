@@ -1,19 +1,35 @@
 """Tests for simpyson.utils — isotope lookups, add_spectra, simple_spinsys."""
 from __future__ import annotations
 
+import io
+from pathlib import Path
+
 import numpy as np
 import pytest
+from ase import Atoms
+from ase.build import bulk
+from ase.io import read
 
 from simpyson.simpy import Simpy
 from simpyson.utils import (
     _load_isotope_data,
     add_spectra,
+    coupling_components,
+    equivalent_sites,
+    extract_spinsys,
     get_gamma,
     get_larmor_freq,
     get_spin,
+    hilbert_dimension,
+    prune_spinsys,
+    simple_spinsys,
+    site_clusters,
 )
 
 
+WRITE_DIR = Path(__file__).parent.parent / 'examples' / 'write'
+
+
 # ---------------------------------------------------------------------------
 # Isotope data helpers
 # ---------------------------------------------------------------------------
@@ -105,6 +121,13 @@ class TestAddSpectra:
         assert result is not None
         np.testing.assert_array_equal(result.spe['real'], [1, 2, 3])
 
+    def test_single_spectrum_stays_writable(self):
+        s = _make_spe([1, 2, 3])
+        result = add_spectra([s])
+        s.spe['real'][0] = 10
+        assert s.spe['real'][0] == 10
+        assert result.spe['real'][0] == 1
+
     def test_two_spectra_sum(self):
         s1 = _make_spe([1, 2, 3])
         s2 = _make_spe([4, 5, 6])
@@ -169,3 +192,313 @@ class TestAddSpectra:
 
         _ = add_spectra([s1, s2])
         np.testing.assert_array_equal(s1.spe['real'], original1)
+
+    def test_weighted_sum(self):
+        result = add_spectra([_make_spe([1, 2, 3]), _make_spe([4, 5, 6])], weights=[2, 0.5])
+        np.testing.assert_allclose(result.spe['real'], [4, 6.5, 9])
+
+    def test_weighted_single_spectrum(self):
+        result = add_spectra([_make_spe([1, 2, 3])], weights=[4])
+        np.testing.assert_allclose(result.spe['real'], [4, 8, 12])
+
+    def test_weight_count_mismatch_raises(self):
+        with pytest.raises(ValueError, match="Expected 2 weights"):
+            add_spectra([_make_spe([1]), _make_spe([2])], weights=[1])
+
+
+# ---------------------------------------------------------------------------
+# simple_spinsys
+# ---------------------------------------------------------------------------
+
+SIMPLE_SPINSYS = """spinsys {
+
+channels 27Al 1H
+nuclei 27Al 1H
+
+shift 1 10.5p 20p 0.5 0.0 90.0 0.0
+shift 2 3.0p 0.0p 0.0 0.0 0.0 0.0
+
+quadrupole 1 2 3000000.0 0.2 0.0 0.0 0.0
+
+dipole 1 2 -24601.934525600722 180.0 0.0 0.0
+
+}
+"""
+
+
+def _simple_kwargs():
+    return {
+        'atoms': Atoms('AlH', positions=[[0, 0, 2], [0, 0, 0]], cell=[20, 20, 20]),
+        'isotopes': {'Al': 27, 'H': 1},
+        'iso_ms': [10.5, 3.0],
+        'aniso_ms': [20, 0.0],
+        'eta_ms': [0.5, 0.0],
+        'euler_ms': [[0.0, 90.0, 0.0], [0.0, 0.0, 0.0]],
+        'cq': [3e6, 0],
+        'eta_q': [0.2, 0.0],
+        'get_dipolar': True,
+        'obs_nuc': '27Al',
+    }
+
+
+class TestSimpleSpinsys:
+    def test_text(self):
+        assert simple_spinsys(**_simple_kwargs()) == SIMPLE_SPINSYS
+
+    def test_stream_to_file(self):
+        buffer = io.StringIO()
+        assert simple_spinsys(**_simple_kwargs(), file=buffer) is None
+        assert buffer.getvalue() == SIMPLE_SPINSYS
+
+    def test_quadrupolar_order_checked_before_writing(self):
+        buffer = io.StringIO()
+        with pytest.raises(ValueError, match="order must be 2 or less"):
+            simple_spinsys(**_simple_kwargs(), q_order=[3, 2], file=buffer)
+        assert buffer.getvalue() == ""
+
+    @pytest.mark.parametrize('name', ['iso_ms', 'euler_ms', 'cq', 'eta_q'])
+    def test_short_list_rejected(self, name):
+        kwargs = _simple_kwargs()
+        kwargs[name] = kwargs[name][:1]
+        buffer = io.StringIO()
+        with pytest.raises(ValueError, match=f"{name} has 1 values"):
+            simple_spinsys(**kwargs, file=buffer)
+        assert buffer.getvalue() == ""
+
+
+# ---------------------------------------------------------------------------
+# simple_spinsys dipolar couplings
+# ---------------------------------------------------------------------------
+
+def _dipole_lines(spinsys):
+    return sorted(line for line in spinsys.splitlines() if line.startswith('dipole'))
+
+
+class TestSimpleSpinsysDipolar:
+    def test_cutoff_keeps_all_pairs_of_small_molecule(self):
+        atoms = read(WRITE_DIR / 'ethanol.magres')
+        full = simple_spinsys(atoms, {'C': 13}, get_dipolar=True)
+        near = simple_spinsys(atoms, {'C': 13}, get_dipolar=True, dip_cutoff=50.0)
+        assert _dipole_lines(near) == _dipole_lines(full)
+
+    def test_nearest_periodic_image(self):
+        atoms = Atoms('H2', positions=[[0, 0, 0], [4, 0, 0]], cell=[5, 5, 5], pbc=True)
+        lines = _dipole_lines(simple_spinsys(atoms, {'H': 1}, get_dipolar=True, dip_cutoff=1.5))
+        assert lines == _dipole_lines(simple_spinsys(atoms, {'H': 1}, get_dipolar=True))
+        # 1 Angstrom to the image at -x, not 4 Angstrom within the cell
+        tokens = lines[0].split()
+        assert float(tokens[3]) / (2 * np.pi) == pytest.approx(-120.0e3, rel=0.01)
+        assert float(tokens[5]) == pytest.approx(180.0)
+
+    def test_cutoff_and_min_coupling_drop_weak_pairs(self):
+        atoms = Atoms('H3', positions=[[0, 0, 0], [1.5, 0, 0], [8, 0, 0]], cell=[20, 20, 20])
+        assert len(_dipole_lines(simple_spinsys(atoms, {'H': 1}, get_dipolar=True))) == 3
+        assert _dipole_lines(
+            simple_spinsys(atoms, {'H': 1}, get_dipolar=True, dip_cutoff=5.0)
+        ) == _dipole_lines(
+            simple_spinsys(atoms, {'H': 1}, get_dipolar=True, dip_min_coupling=1e3)
+        )
+        lines = _dipole_lines(simple_spinsys(atoms, {'H': 1}, get_dipolar=True, dip_min_coupling=1e3))
+        assert [line.split()[1:3] for line in lines] == [['1', '2']]
+
+
+# ---------------------------------------------------------------------------
+# Per-site clusters
+# ---------------------------------------------------------------------------
+
+class TestSiteClusters:
+    def test_periodic_images_are_neighbours(self):
+        atoms = Atoms('H2', positions=[[0, 0, 0], [4, 0, 0]], cell=[5, 5, 5], pbc=True)
+        (cluster,) = site_clusters(atoms, [0], n_neighbours=3)
+        assert cluster.info['indices'][:3] == [0, 1, 1]
+        np.testing.assert_allclose(cluster.positions[:3], [[0, 0, 0], [-1, 0, 0], [4, 0, 0]])
+        assert not cluster.pbc.any()
+
+    def test_ranked_by_coupling_not_distance(self):
+        atoms = Atoms('CCH', positions=[[0, 0, 0], [1.5, 0, 0], [0, 2.0, 0]])
+        (cluster,) = site_clusters(atoms, [0], n_neighbours=1, isotopes={'C': 13})
+        assert cluster.get_chemical_symbols() == ['C', 'H']
+        (cluster,) = site_clusters(atoms, [0], n_neighbours=5, neighbours=[1])
+        assert cluster.info['indices'] == [0, 1]
+
+    def test_arrays_follow_atoms(self):
+        atoms = read(WRITE_DIR / 'AlPO-14.magres')
+        al_idx = [atom.index for atom in atoms if atom.symbol == 'Al']
+        p_idx = [atom.index for atom in atoms if atom.symbol == 'P']
+        clusters = site_clusters(atoms, al_idx[:2], n_neighbours=4, neighbours=p_idx)
+        for site, cluster in zip(al_idx, clusters, strict=False):
+            assert cluster.get_chemical_symbols() == ['Al', 'P', 'P', 'P', 'P']
+            np.testing.assert_array_equal(cluster.get_array('ms'), atoms.get_array('ms')[cluster.info['indices']])
+            assert cluster.info['indices'][0] == site
+            distances = np.linalg.norm(cluster.positions[1:] - cluster.positions[0], axis=1)
+            assert np.all(np.diff(distances) >= 0)
+
+    def test_negative_count_raises(self):
+        with pytest.raises(ValueError, match="non-negative"):
+            site_clusters(Atoms('H'), [0], n_neighbours=-1)
+
+    def test_no_candidates_raises(self):
+        with pytest.raises(ValueError, match="No candidate neighbours for site 0"):
+            site_clusters(bulk('Al', cubic=True), [0], n_neighbours=2, neighbours=[])
+        with pytest.raises(ValueError, match="No candidate neighbours"):
+            site_clusters(Atoms('H2', positions=[[0, 0, 0], [1, 0, 0]]), [0], n_neighbours=1, neighbours=[0])
+
+    def test_search_radius_is_capped(self):
+        atoms = Atoms('H2', positions=[[0, 0, 0], [60, 0, 0]])
+        with pytest.raises(ValueError, match="fewer than 1 neighbours within 50"):
+            site_clusters(atoms, [0], n_neighbours=1)
+
+
+# ---------------------------------------------------------------------------
+# Symmetry-equivalent sites
+# ---------------------------------------------------------------------------
+
+def _random_rotations(n, seed):
+    """Random orthogonal matrices."""
+    rng = np.random.default_rng(seed)
+    return np.array([np.linalg.qr(rng.normal(size=(3, 3)))[0] for _ in range(n)])
+
+
+def _rotation_z(degrees):
+    c, s = np.cos(np.radians(degrees)), np.sin(np.radians(degrees))
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+MS = np.array([[500.0, 3.0, 0.0], [3.0, 510.0, 1.0], [0.0, 1.0, 530.0]])
+EFG = np.array([[-0.1, 0.01, 0.0], [0.01, 0.03, 0.0], [0.0, 0.0, 0.07]])
+
+
+def _tensor_atoms(rotations, efg_rotations=None, symbols='Al3'):
+    """Atoms whose ms/efg tensors are rotated copies of MS and EFG."""
+    efg_rotations = rotations if efg_rotations is None else efg_rotations
+    atoms = Atoms(symbols, positions=np.arange(9).reshape(3, 3))
+    atoms.set_array('ms', np.array([r @ MS @ r.T for r in rotations]))
+    atoms.set_array('efg', np.array([r @ EFG @ r.T for r in efg_rotations]))
+    return atoms
+
+
+class TestEquivalentSites:
+    def test_rotated_copies_are_equivalent(self):
+        rotations = _random_rotations(3, seed=1)
+        assert equivalent_sites(_tensor_atoms(rotations)) == [[0, 1, 2]]
+
+    def test_relative_orientation_matters(self):
+        rotations = _random_rotations(3, seed=2)
+        efg_rotations = rotations.copy()
+        efg_rotations[2] = rotations[2] @ _rotation_z(40)
+        atoms = _tensor_atoms(rotations, efg_rotations)
+        assert equivalent_sites(atoms) == [[0, 1], [2]]
+
+    def test_elements_and_tolerance(self):
+        atoms = _tensor_atoms(np.array([np.eye(3)] * 3), symbols='AlGaAl')
+        ms = atoms.get_array('ms')
+        ms[2] += 0.02 * np.eye(3)
+        atoms.set_array('ms', ms)
+        assert equivalent_sites(atoms) == [[0, 2], [1]]
+        assert equivalent_sites(atoms, ms_tol=0.01) == [[0], [1], [2]]
+        assert equivalent_sites(atoms, indices=[2, 1]) == [[1], [2]]
+
+    def test_alpo14_aluminium_pairs(self):
+        atoms = read(WRITE_DIR / 'AlPO-14.magres')
+        al_idx = [atom.index for atom in atoms if atom.symbol == 'Al']
+        groups = equivalent_sites(atoms, indices=al_idx)
+        assert [len(group) for group in groups] == [2, 2, 2, 2]
+
+    def test_missing_tensors_raises(self):
+        with pytest.raises(ValueError, match="neither"):
+            equivalent_sites(Atoms('Al'))
+
+
+# ---------------------------------------------------------------------------
+# Spin system graph
+# ---------------------------------------------------------------------------
+
+SPINSYS_4 = """channels 13C
+nuclei 13C 13C 13C 13C
+shift 1 10p 0 0 0 0 0
+shift 4 40p 0 0 0 0 0
+dipole 4 2 -500 0 0 0
+jcoupling 2 3 50 0 0 0 0 0
+"""
+
+
+class TestCouplingComponents:
+    def test_components(self):
+        assert coupling_components(SPINSYS_4) == [[1], [2, 3, 4]]
+
+    def test_uncoupled(self):
+        assert coupling_components("nuclei 1H 1H 1H") == [[1], [2], [3]]
+
+    def test_extract_renumbers_sites(self):
+        body = extract_spinsys(SPINSYS_4, [4, 2])
+        assert body.splitlines() == [
+            "channels 13C",
+            "nuclei 13C 13C",
+            "shift 1 40p 0 0 0 0 0",
+            "dipole 1 2 -500 0 0 0",
+        ]
+
+
+# 13C observed; 1H 2 and 1H 3 couple to it at 10 kHz and 1 kHz, 1H 4 only to 1H 3
+NETWORK = """channels 13C 1H
+nuclei 13C 1H 1H 1H 27Al
+shift 1 10p 0 0 0 0 0
+dipole 1 2 -62831.85307179586 0 0 0
+dipole 1 3 -6283.185307179586 0 0 0
+dipole 3 4 -62831.85307179586 0 0 0
+jcoupling 1 5 20 0 0 0 0 0
+"""
+
+
+class TestPruneSpinsys:
+    def test_hilbert_dimension(self):
+        assert hilbert_dimension(NETWORK) == 2 ** 4 * 6
+
+    def test_drops_weakest_partners_first(self):
+        body, kept, dropped = prune_spinsys(NETWORK, max_spins=3)
+        assert kept == [1, 2, 3]
+        assert dropped[0] == ('dipole', (3, 4), pytest.approx(1e4))
+        assert dropped[1] == ('jcoupling', (1, 5), 20.0)
+        assert body.splitlines() == [
+            "channels 13C 1H",
+            "nuclei 13C 1H 1H",
+            "shift 1 10p 0 0 0 0 0",
+            "dipole 1 2 -62831.85307179586 0 0 0",
+            "dipole 1 3 -6283.185307179586 0 0 0",
+        ]
+
+    def test_max_dim_and_keep(self):
+        _, kept, dropped = prune_spinsys(NETWORK, max_dim=8, keep=[4])
+        assert kept == [1, 2, 4]
+        assert [sites for _, sites, _ in dropped] == [(1, 5), (1, 3), (3, 4)]
+
+    def test_scores_updated_after_removal(self):
+        couplings = [(2, 3, 100.0), (1, 3, 5.0), (1, 4, 5.0), (4, 5, 50.0), (1, 5, 20.0)]
+        spinsys = "channels 13C 1H\nnuclei 13C 1H 1H 1H 1H\n" + "".join(
+            f"dipole {i} {j} {-2 * np.pi * hz} 0 0 0\n" for i, j, hz in couplings
+        )
+        _, kept, dropped = prune_spinsys(spinsys, max_spins=3)
+        # Without site 2, site 3 is left with (5, 5) Hz against (5, 50) Hz for site 4
+        assert kept == [1, 4, 5]
+        assert [sites for _, sites, _ in dropped] == [(2, 3), (1, 3)]
+
+    def test_last_spin_of_a_channel_is_kept(self):
+        _, kept, _ = prune_spinsys(NETWORK, max_spins=2)
+        assert kept == [1, 2]
+        with pytest.raises(ValueError, match="all protected"):
+            prune_spinsys(NETWORK, max_spins=1)
+
+    def test_homonuclear_spins_are_pruned(self):
+        spinsys = (
+            "channels 1H\nnuclei 1H 1H 1H 1H\n"
+            "dipole 1 2 -6e4 0 0 0\ndipole 1 3 -6e3 0 0 0\ndipole 2 4 -6e4 0 0 0\n"
+        )
+        _, kept, dropped = prune_spinsys(spinsys, max_spins=2)
+        assert kept == [1, 2]
+        assert [sites for _, sites, _ in dropped] == [(2, 4), (1, 3)]
+        _, kept, _ = prune_spinsys(spinsys, max_spins=2, keep=[4])
+        assert kept == [1, 4]
+
+    def test_requires_target(self):
+        with pytest.raises(ValueError, match="max_dim"):
+            prune_spinsys(NETWORK)